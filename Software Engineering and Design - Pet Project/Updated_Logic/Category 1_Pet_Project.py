@@ -7,71 +7,392 @@
 # Rescue Animal System
 #
 # 1. Import modules for system functions and date handling.
-# 2. Define global lists for dogs, cats, and monkeys.
+# 2. Define the supported animal types and their report labels.
 # 3. Create classes for a general rescue animal and specific types (Dog, Cat, Monkey).
 # 4. Provide helper functions to validate user input (options, dates, yes/no).
-# 5. Implement functions for animal intake and initializing sample data.
-# 6. Include reporting functions to display animal information and training progress.
-# 7. Add functionalities for reserving animals and updating their training status.
-# 8. Present a main menu for user interaction and start the program.
+# 5. Create an AnimalRegistry that owns every animal and indexes it by name and type.
+# 6. Implement registry methods for animal intake and initializing sample data.
+# 7. Include reporting methods to display animal information and training progress.
+# 8. Add functionalities for reserving animals and updating their training status.
+# 9. Present a main menu for user interaction and start the program.
 #
 # This system tracks rescue animals with simple data entry, validation, reporting,
 # reservation, and training status updates.
 # ================================================
 
 
+import argparse  # For command-line options
+import asyncio  # For the network service
+import atexit  # For dumping profiling stats on exit
+import cProfile  # For profiling a single operation in detail
+import csv  # For reading bulk import files
+import io  # For detecting standard output streams without a file descriptor
+import json  # For JSON Lines import files, the quarantine file, and profiling dumps
+import mmap  # For reading snapshot files in place
+import os  # For profiling settings in environment variables and event log files
+import pstats  # For printing cProfile results
 import sys  # For system-level functions like exiting the application
 import re  # Used in date validation
-from datetime import datetime  # For date validation and formatting
+import sqlite3  # For the persistent SQLite store
+import struct  # For the snapshot file header
+import threading  # For thread-safe reservations and index updates
+import time  # For measuring bulk import throughput and operation timings
+import tracemalloc  # For optional allocation tracking while profiling
+from array import array  # For the fixed-width snapshot columns
+from bisect import bisect_left  # For range lookups in the acquisition date index
+from collections import Counter, deque  # For counting shared trigrams, and bounded samples of recent call times
+from concurrent.futures import ProcessPoolExecutor  # For the worker process behind each roster shard
+from contextlib import contextmanager  # For the report output stream helper and event log readers
+from datetime import date, datetime  # For date validation, storage, and formatting
+from functools import lru_cache, wraps  # For caching parsed and formatted dates, and instrumentation
+from heapq import merge, nlargest, nsmallest  # For merging date-ordered animals, and top-N query results
+from itertools import accumulate, chain, compress, islice  # For snapshot offsets, index buckets, column scans, paging
+
+try:
+    import numpy as np  # For the vectorized roster analytics (optional)
+except ImportError:
+    np = None  # Everything except RosterAnalytics works without NumPy
+
+# =============================================================================
+# Categorical Fields: Interned Values with Integer Codes
+# =============================================================================
+class Category:
+    """Ordered set of the allowed values for one field, each stored once with a small integer code.
+
+    Reads like the list it replaces (iteration, len, indexing by position),
+    adds O(1) value -> code lookups, and lets animals keep a code instead of
+    their own copy of the text, so filters compare integers. Codes never
+    change once assigned: values entered through "Other" are appended, under
+    a lock, after the existing ones.
+    """
+
+    max_length = 60  # Longest value accepted through "Other"
+
+    def __init__(self, label, values):
+        self.label = label  # Field name used in messages
+        self._values = []  # Code -> value
+        self._codes = {}  # Value (including other spellings seen) -> code
+        self._folded = {}  # Case-folded value -> code, for case-insensitive matching
+        self._lock = threading.Lock()  # Serializes adding new values
+        for value in values:
+            self.intern(value)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __getitem__(self, index):
+        # Value for a code (or a slice of codes), like indexing the original list
+        return self._values[index]
+
+    def __contains__(self, value):
+        return value in self._codes
+
+    def __repr__(self):
+        return f"Category({self.label!r}, {self._values!r})"
+
+    def index(self, value):
+        """Returns the code of a value, raising ValueError for an unknown value like list.index()."""
+        try:
+            return self._codes[value]
+        except KeyError:
+            raise ValueError(f"{value!r} is not a known {self.label}") from None
+
+    def intern(self, value):
+        """Returns the code for value, adding the value if it is new.
+
+        A different capitalization of an existing value gets that value's
+        code, so the same country is never stored twice.
+        """
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)  # Another thread may have added it meanwhile
+                if code is None:
+                    code = self._folded.get(value.casefold())
+                    if code is None:
+                        code = len(self._values)
+                        self._values.append(value)
+                        self._folded[value.casefold()] = code
+                    self._codes[value] = code
+        return code
+
+    def code_of(self, value):
+        """Returns the code of value matched case-insensitively, or None if it is unknown."""
+        code = self._codes.get(value)
+        return code if code is not None else self._folded.get(value.strip().casefold())
+
+    def code(self, value):
+        """Returns the code of value matched case-insensitively, raising ValueError if it is unknown.
+
+        Unlike intern(), this never adds a value; new values come only
+        through add() (the "Other" option, or bulk import with new values
+        allowed).
+        """
+        code = self.code_of(value)
+        if code is None:
+            raise ValueError(f"{value!r} is not a known {self.label}")
+        return code
+
+    def match(self, value):
+        """Returns the stored spelling of value matched case-insensitively, or None if it is unknown."""
+        code = self.code_of(value)
+        return None if code is None else self._values[code]
+
+    def restore(self, value):
+        """Returns the stored spelling of a value read back from storage, adding it like add() if it is unknown.
+
+        Stored values were accepted when they were entered, including values
+        added through "Other" in an earlier session.
+        """
+        return self.match(value) or self.add(value)
+
+    def sort_key(self, value):
+        # Known values in code order, then unknown ones alphabetically
+        code = self.code_of(value)
+        return (0, code) if code is not None else (1, value)
+
+    def add(self, value):
+        """Adds a value entered through "Other" and returns its stored spelling.
+
+        The text is trimmed, runs of spaces are collapsed, and it is
+        title-cased; text matching an existing value case-insensitively
+        reuses that value. Raises ValueError for empty or overly long text.
+        """
+        text = " ".join(str(value).split()).title()
+        if not text:
+            raise ValueError(f"The new {self.label} cannot be empty.")
+        if len(text) > self.max_length:
+            raise ValueError(f"The new {self.label} must be at most {self.max_length} characters.")
+        return self._values[self.intern(text)]
 
 # Predefined lists for structured input
-countries = ["United States", "Canada", "United Kingdom", "Australia", "Germany"]  # Valid country options
-weights = [f"{i}-{i+5} lbs" for i in range(0, 151, 5)]  # Generates weight categories in increments of 5 lbs
-training_statuses = ["Intake/Check-in", "In-Training", "Final Stage", "Completed"]  # Different training stages
+countries = Category("country", ["United States", "Canada", "United Kingdom", "Australia", "Germany"])  # Valid country options
+weights = Category("weight", [f"{i}-{i+5} lbs" for i in range(0, 151, 5)])  # Weight categories in increments of 5 lbs
+training_statuses = Category("training status", ["Intake/Check-in", "In-Training", "Final Stage", "Completed"])  # Training stages, in order
+genders = ["Male", "Female"]  # Gender options
+
+# Supported animal types, in the order they appear in reports
+animal_types = ["Dog", "Cat", "Monkey"]
+# Report header and plural label for each animal type
+type_labels = {
+    "Dog": ("🐕 Dogs", "dogs"),
+    "Cat": ("🐈 Cats", "cats"),
+    "Monkey": ("🐒 Monkeys", "monkeys"),
+}
+
+# =============================================================================
+# Operation Profiling (opt-in)
+# =============================================================================
+class OperationProfiler:
+    """Records call counts, wall time, and allocations for named operations.
+
+    Off by default; while off, an instrumented call costs one attribute check.
+    Enable it with the RESCUE_PROFILE=1 environment variable. Optional extras:
+      RESCUE_PROFILE_MEMORY=1   also measure net allocations with tracemalloc
+      RESCUE_CPROFILE=<name>    run every call of one operation under cProfile
+      RESCUE_PROFILE_DUMP=<file> write the stats as JSON when the program exits
+    """
 
-# Global data storage for animals
-dogs = []    # List to store Dog objects
-cats = []    # List to store Cat objects
-monkeys = [] # List to store Monkey objects
+    sample_limit = 10000  # Most recent call times kept per operation for percentiles
+
+    def __init__(self, enabled=False, trace_memory=False, cprofile_operation=None):
+        self.enabled = False
+        self.trace_memory = False
+        self.cprofile_operation = None
+        self._stats = {}  # Operation name -> [calls, total seconds, recent times, net allocated bytes]
+        self._lock = threading.Lock()  # Operations may run on several threads
+        self._cprofile = None  # cProfile.Profile collecting the chosen operation
+        self._cprofile_depth = 0  # Nesting depth of the chosen operation, so the profiler is enabled once
+        if enabled or trace_memory or cprofile_operation:
+            self.enable(trace_memory, cprofile_operation)
+
+    def enable(self, trace_memory=False, cprofile_operation=None):
+        """Turns profiling on, optionally with allocation tracking and a cProfile-wrapped operation."""
+        self.enabled = True
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.trace_memory = self.trace_memory or trace_memory
+        if cprofile_operation:
+            self.cprofile_operation = cprofile_operation
+            self._cprofile = cProfile.Profile()
+
+    def call(self, name, func, args, kwargs):
+        """Runs func(*args, **kwargs) and records it under name."""
+        profile = self._cprofile if name == self.cprofile_operation else None
+        if profile is not None:
+            self._cprofile_depth += 1
+            if self._cprofile_depth == 1:
+                profile.enable()
+        allocated_before = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            allocated = tracemalloc.get_traced_memory()[0] - allocated_before if self.trace_memory else 0
+            if profile is not None:
+                self._cprofile_depth -= 1
+                if self._cprofile_depth == 0:
+                    profile.disable()
+            with self._lock:
+                stats = self._stats.get(name)
+                if stats is None:
+                    stats = self._stats[name] = [0, 0.0, deque(maxlen=self.sample_limit), 0]
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2].append(elapsed)
+                stats[3] += allocated
+
+    def stats(self):
+        """Returns one dict per operation, slowest total time first."""
+        rows = []
+        with self._lock:
+            for name, (calls, total, recent, allocated) in self._stats.items():
+                ordered = sorted(recent)
+                rows.append({
+                    "operation": name,
+                    "calls": calls,
+                    "total_seconds": total,
+                    "mean_ms": total / calls * 1000,
+                    "p99_ms": ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)] * 1000,
+                    "net_allocated_bytes": allocated if self.trace_memory else None,
+                })
+        rows.sort(key=lambda row: row["total_seconds"], reverse=True)
+        return rows
+
+    def print_stats(self):
+        """Prints the stats table, followed by the cProfile top functions if one operation is wrapped."""
+        if not self.enabled:
+            print("\nProfiling is off. Set RESCUE_PROFILE=1 before starting the program to turn it on.\n")
+            return
+        print("\n--- Operation Profiling Stats ---")
+        print(f"{'Operation':<40}{'Calls':>8}{'Total s':>10}{'Mean ms':>10}{'p99 ms':>10}{'Net KB':>10}")
+        for row in self.stats():
+            allocated = row["net_allocated_bytes"]
+            print(f"{row['operation']:<40}{row['calls']:>8}{row['total_seconds']:>10.3f}{row['mean_ms']:>10.3f}"
+                  f"{row['p99_ms']:>10.3f}{f'{allocated / 1024:.1f}' if allocated is not None else '-':>10}")
+        if self._cprofile is not None:
+            print(f"\ncProfile of '{self.cprofile_operation}' (top 20 by cumulative time):")
+            pstats.Stats(self._cprofile, stream=sys.stdout).sort_stats("cumulative").print_stats(20)
+        print()
+
+    def dump(self, path):
+        """Writes the stats to a JSON file."""
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"trace_memory": self.trace_memory, "operations": self.stats()}, handle, indent=2)
+
+def env_flag(name):
+    # True if an environment variable is set to anything other than empty or "0"
+    return os.environ.get(name, "") not in ("", "0")
+
+# Shared profiler, configured from the environment at startup
+profiler = OperationProfiler(enabled=env_flag("RESCUE_PROFILE"), trace_memory=env_flag("RESCUE_PROFILE_MEMORY"),
+                             cprofile_operation=os.environ.get("RESCUE_CPROFILE") or None)
+if os.environ.get("RESCUE_PROFILE_DUMP"):
+    atexit.register(profiler.dump, os.environ["RESCUE_PROFILE_DUMP"])
+
+def instrumented(name):
+    """Decorator recording each call of a function under name while profiling is enabled."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)  # Profiling off: straight through
+            return profiler.call(name, func, args, kwargs)
+        return wrapper
+    return decorator
 
 # =============================================================================
 # Base Class: RescueAnimal
 # =============================================================================
 class RescueAnimal:
+    # Fixed attribute slots instead of a per-instance __dict__ keep large rosters compact
+    # Weight, countries, and training status are kept as Category codes and decoded by properties;
+    # the registry reads the codes directly to filter and bucket animals
+    __slots__ = ("_registry", "name", "animal_type", "gender", "age", "_weight", "acquisition_date",
+                 "_acquisition_country", "_training_status", "_reserved", "_in_service_country")
+
+    species = None  # Only Monkeys are searched by species; Monkey overrides this with a slot
+
     def __init__(self, name, animal_type, gender, age, weight, acquisition_date,
                  acquisition_country, training_status, reserved, in_service_country):
         # Initialize basic attributes common to all rescue animals
+        self._registry = None  # Registry that owns this animal, notified when indexed fields change
         self.name = name  # Animal's name
         self.animal_type = animal_type  # Type of animal
         self.gender = gender  # Gender of the animal
         self.age = age  # Age of the animal
-        self.weight = weight  # Weight category of the animal
-        self.acquisition_date = acquisition_date  # Date when the animal was acquired
-        self.acquisition_country = acquisition_country  # Country of acquisition
-        self.training_status = training_status  # Current training status
-        self.reserved = reserved  # Boolean for if the animal is reserved
-        self.in_service_country = in_service_country  # Country where the animal is in service
+        self._weight = weights.code(weight)  # Weight category of the animal
+        self.acquisition_date = to_date(acquisition_date)  # Date acquired, kept as a date and formatted for display
+        self._acquisition_country = countries.code(acquisition_country)  # Country of acquisition
+        self._training_status = training_statuses.code(training_status)  # Current training status
+        self._reserved = reserved  # Boolean for if the animal is reserved (see the reserved property)
+        self._in_service_country = countries.code(in_service_country)  # Country where the animal is in service
+
+    @property
+    def weight(self):
+        return weights[self._weight]
+
+    @weight.setter
+    def weight(self, value):
+        self._weight = weights.code(value)
+
+    @property
+    def acquisition_country(self):
+        return countries[self._acquisition_country]
+
+    @acquisition_country.setter
+    def acquisition_country(self, value):
+        self._acquisition_country = countries.code(value)
+
+    @property
+    def training_status(self):
+        # Set through update_training_status so the registry sees the change
+        return training_statuses[self._training_status]
+
+    @property
+    def in_service_country(self):
+        return countries[self._in_service_country]
+
+    @property
+    def reserved(self):
+        # True if the animal has been reserved
+        return self._reserved
+
+    @reserved.setter
+    def reserved(self, value):
+        # Set the reservation flag; an owning registry sets it under its lock and keeps its indexes in sync
+        if self._registry is not None:
+            self._registry._set_reserved(self, value)
+        else:
+            self._reserved = value
 
     def update_training_status(self, new_status):
         # Update the training status of the animal with a new status
-        self.training_status = new_status  # Set new training status
+        code = training_statuses.code(new_status)
+        if self._registry is not None:
+            self._registry._set_training_status(self, code)  # Set under the registry lock and reindexed
+        else:
+            self._training_status = code
+
+    def details(self):
+        # Type-specific details appended to the string representation; subclasses override this
+        return ""
 
     def __str__(self):
         # Return a string representation of the animal with key details
-        base_info = (f"Name: {self.name}, Type: {self.animal_type}, Acquisition Date: {self.acquisition_date}, "
-                     f"Training Status: {self.training_status}, Reserved: {self.reserved}")
-        # Breed for Dog/Cat or species and extra details for Monkey if available
-        if hasattr(self, 'breed'):  # Check if the animal has a 'breed' attribute (Dogs and Cats)
-            base_info += f", Breed: {self.breed}"
-        elif hasattr(self, 'species'):  # Check if the animal has a 'species' attribute (Monkey)
-            base_info += (f", Species: {self.species}, Tail Length: {self.tail_length} in, "
-                          f"Height: {self.height} in, Body Length: {self.body_length} in")
-        return base_info  # Return the compiled string
+        return (f"Name: {self.name}, Type: {self.animal_type}, Acquisition Date: {format_date(self.acquisition_date)}, "
+                f"Training Status: {self.training_status}, Reserved: {self._reserved}{self.details()}")
 
 # =============================================================================
 # Subclass: Dog
 # =============================================================================
 class Dog(RescueAnimal):
+    __slots__ = ("breed",)
+
     def __init__(self, name, breed, gender, age, weight, acquisition_date,
                  acquisition_country, training_status, reserved, in_service_country):
         # Initialize a Dog object using the RescueAnimal base class
@@ -79,10 +400,16 @@ class Dog(RescueAnimal):
                          acquisition_country, training_status, reserved, in_service_country)
         self.breed = breed  # Specific attribute for dogs: breed
 
+    def details(self):
+        # Dogs add their breed to the string representation
+        return f", Breed: {self.breed}"
+
 # =============================================================================
 # Subclass: Cat
 # =============================================================================
 class Cat(RescueAnimal):
+    __slots__ = ("breed",)
+
     def __init__(self, name, breed, gender, age, weight, acquisition_date,
                  acquisition_country, training_status, reserved, in_service_country):
         # Initialize a Cat object using the RescueAnimal base class
@@ -90,10 +417,16 @@ class Cat(RescueAnimal):
                          acquisition_country, training_status, reserved, in_service_country)
         self.breed = breed  # Specific attribute for cats: breed
 
+    def details(self):
+        # Cats add their breed to the string representation
+        return f", Breed: {self.breed}"
+
 # =============================================================================
 # Subclass: Monkey
 # =============================================================================
 class Monkey(RescueAnimal):
+    __slots__ = ("species", "tail_length", "height", "body_length")
+
     def __init__(self, name, species, gender, age, weight, acquisition_date,
                  acquisition_country, training_status, reserved, in_service_country,
                  tail_length, height, body_length):
@@ -105,6 +438,14 @@ class Monkey(RescueAnimal):
         self.height = height  # Specific measurement: height in inches
         self.body_length = body_length  # Specific measurement: body length in inches
 
+    def details(self):
+        # Monkeys add their species and measurements to the string representation
+        return (f", Species: {self.species}, Tail Length: {self.tail_length} in, "
+                f"Height: {self.height} in, Body Length: {self.body_length} in")
+
+# Animal class for each type, used when rebuilding animals from storage
+animal_classes = {"Dog": Dog, "Cat": Cat, "Monkey": Monkey}
+
 # =============================================================================
 # Helper Functions for Validated Input
 # =============================================================================
@@ -127,405 +468,3743 @@ def get_valid_input(prompt, choices):
             if 1 <= choice <= len(choices):
                 return choices[choice - 1]  # Return the selected option
             elif choice == 0:
-                new_entry = input("Enter a new option: ").strip().title()
-                if new_entry not in choices:
-                    choices.append(new_entry)  # Save new entry for future selections
-                return new_entry  # Return the newly added option
+                new_entry = input("Enter a new option: ")
+                if isinstance(choices, Category):
+                    try:
+                        return choices.add(new_entry)  # Saved once for future selections; known spellings are reused
+                    except ValueError as error:
+                        print(error)
+                        continue
+                new_entry = new_entry.strip().title()
+                if new_entry:
+                    if new_entry not in choices:
+                        choices.append(new_entry)  # Save new entry for future selections
+                    return new_entry  # Return the newly added option
         print("Invalid input. Please enter a valid option.")
 
+def match_choice(value, choices):
+    """Returns the entry in choices matching value (case-insensitive), or None.
+
+    Shared by interactive and bulk intake so both accept the same spellings.
+    """
+    if isinstance(choices, Category):
+        return choices.match(value)  # O(1) through the category's lookup tables
+    value = value.strip()
+    if value in choices:
+        return value  # Exact spelling, the common case
+    wanted = value.casefold()
+    for option in choices:
+        if option.casefold() == wanted:
+            return option
+    return None
+
+# MM-DD-YYYY date pattern, compiled once
+date_pattern = re.compile(r"^(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])-(\d{4})$")
+
+@lru_cache(maxsize=65536)
+def parse_date(text):
+    """Returns the date for a valid MM-DD-YYYY string, otherwise None.
+
+    Builds the date straight from the regex groups instead of going through
+    strptime, and caches results since rosters repeat the same dates often.
+    Repeated dates also share one date object.
+    """
+    match = date_pattern.match(text)
+    if match:
+        month, day, year = match.groups()
+        try:
+            return date(int(year), int(month), int(day))
+        except ValueError:
+            pass  # Invalid calendar date such as 02-30-2020
+    return None
+
+def parse_dates(texts):
+    """Validates a batch of MM-DD-YYYY strings in one pass.
+
+    Returns a dict mapping each distinct string to its date, or to None if it
+    is invalid, so a date repeated across the batch is only parsed once.
+    """
+    return {text: parse_date(text) for text in set(texts)}
+
+def to_date(value):
+    """Returns value as a date, parsing MM-DD-YYYY strings; raises ValueError for invalid strings."""
+    if isinstance(value, date):
+        return value
+    parsed = parse_date(value.strip())
+    if parsed is None:
+        raise ValueError(f"Invalid date '{value}'. Expected MM-DD-YYYY.")
+    return parsed
+
+@lru_cache(maxsize=65536)
+def format_date(value):
+    """Formats a date as MM-DD-YYYY for display."""
+    return f"{value.month:02d}-{value.day:02d}-{value.year:04d}"
+
+def parse_yes_no(text):
+    """Returns True for 'yes', False for 'no' (case-insensitive), otherwise None."""
+    response = text.strip().lower()
+    if response in ["yes", "no"]:
+        return response == "yes"  # True if 'yes', False if 'no'
+    return None
+
 def get_valid_date(prompt):
     """Ensures the user enters a valid date format (MM-DD-YYYY).
     
-    Uses regular expressions and datetime parsing for validation.
+    Repeats the prompt until parse_date accepts the input and returns the date.
     """
     while True:
-        date_input = input(f"{prompt} (Format: MM-DD-YYYY): ").strip()
-        # Check if the input matches the date pattern
-        if re.match(r"^(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])-\d{4}$", date_input):
-            try:
-                datetime.strptime(date_input, "%m-%d-%Y")  # Validate by parsing
-                return date_input  # Return the valid date string
-            except ValueError:
-                pass  # Continue to error message if date is invalid
+        date_input = parse_date(input(f"{prompt} (Format: MM-DD-YYYY): ").strip())
+        if date_input is not None:
+            return date_input  # Return the valid date
         print("Invalid date format. Please enter in MM-DD-YYYY format.")
 
+def get_report_options():
+    """Asks for a page size, starting row, and optional output file for a report.
+
+    Returns keyword arguments for the registry's print methods; blank answers
+    keep the defaults (every row, printed to the screen).
+    """
+    options = {}
+    page_size = input("Enter page size (blank for all rows): ").strip()
+    if page_size.isdigit() and int(page_size) > 0:
+        options["page_size"] = int(page_size)
+    start_row = input("Enter starting row (blank for 1): ").strip()
+    if start_row.isdigit() and int(start_row) > 0:
+        options["offset"] = int(start_row) - 1
+    output_path = input("Enter output file (blank for screen): ").strip()
+    if output_path:
+        options["output_path"] = output_path
+    return options
+
 def get_yes_no(prompt):
     """Ensures a Yes/No response.
     
     Repeats prompt until user enters 'yes' or 'no', returns True for yes.
     """
     while True:
-        response = input(f"{prompt} (yes/no): ").strip().lower()
-        if response in ["yes", "no"]:
-            return response == "yes"  # True if 'yes', False if 'no'
+        response = parse_yes_no(input(f"{prompt} (yes/no): "))
+        if response is not None:
+            return response
         print("Invalid input. Please enter 'yes' or 'no'.")
 
-# =============================================================================
-# Animal Intake Process
-# =============================================================================
-def intake_new_animal(animal_type):
-    """Guided process to intake a new animal.
-    
-    Collects and validates user input, prevents duplicate names,
-    and adds the new animal to the appropriate global list.
-    """
+def choose_option(prompt, options):
+    """Displays numbered options and returns the one selected, or None if the user picks [0] Cancel."""
     while True:
-        print(f"\n--- Adding a New {animal_type} ---")
-
-        # Prompt user for animal's name and remove leading/trailing whitespace
-        name = input(f"Enter the {animal_type}'s name: ").strip()
-        # Check for duplicate names (case-insensitive) among all animals
-        existing_names = [animal.name.lower() for animal in (dogs + cats + monkeys)]
-        if name.lower() in existing_names:
-            print("\nThis name is already in the system. Please choose another.\n")
-            continue  # Restart process if duplicate found
-
-        # For Dog/Cat: ask for breed; for Monkey: ask for species
-        breed_species = input(f"Enter the {animal_type}'s {'breed' if animal_type in ['Dog', 'Cat'] else 'species'}: ").strip()
-        gender = get_valid_input("Select gender:", ["Male", "Female"])  # Validate gender selection
-        age = input("Enter age in years: ").strip()  # Age entered as string
-        weight = get_valid_input("Select weight range:", weights)  # Validate weight range selection
-        acquisition_date = get_valid_date("Enter acquisition date")  # Validate date input
-        acquisition_country = get_valid_input("Select acquisition country:", countries)  # Validate country selection
-        training_status = get_valid_input("Select training status:", training_statuses)  # Validate training status
-        reserved = get_yes_no("Is this animal reserved?")  # Validate Yes/No input for reservation status
-        in_service_country = get_valid_input("Select in-service country:", countries)  # Validate in-service country selection
-
-        # Collect additional details for Monkeys
-        if animal_type == "Monkey":
-            tail_length = input("Enter tail length (in inches): ").strip()  # Get tail length
-            height = input("Enter height (in inches): ").strip()  # Get height
-            body_length = input("Enter body length (in inches): ").strip()  # Get body length
-
-        # Display all collected details for review before saving
-        print("\n--- Review Entered Details ---")
-        print(f"Name: {name}")
-        print(f"Type: {animal_type}")
-        print(f"Breed/Species: {breed_species}")
-        print(f"Gender: {gender}")
-        print(f"Age: {age} years")
-        print(f"Weight: {weight}")
-        print(f"Acquisition Date: {acquisition_date}")
-        print(f"Acquisition Country: {acquisition_country}")
-        print(f"Training Status: {training_status}")
-        print(f"Reserved: {'Yes' if reserved else 'No'}")
-        print(f"In-Service Country: {in_service_country}")
-        if animal_type == "Monkey":
-            print(f"Tail Length: {tail_length} inches")
-            print(f"Height: {height} inches")
-            print(f"Body Length: {body_length} inches")
-
-        # Confirm that the information is correct before saving
-        if get_yes_no("Is this information correct?"):
-            # Depending on animal type, create and add the animal to the respective list
-            if animal_type == "Dog":
-                dogs.append(Dog(name, breed_species, gender, age, weight,
-                                acquisition_date, acquisition_country, training_status,
-                                reserved, in_service_country))
-            elif animal_type == "Cat":
-                cats.append(Cat(name, breed_species, gender, age, weight,
-                                acquisition_date, acquisition_country, training_status,
-                                reserved, in_service_country))
-            else:  # For Monkey type
-                monkeys.append(Monkey(name, breed_species, gender, age, weight,
-                                      acquisition_date, acquisition_country, training_status,
-                                      reserved, in_service_country, tail_length, height, body_length))
-            print("\nNew animal has been added to the system.\n")
-            return  # Exit the intake process after successful entry
-        else:
-            print("\nRestarting entry process...\n")
-            # Loop will restart for re-entry of information
+        print(f"\n{prompt}")
+        for idx, option in enumerate(options, 1):
+            print(f"[{idx}] {option}")
+        print("[0] Cancel")
+        choice = input("Select an option: ").strip()
+        if choice.isdigit() and int(choice) <= len(options):
+            return options[int(choice) - 1] if int(choice) else None
+        print("Invalid input. Please enter a valid option.")
 
 # =============================================================================
-# Data Initialization Function - Sample Data for project purposes
+# Training Progress Bars
 # =============================================================================
-def initialize_data():
-    """Initializes the application with sample data for dogs, cats, and monkeys.
-    
-    This function pre-loads the system with sample animal records for demonstration.
-    """
-    global dogs, cats, monkeys  # Declare usage of global lists
-
-    # Sample Dogs
-    dogs.append(Dog("Spot", "German Shepherd", "Male", "3", "60-65 lbs", "05-12-2020",
-                    "United States", "In-Training", False, "United States"))
-    dogs.append(Dog("Luna", "Labrador Retriever", "Female", "4", "55-60 lbs", "03-18-2019",
-                    "Canada", "Final Stage", True, "Canada"))
-    dogs.append(Dog("Max", "Golden Retriever", "Male", "2", "50-55 lbs", "07-25-2021",
-                    "United Kingdom", "Completed", False, "United Kingdom"))
-
-    # Sample Cats
-    cats.append(Cat("Whiskers", "Maine Coon", "Male", "5", "10-15 lbs", "08-12-2018",
-                    "United States", "Completed", False, "United States"))
-    cats.append(Cat("Misty", "Siamese", "Female", "3", "8-10 lbs", "10-30-2020",
-                    "Australia", "In-Training", True, "Australia"))
-    cats.append(Cat("Shadow", "British Shorthair", "Male", "4", "12-15 lbs", "12-05-2019",
-                    "Germany", "Final Stage", False, "Germany"))
-
-    # Sample Monkeys
-    monkeys.append(Monkey("Charlie", "Guenon", "Male", "2", "20-25 lbs", "04-10-2021",
-                            "United States", "In-Training", False, "United States",
-                            "20.1", "16.2", "22.3"))
-    monkeys.append(Monkey("Lily", "Marmoset", "Female", "1", "10-15 lbs", "11-22-2022",
-                            "Canada", "Final Stage", True, "Canada",
-                            "12.5", "9.8", "11.1"))
-    monkeys.append(Monkey("Max", "Howler Monkey", "Male", "4", "25-30 lbs", "06-15-2019",
-                            "United Kingdom", "Completed", False, "United Kingdom",
-                            "22.3", "18.6", "26.4"))
-
-# =============================================================================
-# Reporting Functions: Print Animal Data
-# =============================================================================
-
-# ------------------
-# Training Status
-# ------------------
-def print_training_status():
-    """Prints the training status of all animals grouped by type with a visual progress bar."""
-    print("\n--- Training Status for All Animals ---")
-    if not dogs and not cats and not monkeys:
-        print("No animals in the system.")
-        return
+progress_bar_width = 20  # Width of the progress bar in characters
+progress_bar_cache = {}  # (status, number of stages) -> rendered progress text
 
-    # Define the ordered training stages and parameters for the progress bar
-    stages = training_statuses  # e.g., ["Intake/Check-in", "In-Training", "Final Stage", "Completed"]
-    total_stages = len(stages)
-    bar_width = 20  # Width of the progress bar in characters
+def progress_bar(status):
+    """Returns the "Status [#####-----] NN%" text for a training status.
 
-    def get_progress_bar(status):
+    The text depends only on the status and the number of stages, so each
+    one is built once and reused for every animal at that stage.
+    """
+    key = (status, len(training_statuses))
+    text = progress_bar_cache.get(key)
+    if text is None:
         # Determine the stage index; if status not found, assume starting stage
         try:
-            current_index = stages.index(status)
+            current_index = training_statuses.index(status)
         except ValueError:
             current_index = 0
         # Calculate progress as percentage based on stage position
-        progress = int(((current_index + 1) / total_stages) * 100)
+        progress = int(((current_index + 1) / len(training_statuses)) * 100)
         # Calculate the number of filled segments in the progress bar
-        num_filled = int((progress / 100) * bar_width)
-        bar = "[" + "#" * num_filled + "-" * (bar_width - num_filled) + "]"
-        return bar, progress
-
-    # Print training status for Dogs
-    print("\n🐕 Dogs:")
-    if dogs:
-        for dog in dogs:
-            bar, progress = get_progress_bar(dog.training_status)
-            print(f"- {dog.name}: {dog.training_status} {bar} {progress}%")
-    else:
-        print("No dogs available.")
-
-    # Print training status for Cats
-    print("\n🐈 Cats:")
-    if cats:
-        for cat in cats:
-            bar, progress = get_progress_bar(cat.training_status)
-            print(f"- {cat.name}: {cat.training_status} {bar} {progress}%")
-    else:
-        print("No cats available.")
-
-    # Print training status for Monkeys
-    print("\n🐒 Monkeys:")
-    if monkeys:
-        for monkey in monkeys:
-            bar, progress = get_progress_bar(monkey.training_status)
-            print(f"- {monkey.name}: {monkey.training_status} {bar} {progress}%")
-    else:
-        print("No monkeys available.")
-    print()  # Extra newline for spacing
-
-# ------------------
-# All Animals
-# ------------------
-def print_all_animals():
-    """Prints all animals in the system with their details."""
-    print("\n--- All Animals in the System ---")
-    all_animals = dogs + cats + monkeys  # Combine all animal lists
-    if not all_animals:
-        print("No animals in the system.")
+        num_filled = int((progress / 100) * progress_bar_width)
+        text = f"{status} [" + "#" * num_filled + "-" * (progress_bar_width - num_filled) + f"] {progress}%"
+        progress_bar_cache[key] = text
+    return text
+
+for stage in training_statuses:
+    progress_bar(stage)  # Precompute the bars for the standard stages
+
+# =============================================================================
+# Report Output: Buffered, Paginated Writing
+# =============================================================================
+report_buffer_size = 1 << 16  # Bytes buffered before each write to the terminal or file
+
+@contextmanager
+def report_output(output_path=None):
+    """Yields a buffered text stream for a report: the output file if given, otherwise standard output.
+
+    Standard output is reopened with a large buffer so a long report is
+    written in a few large writes instead of one write per line.
+    """
+    if output_path:
+        with open(output_path, "w", encoding="utf-8", buffering=report_buffer_size) as out:
+            yield out
         return
-    for animal in all_animals:
-        print(animal)  # Uses the __str__ method of each animal for formatting
-    print()
-
-# ------------------
-# All Dogs
-# ------------------
-def print_list_of_dogs():
-    """Prints a list of all dogs."""
-    print("\n--- List of Dogs ---")
-    if not dogs:
-        print("No dogs available.")
-    else:
-        for dog in dogs:
-            print(dog)  # Display each dog's details
-    print()
-
-# ------------------
-# All Cats
-# ------------------
-def print_list_of_cats():
-    """Prints a list of all cats."""
-    print("\n--- List of Cats ---")
-    if not cats:
-        print("No cats available.")
-    else:
-        for cat in cats:
-            print(cat)  # Display each cat's details
-    print()
-
-# ------------------
-# All monkeys
-# ------------------
-def print_list_of_monkeys():
-    """Prints a list of all monkeys."""
-    print("\n--- List of Monkeys ---")
-    if not monkeys:
-        print("No monkeys available.")
-    else:
-        for monkey in monkeys:
-            print(monkey)  # Display each monkey's details
-    print()
-
-# ------------------
-# All Avl Animals
-# ------------------
-def print_list_of_available_animals():
-    """Prints animals that are available for service (i.e., training completed and not reserved)."""
-    print("\n--- List of Available Animals ---")
-    # Filter animals that have completed training and are not reserved
-    available = [animal for animal in (dogs + cats + monkeys)
-                 if animal.training_status == "Completed" and not animal.reserved]
-    if not available:
-        print("No available animals.")
-    else:
-        for animal in available:
-            print(animal)  # Display details of available animals
-    print()
-
-# =============================================================================
-# Update Training Status Functionality
-# =============================================================================
-def update_animal_training_status():
-    """Allows the user to update the training status of an animal by name."""
-    animal_name = input("Enter the name of the animal to update training status: ").strip()
-    found = False
-    for animal in dogs + cats + monkeys:
-        if animal.name.lower() == animal_name.lower():
-            found = True
-            print(f"Current training status of {animal.name}: {animal.training_status}")
-            new_status = get_valid_input("Select new training status:", training_statuses)
-            animal.update_training_status(new_status)
-            print(f"Training status for {animal.name} updated to {new_status}.")
-            break
-    if not found:
-        print("Animal not found in the system.")
-
-# =============================================================================
-# Reservation Functionality
-# =============================================================================
-def reserve_animal():
-    """Allows the user to reserve an animal by specifying type and in-service country."""
-    animal_type_input = input("Enter animal type to reserve (Dog/Cat/Monkey): ").strip().title()
-    in_service_country_input = input("Enter in-service country: ").strip().title()
-
-    available_animals = []
-
-    if animal_type_input == "Dog":
-        for dog in dogs:
-            if dog.in_service_country.title() == in_service_country_input and not dog.reserved:
-                available_animals.append(dog)
-    elif animal_type_input == "Cat":
-        for cat in cats:
-            if cat.in_service_country.title() == in_service_country_input and not cat.reserved:
-                available_animals.append(cat)
-    elif animal_type_input == "Monkey":
-        species_input = input("Enter the species of monkey to reserve: ").strip().title()
-        for monkey in monkeys:
-            if (monkey.in_service_country.title() == in_service_country_input and
-                monkey.species.title() == species_input and not monkey.reserved):
-                available_animals.append(monkey)
-    else:
-        print("Invalid animal type.")
+    sys.stdout.flush()  # Keep ordering with anything already printed
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fd = None  # Standard output is not a real file (e.g. redirected to an in-memory stream)
+    if fd is None:
+        yield sys.stdout
         return
+    with open(fd, "w", encoding=sys.stdout.encoding, buffering=report_buffer_size, closefd=False) as out:
+        yield out
 
-    if not available_animals:
-        print("No available animals found for the given criteria.")
-        return
+def animal_line(animal):
+    # One report line per animal, using the __str__ method of each animal for formatting
+    return f"{animal}\n"
 
-    print("\nAvailable animals:")
-    for animal in available_animals:
-        print(animal)
+def write_report(title, items, empty_message, format_line=animal_line, page_size=None, offset=0,
+                 output_path=None):
+    """Writes a report header and one page of items through a buffered stream.
 
-    name_input = input("Enter the name of the animal to reserve: ").strip()
-    for animal in available_animals:
-        if animal.name.lower() == name_input.lower():
-            animal.reserved = True
-            print("Reservation confirmed.")
-            return
+    items may be any iterable, including a generator; only the requested page
+    (offset, then at most page_size items) is formatted, one line at a time,
+    so memory stays flat however large the roster is. Returns the number of
+    items written.
+    """
+    stop = offset + page_size if page_size is not None else None
+    written = 0
+    with report_output(output_path) as out:
+        out.write(f"\n--- {title} ---\n")
+        for item in islice(items, offset, stop):
+            out.write(format_line(item))
+            written += 1
+        if not written:
+            out.write(f"{empty_message}\n")
+        elif page_size is not None:
+            out.write(f"(Showing {offset + 1}-{offset + written})\n")
+        out.write("\n")
+    if output_path:
+        print(f"Report written to {output_path}.")
+    return written
 
-    print("Invalid animal name. Reservation not made.")
+def training_summary_lines(status_counts):
+    """Yields the training status summary lines, using status_counts(animal_type) -> {status: count}."""
+    for animal_type in animal_types:
+        header, plural = type_labels[animal_type]
+        yield f"\n{header}:\n"
+        counts = status_counts(animal_type)
+        if not counts:
+            yield f"No {plural} available.\n"
+        for status, count in counts.items():
+            yield f"- {progress_bar(status)}: {count}\n"
 
 # =============================================================================
-# Main Menu Functionality
+# Storage Rows: Shared by the Persistent Backends
 # =============================================================================
-def display_menu():
-    """Displays the main menu and handles user input to navigate the system.
+def animal_row(animal):
+    """Returns an animal as a tuple of plain values, in the column order animal_from_row() reads."""
+    is_monkey = animal.animal_type == "Monkey"
+    return (animal.name, animal.animal_type, animal.species if is_monkey else animal.breed,
+            animal.gender, animal.age, animal.weight, animal.acquisition_date.toordinal(),
+            animal.acquisition_country, animal.training_status, animal.reserved, animal.in_service_country,
+            animal.tail_length if is_monkey else None,
+            animal.height if is_monkey else None,
+            animal.body_length if is_monkey else None)
+
+def animal_from_row(row):
+    """Rebuilds a Dog, Cat, or Monkey from a stored row (see animal_row)."""
+    (name, animal_type, breed_species, gender, age, weight, acquisition_date, acquisition_country,
+     training_status, reserved, in_service_country, tail_length, height, body_length) = row
+    # Values added through "Other" in an earlier session are known again before the animal is built
+    weight, training_status = weights.restore(weight), training_statuses.restore(training_status)
+    acquisition_country = countries.restore(acquisition_country)
+    in_service_country = countries.restore(in_service_country)
+    if isinstance(acquisition_date, int):
+        acquisition_date = date.fromordinal(acquisition_date)  # Stored as a day ordinal
+    if animal_type == "Monkey":
+        return Monkey(name, breed_species, gender, age, weight, acquisition_date, acquisition_country,
+                      training_status, bool(reserved), in_service_country, tail_length, height, body_length)
+    return animal_classes[animal_type](name, breed_species, gender, age, weight, acquisition_date,
+                                       acquisition_country, training_status, bool(reserved),
+                                       in_service_country)
+
+# =============================================================================
+# Persistent Storage: SQLite Backend
+# =============================================================================
+class SQLiteAnimalStore:
+    """Persists the roster in a SQLite database running in WAL mode.
 
-    Calls the data initialization function and presents menu options
-    for various functionalities like intake, listing, reporting, reservation,
-    and updating training status.
+    Static animal details, training status, and reservations live in separate
+    indexed tables so status updates and reservations touch one small row.
+    All SQL is kept in constant strings so sqlite3's per-connection statement
+    cache reuses each prepared statement instead of re-parsing it. The one
+    connection is shared between threads under a lock.
     """
-    initialize_data()  # Load sample data into the system
 
-    while True:
-        # Display menu options to the user
-        print("\nRescue Animal System Menu")
-        print("[1] Intake a new dog")
-        print("[2] Intake a new cat")
-        print("[3] Intake a new monkey")
-        print("[4] Print list of all dogs")
-        print("[5] Print list of all cats")
-        print("[6] Print list of all monkeys")
-        print("[7] Print list of available animals")
-        print("[8] Print Training Status for All Animals")
-        print("[9] Print All Animals")
-        print("[10] Reserve an animal")
-        print("[11] Update an animal's training status")
-        print("[q] Quit")
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS animals (
+            name_key TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            animal_type TEXT NOT NULL,
+            breed_species TEXT NOT NULL,
+            gender TEXT NOT NULL,
+            age TEXT NOT NULL,
+            weight TEXT NOT NULL,
+            acquisition_date INTEGER NOT NULL,
+            acquisition_country TEXT NOT NULL,
+            in_service_country TEXT NOT NULL,
+            tail_length TEXT,
+            height TEXT,
+            body_length TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_animals_type_country ON animals (animal_type, in_service_country);
+        CREATE INDEX IF NOT EXISTS idx_animals_acquisition_date ON animals (acquisition_date);
+        CREATE TABLE IF NOT EXISTS training_status (
+            name_key TEXT PRIMARY KEY REFERENCES animals (name_key),
+            status TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_training_status_status ON training_status (status);
+        CREATE TABLE IF NOT EXISTS reservations (
+            name_key TEXT PRIMARY KEY REFERENCES animals (name_key),
+            reserved_at TEXT NOT NULL
+        );
+    """
 
-        choice = input("Enter your choice: ").strip().lower()
-        # Execute functionality based on user's menu choice
-        if choice == "1":
-            intake_new_animal("Dog")
-        elif choice == "2":
-            intake_new_animal("Cat")
-        elif choice == "3":
-            intake_new_animal("Monkey")
-        elif choice == "4":
-            print_list_of_dogs()
-        elif choice == "5":
-            print_list_of_cats()
-        elif choice == "6":
-            print_list_of_monkeys()
-        elif choice == "7":
-            print_list_of_available_animals()
-        elif choice == "8":
-            print_training_status()
-        elif choice == "9":
-            print_all_animals()
-        elif choice == "10":
-            reserve_animal()
-        elif choice == "11":
-            update_animal_training_status()
-        elif choice == "q":
-            print("Exiting the application...")
-            sys.exit()
+    # Prepared statements, reused through the connection's statement cache
+    INSERT_ANIMAL = "INSERT INTO animals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    UPSERT_STATUS = ("INSERT INTO training_status VALUES (?, ?, ?) "
+                     "ON CONFLICT (name_key) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at")
+    INSERT_RESERVATION = "INSERT OR IGNORE INTO reservations VALUES (?, ?)"
+    DELETE_RESERVATION = "DELETE FROM reservations WHERE name_key = ?"
+    SELECT_ANIMALS = ("SELECT a.name, a.animal_type, a.breed_species, a.gender, a.age, a.weight, "
+                      "a.acquisition_date, a.acquisition_country, t.status, r.name_key IS NOT NULL, "
+                      "a.in_service_country, a.tail_length, a.height, a.body_length "
+                      "FROM animals a JOIN training_status t USING (name_key) "
+                      "LEFT JOIN reservations r USING (name_key) ")
+    SELECT_BY_NAME = SELECT_ANIMALS + "WHERE a.name_key = ?"
+    SELECT_OF_TYPE = SELECT_ANIMALS + "WHERE a.animal_type = ?"
+    SELECT_BY_TYPE = SELECT_OF_TYPE + " ORDER BY a.rowid"
+    SELECT_ACQUIRED_BETWEEN = SELECT_ANIMALS + "WHERE a.acquisition_date BETWEEN ? AND ? ORDER BY a.acquisition_date"
+    # Conditions iter_matching() appends to SELECT_OF_TYPE, one per filtered field (reserved by flag)
+    MATCH_CONDITIONS = {"training_status": " AND t.status = ?", "in_service_country": " AND a.in_service_country = ?",
+                        True: " AND r.name_key IS NOT NULL", False: " AND r.name_key IS NULL"}
+    SELECT_NAMES = "SELECT name FROM animals"
+    EXISTS = "SELECT 1 FROM animals WHERE name_key = ?"
+    COUNT = "SELECT COUNT(*) FROM animals"
+    COUNT_BY_STATUS = ("SELECT t.status, COUNT(*) FROM animals a JOIN training_status t USING (name_key) "
+                       "WHERE a.animal_type = ? GROUP BY t.status")
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()  # Serializes use of the shared connection
+        self._conn.execute("PRAGMA journal_mode=WAL")  # Readers never block the writer
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, avoids an fsync per commit
+        self._conn.executescript(self.SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _timestamp():
+        return datetime.now().isoformat(timespec="seconds")
+
+    def count(self):
+        """Returns the number of stored animals."""
+        with self._lock:
+            return self._conn.execute(self.COUNT).fetchone()[0]
+
+    def status_counts(self, animal_type):
+        """Returns {training status: number of stored animals} for one type."""
+        with self._lock:
+            return dict(self._conn.execute(self.COUNT_BY_STATUS, (animal_type,)))
+
+    def exists(self, name_key):
+        """Returns True if an animal with this case-folded name is stored."""
+        with self._lock:
+            return self._conn.execute(self.EXISTS, (name_key,)).fetchone() is not None
+
+    def fetch(self, name_key):
+        """Loads one animal by case-folded name, or returns None."""
+        with self._lock:
+            row = self._conn.execute(self.SELECT_BY_NAME, (name_key,)).fetchone()
+        return animal_from_row(row) if row else None
+
+    def _iter_query(self, sql, params, batch_size=1000):
+        # Stream rows in batches, holding the lock only while each batch is fetched
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield animal_from_row(row)
+
+    def iter_animals(self, animal_type):
+        """Yields the stored animals of one type in intake order, streaming rows from the cursor."""
+        return self._iter_query(self.SELECT_BY_TYPE, (animal_type,))
+
+    def iter_acquired_between(self, start, end):
+        """Yields stored animals acquired between two dates (inclusive), using the date index."""
+        return self._iter_query(self.SELECT_ACQUIRED_BETWEEN, (start.toordinal(), end.toordinal()))
+
+    def iter_matching(self, animal_type, **values):
+        """Yields the stored animals of one type whose fields hold the given values, in intake order.
+
+        values maps training_status and in_service_country to a value and
+        reserved to a flag. SQLite applies the filters, so only matching
+        rows become animals.
+        """
+        sql, params = self.SELECT_OF_TYPE, [animal_type]
+        for field, value in values.items():
+            if field == "reserved":
+                sql += self.MATCH_CONDITIONS[bool(value)]
+            else:
+                sql += self.MATCH_CONDITIONS[field]
+                params.append(value)
+        return self._iter_query(sql + " ORDER BY a.rowid", params)  # Same text per field set, so cached
+
+    def iter_names(self, batch_size=10_000):
+        """Yields the name of every stored animal without building any animals."""
+        with self._lock:
+            cursor = self._conn.execute(self.SELECT_NAMES)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for (name,) in rows:
+                yield name
+
+    @instrumented("store.add_many")
+    def add_many(self, animals):
+        """Stores a batch of new animals with executemany inside a single transaction."""
+        now = self._timestamp()
+        animal_rows, status_rows, reservation_rows = [], [], []
+        for animal in animals:
+            key = AnimalRegistry.name_key(animal.name)
+            is_monkey = animal.animal_type == "Monkey"
+            animal_rows.append((key, animal.name, animal.animal_type,
+                                animal.species if is_monkey else animal.breed,
+                                animal.gender, animal.age, animal.weight, animal.acquisition_date.toordinal(),
+                                animal.acquisition_country, animal.in_service_country,
+                                animal.tail_length if is_monkey else None,
+                                animal.height if is_monkey else None,
+                                animal.body_length if is_monkey else None))
+            status_rows.append((key, animal.training_status, now))
+            if animal.reserved:
+                reservation_rows.append((key, now))
+        with self._lock, self._conn:  # One transaction for the whole batch
+            self._conn.executemany(self.INSERT_ANIMAL, animal_rows)
+            self._conn.executemany(self.UPSERT_STATUS, status_rows)
+            self._conn.executemany(self.INSERT_RESERVATION, reservation_rows)
+
+    def set_reserved(self, animal):
+        """Records the animal's current reservation flag."""
+        key = AnimalRegistry.name_key(animal.name)
+        with self._lock, self._conn:
+            if animal.reserved:
+                self._conn.execute(self.INSERT_RESERVATION, (key, self._timestamp()))
+            else:
+                self._conn.execute(self.DELETE_RESERVATION, (key,))
+
+    def set_training_status(self, animal):
+        """Records the animal's current training status."""
+        with self._lock, self._conn:
+            self._conn.execute(self.UPSERT_STATUS,
+                               (AnimalRegistry.name_key(animal.name), animal.training_status, self._timestamp()))
+
+    def set_training_statuses(self, animals):
+        """Records the current training status of a batch of animals in a single transaction."""
+        now = self._timestamp()
+        with self._lock, self._conn:  # Rolled back as a whole if any row fails
+            self._conn.executemany(self.UPSERT_STATUS, [(AnimalRegistry.name_key(animal.name),
+                                                         animal.training_status, now) for animal in animals])
+
+    def sync(self):
+        """Nothing to wait for: every change is committed before its method returns."""
+
+# =============================================================================
+# Binary Snapshot Format: Memory-Mapped Columns
+# =============================================================================
+# A snapshot file holds the whole roster in a fixed layout:
+#   header    magic, format version, byte order, event sequence number, row count,
+#             then the first and end row of each animal type (rows are grouped by type)
+#   offsets   (byte offset, byte length) of every section, in snapshot_sections order
+#   sections  "dictionaries": JSON {column: [distinct values]}; each text column
+#             stores codes into its own dictionary, 1, 2, or 4 bytes wide
+#             "names" and "name_offsets": UTF-8 names and where each one starts
+#             "name_index": rows sorted by case-folded name, for binary search
+#             "dates", "date_index", "date_sorted": acquisition day ordinal of each
+#             row, rows sorted by date, and the dates in that order
+#             "reserved": one byte per row
+# Sections start on 8-byte boundaries and hold native integers (array typecodes).
+
+snapshot_magic = b"RESCUESN"
+snapshot_version = 1
+snapshot_header = struct.Struct("<8sHHqQ")  # Magic, version, little-endian flag, sequence number, row count
+snapshot_pair = struct.Struct("<QQ")  # A type's row range, or a section's offset and length
+# Dictionary-encoded text columns and their position in an animal_row() tuple
+snapshot_text_columns = {"breed_species": 2, "gender": 3, "age": 4, "weight": 5, "acquisition_country": 7,
+                         "training_status": 8, "in_service_country": 10, "tail_length": 11, "height": 12,
+                         "body_length": 13}
+snapshot_sections = ("dictionaries", "names", "name_offsets", "name_index", "dates", "date_index",
+                     "date_sorted", "reserved", *snapshot_text_columns)
+
+def code_typecode(dictionary_size):
+    # Narrowest array typecode that can hold every code of a dictionary
+    if dictionary_size <= 1 << 8:
+        return "B"
+    return "H" if dictionary_size <= 1 << 16 else "I"
+
+def write_snapshot(path, seq, rows):
+    """Writes animal_row() tuples, which include every event up to seq, as a binary snapshot file.
+
+    Returns the case-folded names in the order the rows were written.
+    """
+    type_order = {animal_type: index for index, animal_type in enumerate(animal_types)}
+    rows = sorted(rows, key=lambda row: type_order[row[1]])  # Stable, so intake order is kept within a type
+    count = len(rows)
+    type_ranges, start = [], 0
+    type_counts = {animal_type: 0 for animal_type in animal_types}
+    for row in rows:
+        type_counts[row[1]] += 1
+    for animal_type in animal_types:
+        type_ranges.append((start, start + type_counts[animal_type]))
+        start += type_counts[animal_type]
+
+    sections, dictionaries = {}, {}
+    for column, field in snapshot_text_columns.items():
+        codes = {}
+        values = [codes.setdefault(row[field], len(codes)) for row in rows]
+        dictionaries[column] = list(codes)
+        sections[column] = array(code_typecode(len(codes)), values).tobytes()
+    sections["dictionaries"] = json.dumps(dictionaries).encode("utf-8")
+    names = [row[0].encode("utf-8") for row in rows]
+    sections["names"] = b"".join(names)
+    sections["name_offsets"] = array("q", accumulate(map(len, names), initial=0)).tobytes()
+    keys = [AnimalRegistry.name_key(row[0]) for row in rows]
+    sections["name_index"] = array("I", sorted(range(count), key=keys.__getitem__)).tobytes()
+    dates = array("i", [row[6] for row in rows])
+    date_index = array("I", sorted(range(count), key=dates.__getitem__))
+    sections["dates"] = dates.tobytes()
+    sections["date_index"] = date_index.tobytes()
+    sections["date_sorted"] = array("i", [dates[row] for row in date_index]).tobytes()
+    sections["reserved"] = bytes(bool(row[9]) for row in rows)
+
+    offsets = []
+    position = snapshot_header.size + snapshot_pair.size * (len(animal_types) + len(snapshot_sections))
+    for name in snapshot_sections:
+        position = (position + 7) & ~7  # Align each section to 8 bytes
+        offsets.append((position, len(sections[name])))
+        position += len(sections[name])
+    with open(path, "wb") as snapshot:
+        snapshot.write(snapshot_header.pack(snapshot_magic, snapshot_version, sys.byteorder == "little",
+                                            seq, count))
+        for pair in type_ranges + offsets:
+            snapshot.write(snapshot_pair.pack(*pair))
+        for name, (offset, _) in zip(snapshot_sections, offsets):
+            snapshot.write(bytes(offset - snapshot.tell()))
+            snapshot.write(sections[name])
+        snapshot.flush()
+        os.fsync(snapshot.fileno())
+    return keys
+
+class MappedSnapshot:
+    """Read-only view of a binary snapshot file, opened with mmap.
+
+    Counting, name lookups, date range searches, and filters on the coded
+    columns (training status, in-service country, reservation) read the
+    mapped columns directly. row() decodes a single row, and animal()
+    builds a Dog, Cat, or Monkey for it, so objects exist only for the rows
+    a caller touches.
+
+    The owning EventLogStore counts the iterators reading a snapshot in
+    readers; a snapshot replaced by compaction is unmapped only once the
+    last of them finishes, so its row numbers stay valid until then.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.readers = 0  # Open iterators reading this snapshot's rows
+        self.retired = False  # Replaced by a newer snapshot; closed when the last reader finishes
+        with open(path, "rb") as snapshot:
+            self._map = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        magic, version, little_endian, self.seq, self.count = snapshot_header.unpack_from(view)
+        if magic != snapshot_magic or version != snapshot_version:
+            raise ValueError(f"{path} is not a version {snapshot_version} snapshot file")
+        if bool(little_endian) != (sys.byteorder == "little"):
+            raise ValueError(f"{path} was written on a machine with a different byte order")
+        pairs = [snapshot_pair.unpack_from(view, snapshot_header.size + snapshot_pair.size * index)
+                 for index in range(len(animal_types) + len(snapshot_sections))]
+        self.type_ranges = dict(zip(animal_types, pairs))  # Type -> (first row, end row)
+        sections = {name: view[offset:offset + length]
+                    for name, (offset, length) in zip(snapshot_sections, pairs[len(animal_types):])}
+        self._dictionaries = json.loads(bytes(sections["dictionaries"]))
+        self._codes = {column: sections[column].cast(code_typecode(len(self._dictionaries[column])))
+                       for column in snapshot_text_columns}
+        self._names = sections["names"]
+        self._name_offsets = sections["name_offsets"].cast("q")
+        self._name_index = sections["name_index"].cast("I")
+        self._dates = sections["dates"].cast("i")
+        self._date_index = sections["date_index"].cast("I")
+        self._date_sorted = sections["date_sorted"].cast("i")
+        self._reserved = sections["reserved"]
+        self._views = [view, *sections.values(), *self._codes.values(), self._name_offsets, self._name_index,
+                       self._dates, self._date_index, self._date_sorted]
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()  # The map cannot close while views of it exist
+        self._map.close()
+
+    def name(self, row):
+        """Returns the name stored in a row."""
+        return str(self._names[self._name_offsets[row]:self._name_offsets[row + 1]], "utf-8")
+
+    def animal_type(self, row):
+        """Returns the animal type of a row, from the type ranges."""
+        for animal_type, (start, end) in self.type_ranges.items():
+            if start <= row < end:
+                return animal_type
+        raise IndexError(row)
+
+    def text(self, column, row):
+        """Returns one dictionary-encoded value of a row."""
+        return self._dictionaries[column][self._codes[column][row]]
+
+    def find(self, name_key):
+        """Returns the row of the animal with this case-folded name, or None, by binary search."""
+        index = self._name_index
+        low, high = 0, len(index)
+        while low < high:
+            middle = (low + high) // 2
+            if AnimalRegistry.name_key(self.name(index[middle])) < name_key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(index) and AnimalRegistry.name_key(self.name(index[low])) == name_key:
+            return index[low]
+        return None
+
+    def row(self, row):
+        """Decodes one row into the tuple layout animal_from_row() reads."""
+        text = self.text
+        return (self.name(row), self.animal_type(row), text("breed_species", row), text("gender", row),
+                text("age", row), text("weight", row), self._dates[row], text("acquisition_country", row),
+                text("training_status", row), bool(self._reserved[row]), text("in_service_country", row),
+                text("tail_length", row), text("height", row), text("body_length", row))
+
+    def animal(self, row):
+        """Builds the Dog, Cat, or Monkey stored in a row."""
+        return animal_from_row(self.row(row))
+
+    def rows_of_type(self, animal_type):
+        """Returns the rows holding one type, in intake order."""
+        return range(*self.type_ranges[animal_type])
+
+    def status_counts(self, animal_type):
+        """Returns {training status: number of rows} for one type, counted on the mapped column."""
+        start, end = self.type_ranges[animal_type]
+        codes = self._codes["training_status"][start:end]
+        statuses = self._dictionaries["training_status"]
+        if codes.itemsize == 1:
+            data = codes.tobytes()
+            counts = {status: data.count(code) for code, status in enumerate(statuses)}  # One C-level pass each
         else:
-            print("Invalid choice. Please try again.")
+            counts = {}
+            for code in codes:
+                counts[statuses[code]] = counts.get(statuses[code], 0) + 1
+        return {status: count for status, count in counts.items() if count}
+
+    def rows_matching(self, animal_type, **values):
+        """Returns the rows of one type whose columns hold the given values, in intake order.
+
+        values maps text columns (such as training_status) to a value and
+        reserved to a flag. Each column is scanned as raw codes in one
+        C-level pass over the rows still matching, without decoding a row.
+        """
+        start, end = self.type_ranges[animal_type]
+        rows = range(start, end)
+        for column, value in values.items():
+            if column == "reserved":
+                codes, code = self._reserved, int(bool(value))
+            else:
+                dictionary = self._dictionaries[column]
+                if value not in dictionary:
+                    return []  # No row holds a value the snapshot never saw
+                codes, code = self._codes[column], dictionary.index(value)
+            if isinstance(rows, range):
+                rows = list(compress(rows, map(code.__eq__, codes[start:end])))
+            else:
+                rows = list(compress(rows, map(code.__eq__, map(codes.__getitem__, rows))))
+        return rows
+
+    def rows_acquired_between(self, start, end):
+        """Returns the rows acquired between two dates (inclusive), ordered by acquisition date."""
+        low = bisect_left(self._date_sorted, start.toordinal())
+        high = bisect_left(self._date_sorted, end.toordinal() + 1)
+        return self._date_index[low:high]
 
 # =============================================================================
-# Entry Point of the Application
+# Persistent Storage: Append-Only Event Log with Snapshots
+# =============================================================================
+class EventLogStore:
+    """Persists the roster as an append-only event log plus periodic snapshots.
+
+    Every intake, reservation change, and training status change is appended
+    to the open log segment as one JSON line. sync() makes everything
+    appended so far durable with one fsync; threads that call it while
+    another thread's fsync is running usually find their events covered by
+    it, so concurrent writers share fsyncs. The registry calls sync() after
+    every change, so nothing (in particular no reservation) is acknowledged
+    before it is on disk.
+
+    Once snapshot_every events have been logged, a background thread writes
+    a compacted binary snapshot (see MappedSnapshot) and deletes the log
+    segments and older snapshots it replaces. Opening the store maps the
+    latest snapshot and replays only the events logged after it, so restart
+    time is bounded by snapshot_every events, not by the roster size. A torn
+    last line left by a crash is discarded; it was never acknowledged.
+
+    Animals in the snapshot are built only when they are looked up, changed,
+    or listed. Looked-up and changed animals are kept, so the registry and
+    the store share one object per animal; listed ones are not.
+    """
+
+    SNAPSHOT_PREFIX = "snapshot."  # Snapshots are named snapshot.<last included sequence number>.bin
+    SNAPSHOT_SUFFIX = ".bin"
+    SEGMENT_PREFIX = "events."  # Segments are named events.<first sequence number>.jsonl
+    SEGMENT_SUFFIX = ".jsonl"
+
+    def __init__(self, directory, snapshot_every=100_000):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self._snapshot = None  # MappedSnapshot of the latest snapshot file, if there is one
+        self._animals = {}  # Name key -> animal, for every animal added, changed, or looked up
+        self._rows = {}  # Name key -> snapshot row, for the kept animals that came from the snapshot
+        self._added_keys = []  # Name keys of animals added since the snapshot, in intake order
+        self._lock = threading.RLock()  # Guards the animals, the sequence counter, and the open segment
+        self._sync_lock = threading.Lock()  # Held while flushing to disk; taken before _lock
+        self._snapshot_lock = threading.Lock()  # Allows one snapshot at a time
+        self._snapshot_thread = None
+        self._seq = 0  # Sequence number of the last logged event
+        self._synced_seq = 0  # Sequence number of the last event known to be on disk
+        self._events_since_snapshot = 0
+        self._closed = False  # Set by close(); no snapshot starts after it
+        os.makedirs(directory, exist_ok=True)
+        self._remove_partial_snapshots()
+        self._replay()
+        self._segment = self._open_segment()
+
+    def _path(self, file_name):
+        return os.path.join(self.directory, file_name)
+
+    def _numbered_files(self, prefix, suffix):
+        # (number, path) of every file named <prefix><number><suffix>, lowest number first
+        files = []
+        for file_name in os.listdir(self.directory):
+            number = file_name[len(prefix):-len(suffix)]
+            if file_name.startswith(prefix) and file_name.endswith(suffix) and number.isdigit():
+                files.append((int(number), self._path(file_name)))
+        return sorted(files)
+
+    def _segments(self):
+        # (first sequence number, path) of every log segment, oldest first
+        return self._numbered_files(self.SEGMENT_PREFIX, self.SEGMENT_SUFFIX)
+
+    def _snapshots(self):
+        # (last included sequence number, path) of every snapshot, oldest first
+        return self._numbered_files(self.SNAPSHOT_PREFIX, self.SNAPSHOT_SUFFIX)
+
+    def _remove_partial_snapshots(self):
+        # Delete snapshot files a crash or kill left half-written; they were never renamed into place
+        for file_name in os.listdir(self.directory):
+            if file_name.startswith(self.SNAPSHOT_PREFIX) and file_name.endswith(self.SNAPSHOT_SUFFIX + ".tmp"):
+                os.remove(self._path(file_name))
+
+    def _fsync_directory(self):
+        # Make new and renamed file names durable; not supported on every platform
+        try:
+            descriptor = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(descriptor)
+        except OSError:
+            pass
+        finally:
+            os.close(descriptor)
+
+    def _open_segment(self):
+        # Start a new segment for the events after the last logged one
+        segment = open(self._path(f"{self.SEGMENT_PREFIX}{self._seq + 1:012d}{self.SEGMENT_SUFFIX}"), "ab")
+        self._fsync_directory()
+        return segment
+
+    def _replay(self):
+        # Map the latest snapshot, then apply the logged events that came after it
+        snapshots = self._snapshots()
+        if snapshots:
+            self._snapshot = MappedSnapshot(snapshots[-1][1])
+            self._seq = self._snapshot.seq
+        snapshot_seq = self._seq
+        for _, path in self._segments():
+            with open(path, "rb") as segment:
+                intact = 0  # Bytes of complete, readable lines
+                for line in segment:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("incomplete line")
+                        event = json.loads(line)
+                    except ValueError:
+                        break  # Torn write from a crash
+                    intact += len(line)
+                    if event[0] > self._seq:  # Events already in the snapshot are skipped
+                        self._apply(event)
+                        self._seq = event[0]
+            if intact < os.path.getsize(path):
+                os.truncate(path, intact)  # Drop the torn tail so later appends start on a clean line
+        self._synced_seq = self._seq
+        self._events_since_snapshot = self._seq - snapshot_seq
+
+    def _apply(self, event):
+        # Apply one logged event; events carry absolute values, so replaying one twice is harmless
+        kind = event[1]
+        if kind == "add":
+            animal = animal_from_row(event[2])
+            key = AnimalRegistry.name_key(animal.name)
+            if not self.exists(key):
+                self._animals[key] = animal
+                self._added_keys.append(key)
+        elif kind == "reserved":
+            self.fetch(event[2]).reserved = event[3]
+        elif kind == "status":
+            self.fetch(event[2]).update_training_status(training_statuses.restore(event[3]))
+        elif kind == "statuses":
+            for key, status in event[2]:
+                self.fetch(key).update_training_status(training_statuses.restore(status))
+
+    def _append(self, events):
+        # Write events to the open segment; they are durable after the next sync()
+        with self._lock:
+            lines = []
+            for event in events:
+                self._seq += 1
+                lines.append(json.dumps([self._seq, *event], separators=(",", ":")))
+            self._segment.write(("\n".join(lines) + "\n").encode("utf-8"))
+            self._events_since_snapshot += len(lines)
+
+    def sync(self):
+        """Blocks until every event logged so far is on disk."""
+        target = self._seq
+        with self._sync_lock:
+            if self._synced_seq < target:  # Otherwise another thread's fsync already covered these events
+                with self._lock:
+                    self._segment.flush()
+                    synced_seq = self._seq
+                os.fsync(self._segment.fileno())  # Segments are only swapped while _sync_lock is held
+                self._synced_seq = synced_seq
+        if self._events_since_snapshot >= self.snapshot_every:
+            self._start_snapshot()
+
+    def _start_snapshot(self):
+        # Snapshot in the background so the caller's change is acknowledged without waiting
+        with self._lock:
+            if self._closed or (self._snapshot_thread is not None and self._snapshot_thread.is_alive()):
+                return
+            self._snapshot_thread = threading.Thread(target=self.snapshot, daemon=True)
+            self._snapshot_thread.start()
+
+    def snapshot(self):
+        """Writes a compacted snapshot of the roster and deletes the files it replaces.
+
+        Changes are only blocked while the kept animals are copied; the
+        snapshot is written from the old mapped snapshot while new events go
+        to a fresh segment.
+        """
+        with self._snapshot_lock:
+            with self._sync_lock, self._lock:
+                self._segment.flush()
+                os.fsync(self._segment.fileno())
+                self._segment.close()
+                seq = self._synced_seq = self._seq
+                old = self._pin_snapshot()  # Read below while new events are logged
+                kept = {key: animal_row(animal) for key, animal in self._animals.items()}
+                added_count = len(self._added_keys)
+                added = [kept[key] for key in self._added_keys]
+                self._segment = self._open_segment()
+                self._events_since_snapshot = 0
+
+            def rows():
+                # Old snapshot rows, replaced by the kept version where there is one, then new animals
+                if old is not None:
+                    for row in range(old.count):
+                        yield kept.get(AnimalRegistry.name_key(old.name(row))) or old.row(row)
+                yield from added
+
+            path = self._path(f"{self.SNAPSHOT_PREFIX}{seq:012d}{self.SNAPSHOT_SUFFIX}")
+            try:
+                written_keys = write_snapshot(path + ".tmp", seq, rows())
+                os.replace(path + ".tmp", path)  # Atomic: a crash leaves either the old or the new snapshot
+                self._fsync_directory()
+                snapshot = MappedSnapshot(path)
+                rows_by_key = {key: row for row, key in enumerate(written_keys) if key in kept}
+                with self._lock:
+                    self._snapshot = snapshot
+                    for key in self._animals.keys() - rows_by_key.keys():  # Kept while the snapshot was written
+                        rows_by_key[key] = snapshot.find(key)
+                    self._rows = {key: row for key, row in rows_by_key.items() if row is not None}
+                    del self._added_keys[:added_count]  # Those animals are in the snapshot now
+                    self._retire_snapshot(old)
+            finally:
+                self._unpin_snapshot(old)  # Unmapped now unless an iterator still reads it
+            for first, path in self._segments():
+                if first <= seq:  # Every event in this segment is in the snapshot
+                    os.remove(path)
+            for snapshot_seq, path in self._snapshots():
+                if snapshot_seq < seq:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass  # Still mapped on a platform that forbids removing it; removed next time
+
+    def close(self):
+        """Waits for a running snapshot to finish, makes every logged event durable, and closes the files."""
+        with self._lock:
+            self._closed = True
+            thread = self._snapshot_thread
+        if thread is not None:
+            thread.join()
+        self.sync()
+        with self._lock:
+            self._segment.close()
+            self._retire_snapshot(self._snapshot)
+
+    def _pin_snapshot(self):
+        # The current snapshot (or None), kept mapped until it is passed to _unpin_snapshot(); callers hold
+        # the lock
+        if self._snapshot is not None:
+            self._snapshot.readers += 1
+        return self._snapshot
+
+    def _unpin_snapshot(self, snapshot):
+        # Release a snapshot from _pin_snapshot(), unmapping it if it was retired and nothing else reads it
+        if snapshot is None:
+            return
+        with self._lock:
+            snapshot.readers -= 1
+            if snapshot.retired and not snapshot.readers:
+                snapshot.close()
+
+    def _retire_snapshot(self, snapshot):
+        # Unmap a snapshot that is no longer current, now or when its last reader finishes; callers hold the lock
+        if snapshot is not None:
+            snapshot.retired = True
+            if not snapshot.readers:
+                snapshot.close()
+
+    @contextmanager
+    def _reading(self):
+        # (snapshot, animals added since it) as one consistent view for an iterator: the snapshot stays
+        # mapped, and its row numbers keep meaning the same animals, even if compaction replaces it meanwhile
+        with self._lock:
+            snapshot = self._pin_snapshot()
+            added = [self._animals[key] for key in self._added_keys]
+        try:
+            yield snapshot, added
+        finally:
+            self._unpin_snapshot(snapshot)
+
+    def _snapshot_animal(self, snapshot, row):
+        # The kept animal for a row of snapshot if there is one, otherwise a new object that is not kept
+        animal = self._animals.get(AnimalRegistry.name_key(snapshot.name(row))) if self._animals else None
+        return animal if animal is not None else snapshot.animal(row)
+
+    def count(self):
+        """Returns the number of stored animals."""
+        with self._lock:
+            return (self._snapshot.count if self._snapshot else 0) + len(self._added_keys)
+
+    def status_counts(self, animal_type):
+        """Returns {training status: number of stored animals} for one type.
+
+        Counts come from the snapshot's mapped status column, corrected for
+        the animals changed or added since.
+        """
+        with self._lock:
+            counts = self._snapshot.status_counts(animal_type) if self._snapshot else {}
+            for key, animal in self._animals.items():
+                if animal.animal_type != animal_type:
+                    continue
+                row = self._rows.get(key)
+                if row is not None:
+                    status = self._snapshot.text("training_status", row)
+                    counts[status] -= 1
+                counts[animal.training_status] = counts.get(animal.training_status, 0) + 1
+        return {status: count for status, count in counts.items() if count}
+
+    def exists(self, name_key):
+        """Returns True if an animal with this case-folded name is stored."""
+        with self._lock:
+            return name_key in self._animals or (self._snapshot is not None and
+                                                 self._snapshot.find(name_key) is not None)
+
+    def fetch(self, name_key):
+        """Returns the stored animal with this case-folded name, or None, and keeps it."""
+        with self._lock:
+            animal = self._animals.get(name_key)
+            if animal is None and self._snapshot is not None:
+                row = self._snapshot.find(name_key)
+                if row is not None:
+                    animal = self._animals[name_key] = self._snapshot.animal(row)
+                    self._rows[name_key] = row
+            return animal
+
+    def iter_animals(self, animal_type):
+        """Yields the stored animals of one type in intake order, building each one as it is reached.
+
+        The roster is the one stored when iteration starts; a compaction
+        meanwhile does not change which animals are yielded.
+        """
+        with self._reading() as (snapshot, added):
+            if snapshot is not None:
+                for row in snapshot.rows_of_type(animal_type):
+                    yield self._snapshot_animal(snapshot, row)
+            for animal in added:
+                if animal.animal_type == animal_type:
+                    yield animal
+
+    def iter_acquired_between(self, start, end):
+        """Yields stored animals acquired between two dates (inclusive), ordered by acquisition date."""
+        with self._reading() as (snapshot, added):
+            added = sorted((animal for animal in added if start <= animal.acquisition_date <= end),
+                           key=lambda animal: animal.acquisition_date)
+            mapped = ()
+            if snapshot is not None:
+                mapped = (self._snapshot_animal(snapshot, row) for row in snapshot.rows_acquired_between(start, end))
+            yield from merge(mapped, added, key=lambda animal: animal.acquisition_date)
+
+    def iter_matching(self, animal_type, **values):
+        """Yields the stored animals of one type whose fields hold the given values, in intake order.
+
+        values maps training_status and in_service_country to a value and
+        reserved to a flag. Snapshot rows are found by scanning the mapped
+        code columns, so objects are built only for matching rows. Kept
+        animals may have changed since the snapshot, so they are checked on
+        their current values instead of their rows.
+        """
+        def matches(animal):
+            return all(getattr(animal, field) == value for field, value in values.items())
+
+        with self._reading() as (snapshot, added):
+            if snapshot is not None:
+                rows = snapshot.rows_matching(animal_type, **values)
+                with self._lock:
+                    kept = [key for key, animal in self._animals.items()
+                            if animal.animal_type == animal_type and matches(animal)]
+                kept_rows = {row for row in map(snapshot.find, kept) if row is not None}  # Whatever their row holds
+                if kept_rows:
+                    rows = sorted(kept_rows.union(rows))
+                for row in rows:
+                    animal = self._snapshot_animal(snapshot, row)
+                    if matches(animal):
+                        yield animal
+            for animal in added:
+                if animal.animal_type == animal_type and matches(animal):
+                    yield animal
+
+    def iter_names(self):
+        """Yields the name of every stored animal, reading snapshot names from the mapped column."""
+        with self._reading() as (snapshot, added):
+            if snapshot is not None:
+                yield from map(snapshot.name, range(snapshot.count))
+            for animal in added:
+                yield animal.name
+
+    @instrumented("store.add_many")
+    def add_many(self, animals):
+        """Logs a batch of new animals."""
+        with self._lock:
+            self._append([("add", animal_row(animal)) for animal in animals])
+            for animal in animals:
+                key = AnimalRegistry.name_key(animal.name)
+                self._animals[key] = animal
+                self._added_keys.append(key)
+
+    def set_reserved(self, animal):
+        """Logs the animal's current reservation flag."""
+        with self._lock:
+            self._append([("reserved", self._keep(animal), animal.reserved)])
+
+    def set_training_status(self, animal):
+        """Logs the animal's current training status."""
+        with self._lock:
+            self._append([("status", self._keep(animal), animal.training_status)])
+
+    def set_training_statuses(self, animals):
+        """Logs the current training status of a batch of animals as one event.
+
+        A single line is replayed whole or, if torn by a crash, not at all.
+        """
+        with self._lock:
+            self._append([("statuses", [(self._keep(animal), animal.training_status) for animal in animals])])
+
+    def _keep(self, animal):
+        # Keep a changed animal so later counts and lookups see the change; returns its name key
+        key = AnimalRegistry.name_key(animal.name)
+        if key not in self._animals:
+            self._animals[key] = animal
+            self._rows[key] = self._snapshot.find(key)
+        return key
+
+# =============================================================================
+# Name Search: Prefix and Fuzzy Matching
 # =============================================================================
+def bounded_edit_distance(a, b, limit):
+    """Returns the edit distance between a and b, or None if it is more than limit.
+
+    Insertions, deletions, substitutions, and swaps of two adjacent letters
+    each count as one edit. Only cells within limit of the diagonal are
+    computed, and the work stops once no later row can come back under the
+    limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    if len(a) > len(b):
+        a, b = b, a
+    over = limit + 1  # Every value above the limit is stored as limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    previous_min = 0
+    for i, char in enumerate(a, 1):
+        current = [min(i, over)] + [over] * len(b)
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        for j in range(low, high + 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != b[j - 1]), over)
+            if j > 1 and i > 1 and char == b[j - 2] and a[i - 2] == b[j - 1]:
+                cost = min(cost, before[j - 2] + 1)  # Adjacent letters swapped
+            current[j] = cost
+        current_min = min(current[low - 1:high + 1])
+        if current_min > limit and previous_min >= limit:
+            return None  # A swap could reach back one row, so both rows must be out of reach
+        before, previous, previous_min = previous, current, current_min
+    return previous[-1] if previous[-1] <= limit else None
+
+def one_edit_spellings(key, alphabet):
+    """Yields every spelling one edit away from key: a letter deleted, swapped with the next, inserted, or replaced.
+
+    Inserted and replacement letters come from alphabet. Some spellings may
+    repeat.
+    """
+    splits = [(key[:i], key[i:]) for i in range(len(key) + 1)]
+    for head, tail in splits:
+        if tail:
+            yield head + tail[1:]
+            if len(tail) > 1:
+                yield head + tail[1] + tail[0] + tail[2:]
+        for letter in alphabet:
+            yield head + letter + tail
+            if tail:
+                yield head + letter + tail[1:]
+
+def name_trigrams(key):
+    # Distinct three-character pieces of a case-folded name, padded so the start and end count too
+    padded = f"\0\0{key}\0"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class NameIndex:
+    """Finds names by prefix and by approximate spelling, case-insensitively.
+
+    Prefix search walks a sorted list of case-folded names: the names under
+    any node of a trie form one contiguous run of that list, so two binary
+    searches find them without a node object per letter. Names added since
+    the last search are merged in on the next one.
+
+    Fuzzy search finds names one edit (an insertion, deletion,
+    substitution, or swap of adjacent letters) away by looking up every
+    such spelling of the query directly, a few hundred dictionary lookups.
+    For names two edits away it keeps, for every trigram, the ids of the
+    names containing it. One edit changes at most four trigrams, so a name
+    within two edits shares all but eight of the query's trigrams: only
+    names in one of the nine rarest posting lists can match, and only those
+    sharing enough trigrams are checked with a bounded edit distance. That
+    filter only narrows the search for long queries, so shorter ones are
+    matched within one edit.
+    """
+
+    two_edit_length = 12  # Shortest query matched within two edits
+
+    def __init__(self, names=()):
+        self._ids = {}  # Case-folded name -> id
+        self._names = []  # Id -> name as entered
+        self._keys = []  # Id -> case-folded name
+        self._sorted = []  # Case-folded names in sorted order
+        self._sorted_pending = []  # Case-folded names added since the sorted list was last merged
+        self._postings = {}  # Trigram -> array of the ids of names containing it, ascending
+        self._alphabet = set()  # Every character used in a name, for one-edit spellings
+        self.add_many(names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, name):
+        """Adds a name; a name already in the index (case-insensitive) is ignored."""
+        self.add_many([name])
+
+    def add_many(self, names):
+        """Adds a batch of names, ignoring ones already in the index (case-insensitive)."""
+        postings = self._postings
+        for name in names:
+            key = AnimalRegistry.name_key(name)
+            if key in self._ids:
+                continue
+            name_id = self._ids[key] = len(self._names)
+            self._names.append(name.strip())
+            self._keys.append(key)
+            self._sorted_pending.append(key)
+            self._alphabet.update(key)
+            for gram in name_trigrams(key):
+                ids = postings.get(gram)
+                if ids is None:
+                    ids = postings[gram] = array("I")
+                ids.append(name_id)
+
+    def _sorted_keys(self):
+        # The sorted name list with pending names merged in
+        if self._sorted_pending:
+            # Merge new names in one sort; Timsort handles the already-sorted prefix cheaply
+            self._sorted.extend(self._sorted_pending)
+            self._sorted.sort()
+            self._sorted_pending.clear()
+        return self._sorted
+
+    def prefix(self, text, limit=None):
+        """Returns the names starting with text, in alphabetical order, at most limit of them."""
+        prefix = AnimalRegistry.name_key(text)
+        keys = self._sorted_keys()
+        matches = []
+        for position in range(bisect_left(keys, prefix), len(keys)):
+            if not keys[position].startswith(prefix) or len(matches) == limit:
+                break
+            matches.append(self._names[self._ids[keys[position]]])
+        return matches
+
+    def fuzzy(self, text, max_distance=2, limit=None):
+        """Returns (edit distance, name) pairs for names within max_distance edits of text, closest first.
+
+        A swap of adjacent letters counts as one edit. Queries shorter than
+        two_edit_length letters are matched within one edit at most.
+        """
+        key = AnimalRegistry.name_key(text)
+        distances = {}  # Name id -> edit distance
+        if max_distance >= 2 and len(key) >= self.two_edit_length:
+            grams = sorted(name_trigrams(key), key=lambda gram: len(self._postings.get(gram, ())))
+            required = len(grams) - 8  # Trigrams a match must share
+            counts = Counter()
+            for gram in grams[:9]:  # Every match is in one of these lists
+                counts.update(self._postings.get(gram, ()))  # Counted in C
+            candidates = list(counts)
+            for position in range(9, len(grams)):
+                ids = self._postings.get(grams[position], ())
+                if len(ids) > 4 * len(candidates):
+                    required -= len(grams) - position  # Too costly to count the rest; ask for fewer shared
+                    break
+                counts.update(ids)
+            for name_id in candidates:
+                if counts[name_id] >= required:
+                    distance = bounded_edit_distance(key, self._keys[name_id], 2)
+                    if distance is not None:
+                        distances[name_id] = distance
+        if max_distance >= 1:
+            for spelling in one_edit_spellings(key, self._alphabet):
+                name_id = self._ids.get(spelling)
+                if name_id is not None and spelling != key:
+                    distances[name_id] = 1
+        if key in self._ids:
+            distances[self._ids[key]] = 0
+        matches = sorted(((distance, self._names[name_id]) for name_id, distance in distances.items()),
+                         key=lambda match: (match[0], match[1].casefold()))
+        return matches[:limit]
+
+    def search(self, text, limit=10):
+        """Returns up to limit names ranked for text: an exact match, then prefix matches, then near spellings."""
+        ranked = self.prefix(text, limit)  # An exact match sorts before every longer name it prefixes
+        if len(ranked) < limit:
+            found = set(ranked)
+            ranked.extend(name for _, name in self.fuzzy(text, limit=limit + len(ranked))
+                          if name not in found)
+        return ranked[:limit]
+
+# =============================================================================
+# Animal Registry: Owns and Indexes Every Animal in the System
+# =============================================================================
+class AnimalRegistry:
+    """Central store for all rescue animals.
+
+    Keeps a case-folded name index for O(1) lookups and duplicate checks,
+    per-type buckets so reports never rebuild a combined list, and a
+    reservation index keyed by (type, in-service country code, species,
+    reserved) so reservation searches only touch matching animals, per-type
+    buckets for each training stage code whose sizes serve as stage counts,
+    an acquisition date index for date range queries, a materialized view
+    of the animals available for service (training completed, not
+    reserved) per type and in-service country, and a NameIndex of every
+    name (stored ones included) for prefix and misspelled-name searches,
+    built the first time a name search runs. Subscribers registered with
+    subscribe_availability() are told whenever an animal becomes available
+    or stops being available. With NumPy installed, analytics() adds typed
+    columns of every animal's measurements and demographics for statistics,
+    kept in sync from then on.
+
+    With a store attached, every change is written through to it and synced
+    before the change returns, and stored animals are loaded lazily: single
+    animals on lookup by name, and a whole type the first time a report or
+    search needs it. Listings, and filters on training status, in-service
+    country, or reservation (the available list and reservation searches
+    among them), are answered by the store for types not loaded yet.
+
+    Index updates are thread-safe. Reservations from several threads should
+    go through the registry's ReservationEngine (registry.reservations).
+    """
+
+    completed_code = training_statuses.index("Completed")  # Training status an available animal has reached
+
+    def __init__(self, store=None):
+        self.store = store  # Optional persistent backend (SQLiteAnimalStore or EventLogStore)
+        self._by_name = {}  # Case-folded name -> animal, used for lookups and duplicate detection
+        self._by_type = {animal_type: [] for animal_type in animal_types}  # Per-type buckets in intake order
+        self._by_reservation_key = {}  # Reservation key -> {name key: animal}, in intake order
+        # Type -> training status code -> {name key: animal}; bucket sizes are the per-stage counts
+        self._by_status = {animal_type: {} for animal_type in animal_types}
+        self._by_date = []  # Sorted (acquisition date ordinal, name key) pairs
+        self._by_date_pending = []  # Pairs added since the date index was last sorted
+        self._name_index = None  # NameIndex of every name, built by the first name search
+        self._analytics = None  # RosterAnalytics columns of every animal, built by the first analytics() call
+        # Type -> in-service country code -> {name key: animal} for every loaded animal available for service
+        self._available = {animal_type: {} for animal_type in animal_types}
+        self._availability_subscribers = []  # callback(animal, available) for every availability change
+        self._availability_sequence = 0  # Number of the last availability change, counted under the lock
+        self._availability_delivered = {}  # Name key -> number of the last change delivered to subscribers
+        self._notify_lock = threading.RLock()  # Delivers one change at a time, in the order they were made
+        # Types whose stored animals are all in memory; without a store, everything is in memory
+        self._loaded_types = set() if store is not None else set(animal_types)
+        # Guards index maintenance when animals change from several threads; held only briefly
+        self._lock = threading.RLock()
+        self.reservations = ReservationEngine(self)  # Thread-safe reservations for every intake desk
+
+    @staticmethod
+    def name_key(name):
+        # Normalize a name so lookups are case-insensitive and ignore surrounding whitespace
+        return name.strip().casefold()
+
+    @staticmethod
+    def reservation_key(animal_type, in_service_country, species, reserved):
+        """Builds the reservation index key for a search, normalizing text the same way reserve_animal does.
+
+        The country is matched case-insensitively to its code; an unknown
+        country gets None, which no animal has. Dogs and Cats are not
+        searched by species, so their species is None.
+        """
+        return (animal_type,
+                countries.code_of(in_service_country),
+                species.strip().title() if species is not None else None,
+                bool(reserved))
+
+    @staticmethod
+    def _animal_reservation_key(animal, reserved):
+        # Reservation key for an animal with the given reservation flag, using its stored country code
+        return (animal.animal_type,
+                animal._in_service_country,
+                animal.species.strip().title() if animal.species is not None else None,
+                bool(reserved))
+
+    def _move_reservation_bucket(self, animal, old_key, new_key):
+        # Move an animal between reservation index buckets
+        if old_key == new_key:
+            return  # Nothing indexed has changed
+        key = self.name_key(animal.name)
+        old_bucket = self._by_reservation_key[old_key]
+        del old_bucket[key]
+        if not old_bucket:
+            del self._by_reservation_key[old_key]  # Drop empty buckets so the index stays compact
+        self._by_reservation_key.setdefault(new_key, {})[key] = animal
+
+    def _is_available(self, animal):
+        # Available for service: training completed and not reserved
+        return animal._training_status == self.completed_code and not animal._reserved
+
+    def _set_available(self, animal, available, key=None):
+        # Add an animal to or remove it from the available view; callers hold the lock
+        buckets = self._available[animal.animal_type]
+        key = key or self.name_key(animal.name)
+        if available:
+            buckets.setdefault(animal._in_service_country, {})[key] = animal
+        else:
+            bucket = buckets[animal._in_service_country]
+            del bucket[key]
+            if not bucket:
+                del buckets[animal._in_service_country]  # Drop empty buckets so the view stays compact
+
+    def _availability_event(self, animal, key=None):
+        # Number an availability change for subscribers, with the animal's availability now; callers hold the
+        # lock, so numbers follow the order changes were made. Returns None when nobody is subscribed
+        if not self._availability_subscribers:
+            return None
+        self._availability_sequence += 1
+        return key or self.name_key(animal.name), self._availability_sequence, animal, self._is_available(animal)
+
+    def _notify_availability(self, events):
+        # Tell every subscriber about numbered changes; called after they are stored and outside the lock.
+        # A change older than one already delivered for the same animal was superseded while its thread was
+        # storing it, and is skipped, so racing threads never leave a subscriber with a stale availability
+        events = [event for event in events if event is not None]
+        if not events:
+            return
+        with self._notify_lock:
+            for key, sequence, animal, available in events:
+                if sequence <= self._availability_delivered.get(key, 0):
+                    continue
+                self._availability_delivered[key] = sequence
+                for callback in list(self._availability_subscribers):
+                    callback(animal, available)
+
+    def _reindex_reserved(self, animal, old_reserved):
+        # Move an animal whose reservation flag changed from old_reserved to its new reservation bucket and
+        # update the available view; returns True if its availability changed. Callers hold the lock
+        self._move_reservation_bucket(animal, self._animal_reservation_key(animal, old_reserved),
+                                      self._animal_reservation_key(animal, animal.reserved))
+        changed = animal._training_status == self.completed_code  # Only completed animals change availability
+        if changed:
+            self._set_available(animal, not animal.reserved)
+        return changed
+
+    def _set_reserved(self, animal, reserved):
+        """Sets an owned animal's reservation flag; called by its reserved setter.
+
+        The flag changes and the indexes follow under the registry lock, so
+        availability is always decided from a training status no other
+        thread is changing. If the store rejects the change, the flag and
+        indexes are put back before the error is raised, so memory never
+        holds an unstored change. The store write and sync run outside the
+        registry lock, so reservations of different animals only share the
+        store's own locking; ReservationEngine's striped lock orders changes
+        to one animal.
+        """
+        with self._lock:
+            old_reserved = animal._reserved
+            if old_reserved == reserved:
+                return
+            was_available = self._is_available(animal)
+            animal._reserved = reserved
+            event = self._availability_event(animal) if self._reindex_reserved(animal, old_reserved) else None
+        if self.store is not None:
+            try:
+                self.store.set_reserved(animal)
+            except BaseException:
+                with self._lock:
+                    if animal._reserved == reserved:  # Not changed again meanwhile
+                        animal._reserved = old_reserved
+                        self._reindex_reserved(animal, reserved)
+                    # A status change made meanwhile may leave it differently available than before
+                    undone = self._is_available(animal) != was_available
+                    event = self._availability_event(animal) if undone else None
+                self._notify_availability([event])
+                raise
+            self.store.sync()  # Concurrent changes can share one disk flush
+        self._notify_availability([event])
+
+    def _reindex_status(self, animal, old_status, key=None):
+        # Move an animal whose training status code changed from old_status to its new stage bucket and
+        # update the available view; returns True if its availability changed. Callers hold the lock
+        key = key or self.name_key(animal.name)
+        buckets = self._by_status[animal.animal_type]
+        old_bucket = buckets[old_status]
+        del old_bucket[key]
+        if not old_bucket:
+            del buckets[old_status]
+        buckets.setdefault(animal._training_status, {})[key] = animal
+        if self._analytics is not None:
+            self._analytics.set_status(key, animal._training_status)
+        # Reaching or leaving "Completed" changes availability, unless the animal is reserved
+        changed = not animal._reserved and self.completed_code in (old_status, animal._training_status)
+        if changed:
+            self._set_available(animal, self._is_available(animal), key)
+        return changed
+
+    def _set_training_status(self, animal, status_code):
+        """Sets an owned animal's training status code; called by update_training_status().
+
+        The status changes, the indexes follow, and the store is written under
+        the registry lock; the change is undone if the store rejects it.
+        """
+        with self._lock:
+            old_status = animal._training_status
+            if old_status == status_code:
+                return
+            animal._training_status = status_code
+            changed = self._reindex_status(animal, old_status)
+            if self.store is not None:
+                try:
+                    self.store.set_training_status(animal)
+                except BaseException:
+                    animal._training_status = old_status
+                    self._reindex_status(animal, status_code)
+                    raise
+            event = self._availability_event(animal) if changed else None
+        if self.store is not None:
+            self.store.sync()
+        self._notify_availability([event])
+
+    def _index(self, animal):
+        # Add an animal to the in-memory indexes only (no duplicate check, no write-through);
+        # callers hold the registry lock
+        key = self.name_key(animal.name)
+        self._by_name[key] = animal  # Index by name
+        self._by_type[animal.animal_type].append(animal)  # Add to the bucket for its type
+        self._by_reservation_key.setdefault(
+            self._animal_reservation_key(animal, animal.reserved), {})[key] = animal
+        self._by_status[animal.animal_type].setdefault(animal._training_status, {})[key] = animal
+        self._by_date_pending.append((animal.acquisition_date.toordinal(), key))  # Sorted in on the next range query
+        if self._is_available(animal):
+            self._set_available(animal, True)
+        animal._registry = self  # Let the animal report changes to indexed fields
+
+    def _load_type(self, animal_type):
+        # Pull every stored animal of one type into memory the first time it is needed
+        if animal_type in self._loaded_types:
+            return  # Fast path without taking the lock
+        with self._lock:
+            if animal_type in self._loaded_types:
+                return  # Another thread loaded it while this one waited
+            for animal in self.store.iter_animals(animal_type):
+                if self.name_key(animal.name) not in self._by_name:  # Skip animals already loaded by name
+                    self._index(animal)
+            self._loaded_types.add(animal_type)
+
+    def add(self, animal):
+        """Adds an animal to the registry, rejecting duplicate names (case-insensitive)."""
+        self.add_many([animal])
+
+    @instrumented("registry.add_many")
+    def add_many(self, animals):
+        """Adds a batch of animals, rejecting duplicate names (case-insensitive).
+
+        The whole batch is checked before anything is added, and is written to
+        the store in one transaction before any index changes, so a failed
+        write leaves the registry as it was. With a store, animals of types
+        that have not been loaded are not kept in memory.
+        """
+        with self._lock:
+            seen = set()
+            for animal in animals:
+                key = self.name_key(animal.name)
+                if key in seen or animal.name in self:
+                    raise ValueError(f"An animal named '{animal.name}' is already in the system.")
+                seen.add(key)
+            if self.store is not None:
+                self.store.add_many(animals)
+            for animal in animals:
+                if animal.animal_type in self._loaded_types:
+                    self._index(animal)  # Types not loaded yet are read back from the store on demand
+            if self._name_index is not None:
+                self._name_index.add_many(animal.name for animal in animals)
+            if self._analytics is not None:
+                self._analytics.add_many(animals)
+            # Taken in already available
+            events = ([self._availability_event(animal) for animal in animals if self._is_available(animal)]
+                      if self._availability_subscribers else [])
+        if self.store is not None:
+            self.store.sync()
+        self._notify_availability(events)
+
+    @instrumented("registry.reservation_candidates")
+    def reservation_candidates(self, animal_type, in_service_country, species=None, reserved=False):
+        """Returns the animals matching a reservation search, in intake order.
+
+        Runs as a query that the planner answers from the reservation index,
+        so cost is proportional to the number of matches, not the size of the
+        roster.
+        """
+        query = self.query().where(animal_type=animal_type, in_service_country=in_service_country,
+                                   reserved=reserved)
+        if species is not None:
+            query = query.where(species=species)
+        return list(query)
+
+    @instrumented("registry.acquired_between")
+    def acquired_between(self, start, end):
+        """Returns animals acquired between two dates (inclusive), ordered by acquisition date.
+
+        Uses the sorted date index, so cost is proportional to the number of
+        matches plus a binary search. Without every type in memory, the
+        store's date index answers instead.
+        """
+        with self._lock:
+            if len(self._loaded_types) < len(animal_types):
+                matches = []
+                for animal in self.store.iter_acquired_between(start, end):
+                    loaded = self._by_name.get(self.name_key(animal.name))
+                    if loaded is None:
+                        self._index(animal)
+                        loaded = animal
+                    matches.append(loaded)
+                return matches
+            low, high = self._date_bounds(start, end)
+            return [self._by_name[key] for _, key in self._by_date[low:high]]
+
+    def _date_bounds(self, start, end):
+        # Slice of the sorted date index covering a date range; callers hold the lock with every type loaded
+        if self._by_date_pending:
+            # Merge new entries in one sort; Timsort handles the already-sorted prefix cheaply
+            self._by_date.extend(self._by_date_pending)
+            self._by_date.sort()
+            self._by_date_pending.clear()
+        return (bisect_left(self._by_date, (start.toordinal(),)),
+                bisect_left(self._by_date, (end.toordinal() + 1,)))
+
+    def get(self, name):
+        """Returns the animal with the given name (case-insensitive), or None if not found."""
+        key = self.name_key(name)
+        animal = self._by_name.get(key)
+        if animal is not None or len(self._loaded_types) == len(animal_types):
+            return animal
+        with self._lock:
+            animal = self._by_name.get(key)  # Another thread may have loaded it meanwhile
+            if animal is None:
+                animal = self.store.fetch(key)  # Point query; only this animal is loaded
+                if animal is not None:
+                    self._index(animal)
+            return animal
+
+    @instrumented("registry.search_names")
+    def search_names(self, text, limit=10):
+        """Returns up to limit names ranked for text: an exact match, then prefix matches, then near spellings.
+
+        The first search builds the name index from the store's names (or the
+        loaded animals without a store) without loading any animals.
+        """
+        with self._lock:
+            if self._name_index is None:
+                self._name_index = NameIndex(self.store.iter_names() if self.store is not None
+                                             else (animal.name for animal in self._by_name.values()))
+            return self._name_index.search(text, limit)
+
+    def analytics(self):
+        """Returns the RosterAnalytics columns of every animal, kept in sync with the registry from then on.
+
+        The first call loads every stored animal and parses the roster once;
+        it raises RuntimeError if NumPy is not installed.
+        """
+        with self._lock:
+            if self._analytics is None:
+                for animal_type in animal_types:
+                    self._load_type(animal_type)
+                self._analytics = RosterAnalytics(chain.from_iterable(self._by_type.values()))
+            return self._analytics
+
+    def find_animal(self, text, candidates=None):
+        """Returns the animal named text, or asks the user to pick from close matches when none is named exactly.
+
+        With candidates (a list of animals), only those can be found or
+        suggested. Returns None if nothing matches or the user cancels.
+        """
+        if candidates is None:
+            animal = self.get(text)
+        else:
+            by_key = {self.name_key(animal.name): animal for animal in candidates}
+            animal = by_key.get(self.name_key(text))
+        if animal is not None or not text.strip():
+            return animal
+        if candidates is None:
+            suggestions = self.search_names(text)
+        else:
+            suggestions = NameIndex(animal.name for animal in by_key.values()).search(text)
+        if not suggestions:
+            return None
+        choice = choose_option(f"No animal is named '{text}'. Did you mean:", suggestions)
+        if choice is None:
+            return None
+        return self.get(choice) if candidates is None else by_key[self.name_key(choice)]
+
+    def animals_of_type(self, animal_type):
+        """Returns the bucket of animals for one type (Dog, Cat, or Monkey)."""
+        self._load_type(animal_type)
+        return self._by_type[animal_type]
+
+    def query(self):
+        """Returns an AnimalQuery over every animal, to be narrowed with where() and friends."""
+        return AnimalQuery(self)
+
+    def iter_type(self, animal_type):
+        """Yields the animals of one type in intake order without loading the type into memory.
+
+        For a type not loaded from the store yet, animals are streamed from
+        the store, so a paged report only builds objects for the rows it reads.
+        """
+        if animal_type in self._loaded_types:
+            return iter(self._by_type[animal_type])
+        return self.store.iter_animals(animal_type)
+
+    def iter_matching(self, animal_type, training_status=None, in_service_country=None, reserved=None):
+        """Yields the animals of one type with the given training status, in-service country, and reservation
+        flag, in intake order, without loading the type into memory.
+
+        Values left as None are not checked; the others are the canonical
+        names (training_statuses[code], countries[code]). For a type not
+        loaded from the store yet, the store applies the filters (SQL, or a
+        scan of the snapshot's mapped columns), so objects are built only for
+        matching animals.
+        """
+        values = {field: value for field, value in (("training_status", training_status),
+                                                    ("in_service_country", in_service_country),
+                                                    ("reserved", reserved)) if value is not None}
+        if not values:
+            return self.iter_type(animal_type)
+        if animal_type in self._loaded_types:
+            return (animal for animal in self._by_type[animal_type]
+                    if all(getattr(animal, field) == value for field, value in values.items()))
+        return self.store.iter_matching(animal_type, **values)
+
+    def __contains__(self, name):
+        key = self.name_key(name)
+        if key in self._by_name:
+            return True
+        return len(self._loaded_types) < len(animal_types) and self.store.exists(key)
+
+    def __len__(self):
+        if len(self._loaded_types) < len(animal_types):
+            return self.store.count()  # Count without loading anything
+        return len(self._by_name)
+
+    def __iter__(self):
+        # Iterate all animals grouped by type (dogs, then cats, then monkeys) without building a new list
+        for animal_type in animal_types:
+            yield from self.iter_type(animal_type)
+
+    # -------------------------------------------------------------------------
+    # Animal Intake Process
+    # -------------------------------------------------------------------------
+    @instrumented("menu.intake_new_animal")
+    def intake_new_animal(self, animal_type):
+        """Guided process to intake a new animal.
+
+        Collects and validates user input, prevents duplicate names,
+        and adds the new animal to the registry.
+        """
+        while True:
+            print(f"\n--- Adding a New {animal_type} ---")
+
+            # Prompt user for animal's name and remove leading/trailing whitespace
+            name = input(f"Enter the {animal_type}'s name: ").strip()
+            # Check for duplicate names (case-insensitive) using the name index
+            if name in self:
+                print("\nThis name is already in the system. Please choose another.\n")
+                continue  # Restart process if duplicate found
+
+            # For Dog/Cat: ask for breed; for Monkey: ask for species
+            breed_species = input(f"Enter the {animal_type}'s {'breed' if animal_type in ['Dog', 'Cat'] else 'species'}: ").strip()
+            gender = get_valid_input("Select gender:", list(genders))  # Validate gender selection
+            age = input("Enter age in years: ").strip()  # Age entered as string
+            weight = get_valid_input("Select weight range:", weights)  # Validate weight range selection
+            acquisition_date = get_valid_date("Enter acquisition date")  # Validate date input
+            acquisition_country = get_valid_input("Select acquisition country:", countries)  # Validate country selection
+            training_status = get_valid_input("Select training status:", training_statuses)  # Validate training status
+            reserved = get_yes_no("Is this animal reserved?")  # Validate Yes/No input for reservation status
+            in_service_country = get_valid_input("Select in-service country:", countries)  # Validate in-service country selection
+
+            # Collect additional details for Monkeys
+            if animal_type == "Monkey":
+                tail_length = input("Enter tail length (in inches): ").strip()  # Get tail length
+                height = input("Enter height (in inches): ").strip()  # Get height
+                body_length = input("Enter body length (in inches): ").strip()  # Get body length
+
+            # Display all collected details for review before saving
+            print("\n--- Review Entered Details ---")
+            print(f"Name: {name}")
+            print(f"Type: {animal_type}")
+            print(f"Breed/Species: {breed_species}")
+            print(f"Gender: {gender}")
+            print(f"Age: {age} years")
+            print(f"Weight: {weight}")
+            print(f"Acquisition Date: {format_date(acquisition_date)}")
+            print(f"Acquisition Country: {acquisition_country}")
+            print(f"Training Status: {training_status}")
+            print(f"Reserved: {'Yes' if reserved else 'No'}")
+            print(f"In-Service Country: {in_service_country}")
+            if animal_type == "Monkey":
+                print(f"Tail Length: {tail_length} inches")
+                print(f"Height: {height} inches")
+                print(f"Body Length: {body_length} inches")
+
+            # Confirm that the information is correct before saving
+            if get_yes_no("Is this information correct?"):
+                # Depending on animal type, create the animal and add it to the registry
+                if animal_type == "Dog":
+                    self.add(Dog(name, breed_species, gender, age, weight,
+                                 acquisition_date, acquisition_country, training_status,
+                                 reserved, in_service_country))
+                elif animal_type == "Cat":
+                    self.add(Cat(name, breed_species, gender, age, weight,
+                                 acquisition_date, acquisition_country, training_status,
+                                 reserved, in_service_country))
+                else:  # For Monkey type
+                    self.add(Monkey(name, breed_species, gender, age, weight,
+                                    acquisition_date, acquisition_country, training_status,
+                                    reserved, in_service_country, tail_length, height, body_length))
+                print("\nNew animal has been added to the system.\n")
+                return  # Exit the intake process after successful entry
+            else:
+                print("\nRestarting entry process...\n")
+                # Loop will restart for re-entry of information
+
+    # -------------------------------------------------------------------------
+    # Data Initialization - Sample Data for project purposes
+    # -------------------------------------------------------------------------
+    def initialize_data(self):
+        """Initializes the registry with sample data for dogs, cats, and monkeys.
+
+        This method pre-loads the system with sample animal records for demonstration.
+        """
+        self.add_many([  # Added as one batch (a single transaction when a store is attached)
+            # Sample Dogs
+            Dog("Spot", "German Shepherd", "Male", "3", "60-65 lbs", "05-12-2020",
+                "United States", "In-Training", False, "United States"),
+            Dog("Luna", "Labrador Retriever", "Female", "4", "55-60 lbs", "03-18-2019",
+                "Canada", "Final Stage", True, "Canada"),
+            Dog("Max", "Golden Retriever", "Male", "2", "50-55 lbs", "07-25-2021",
+                "United Kingdom", "Completed", False, "United Kingdom"),
+
+            # Sample Cats (weights use the predefined 5 lb ranges, which intake enforces)
+            Cat("Whiskers", "Maine Coon", "Male", "5", "10-15 lbs", "08-12-2018",
+                "United States", "Completed", False, "United States"),
+            Cat("Misty", "Siamese", "Female", "3", "5-10 lbs", "10-30-2020",
+                "Australia", "In-Training", True, "Australia"),
+            Cat("Shadow", "British Shorthair", "Male", "4", "10-15 lbs", "12-05-2019",
+                "Germany", "Final Stage", False, "Germany"),
+
+            # Sample Monkeys
+            Monkey("Charlie", "Guenon", "Male", "2", "20-25 lbs", "04-10-2021",
+                   "United States", "In-Training", False, "United States",
+                   "20.1", "16.2", "22.3"),
+            Monkey("Lily", "Marmoset", "Female", "1", "10-15 lbs", "11-22-2022",
+                   "Canada", "Final Stage", True, "Canada",
+                   "12.5", "9.8", "11.1"),
+            # Named "Milo" rather than "Max" so sample data respects the unique-name rule enforced at intake
+            Monkey("Milo", "Howler Monkey", "Male", "4", "25-30 lbs", "06-15-2019",
+                   "United Kingdom", "Completed", False, "United Kingdom",
+                   "22.3", "18.6", "26.4"),
+        ])
+
+    # -------------------------------------------------------------------------
+    # Reporting: Training Status
+    # -------------------------------------------------------------------------
+    @instrumented("registry.status_counts")
+    def status_counts(self, animal_type):
+        """Returns {training status: number of animals} for one type, in stage order.
+
+        Counts come from the per-stage buckets, so this costs O(number of
+        stages). For a type not loaded from the store yet, the store counts
+        instead, without loading any animals.
+        """
+        if animal_type in self._loaded_types:
+            buckets = self._by_status[animal_type]
+            return {training_statuses[code]: len(buckets[code]) for code in sorted(buckets)}
+        counts = self.store.status_counts(animal_type)
+        return {status: counts[status] for status in sorted(counts, key=training_statuses.sort_key) if counts[status]}
+
+    def iter_training_summary_lines(self):
+        """Yields the training status summary: per type, the number of animals at each stage."""
+        return training_summary_lines(self.status_counts)
+
+    @instrumented("menu.print_training_summary")
+    def print_training_summary(self, page_size=None, offset=0, output_path=None):
+        """Prints how many animals of each type are at each training stage."""
+        lines = self.iter_training_summary_lines() if self else iter(())
+        write_report("Training Status Summary", lines, "No animals in the system.",
+                     format_line=str, page_size=page_size, offset=offset, output_path=output_path)
+
+    def iter_training_status_lines(self):
+        """Yields the training status report lines: a header per type, then one line per animal.
+
+        Animals are streamed from the per-stage buckets, grouped by stage.
+        """
+        for animal_type in animal_types:
+            header, plural = type_labels[animal_type]
+            yield f"\n{header}:\n"
+            self._load_type(animal_type)
+            buckets = self._by_status[animal_type]
+            if not buckets:
+                yield f"No {plural} available.\n"
+            for code in sorted(buckets):  # Stage order: the standard stages have the lowest codes
+                bar = progress_bar(training_statuses[code])  # Built once per stage, shared by its animals
+                for animal in buckets[code].values():
+                    yield f"- {animal.name}: {bar}\n"
+
+    @instrumented("menu.print_training_status")
+    def print_training_status(self, page_size=None, offset=0, output_path=None):
+        """Prints the training status of all animals grouped by type with a visual progress bar."""
+        lines = self.iter_training_status_lines() if self else iter(())
+        write_report("Training Status for All Animals", lines, "No animals in the system.",
+                     format_line=str, page_size=page_size, offset=offset, output_path=output_path)
+
+    # -------------------------------------------------------------------------
+    # Reporting: All Animals
+    # -------------------------------------------------------------------------
+    @instrumented("menu.print_all_animals")
+    def print_all_animals(self, page_size=None, offset=0, output_path=None):
+        """Prints all animals in the system with their details."""
+        write_report("All Animals in the System", iter(self.query()), "No animals in the system.",
+                     page_size=page_size, offset=offset, output_path=output_path)
+
+    # -------------------------------------------------------------------------
+    # Reporting: Per-Type Lists (Dogs, Cats, Monkeys)
+    # -------------------------------------------------------------------------
+    @instrumented("menu.print_list_of_type")
+    def print_list_of_type(self, animal_type, page_size=None, offset=0, output_path=None):
+        """Prints a list of all animals of one type."""
+        header, plural = type_labels[animal_type]
+        write_report(f"List of {plural.title()}", iter(self.query().where(animal_type=animal_type)),
+                     f"No {plural} available.", page_size=page_size, offset=offset, output_path=output_path)
+
+    def print_list_of_dogs(self, **report_options):
+        """Prints a list of all dogs."""
+        self.print_list_of_type("Dog", **report_options)
+
+    def print_list_of_cats(self, **report_options):
+        """Prints a list of all cats."""
+        self.print_list_of_type("Cat", **report_options)
+
+    def print_list_of_monkeys(self, **report_options):
+        """Prints a list of all monkeys."""
+        self.print_list_of_type("Monkey", **report_options)
+
+    # -------------------------------------------------------------------------
+    # Reporting: Available Animals
+    # -------------------------------------------------------------------------
+    def available_animals(self, animal_type=None, in_service_country=None):
+        """Returns the animals that have completed training and are not reserved, grouped by type.
+
+        Read straight from the available view, optionally for one type and
+        one in-service country, so cost is proportional to the number of
+        animals returned. For types not loaded from the store yet, the store
+        finds them on its status, reservation, and country columns instead,
+        without loading the type.
+        """
+        types = [animal_type] if animal_type is not None else animal_types
+        country = None
+        if in_service_country is not None:
+            country_code = countries.code_of(in_service_country)
+            if country_code is None:
+                return []  # No animal serves in an unknown country
+            country = countries[country_code]
+        animals = []
+        for name in types:
+            if name in self._loaded_types:
+                with self._lock:
+                    buckets = self._available_buckets([name], in_service_country)
+                    animals.extend(chain.from_iterable(bucket.values() for bucket in buckets))
+            else:
+                matches = self.iter_matching(name, training_statuses[self.completed_code], country, False)
+                # Grouped by country like the view; the sort is stable, so intake order is kept within one
+                animals.extend(matches if country is not None
+                               else sorted(matches, key=lambda animal: animal._in_service_country))
+        return animals
+
+    def _available_buckets(self, types, in_service_country=None):
+        # Available view buckets for some types, and one country if given, in type then country order;
+        # callers hold the lock
+        if in_service_country is not None:
+            country_code = countries.code_of(in_service_country)
+            return [self._available[animal_type].get(country_code, {}) for animal_type in types]
+        return [buckets[code] for buckets in map(self._available.__getitem__, types) for code in sorted(buckets)]
+
+    def iter_available_animals(self):
+        """Yields animals that have completed training and are not reserved, grouped by type."""
+        return iter(self.available_animals())
+
+    def subscribe_availability(self, callback):
+        """Calls callback(animal, available) whenever an animal becomes available for service or stops being.
+
+        available is True when an animal reaches "Completed" unreserved, is
+        taken in already available, or has its reservation cancelled, and
+        False when it is reserved or moved back from "Completed". Callbacks
+        run on the thread that made the change, after it is stored and
+        outside the registry lock, so they may read the registry, but they
+        must not change animals themselves. Calls are made one at a time in
+        the order the changes were made; when threads race to change one
+        animal, a change superseded before it could be delivered is skipped,
+        so each animal's last call always matches available_animals().
+        Returns callback, for unsubscribe_availability().
+        """
+        with self._lock:
+            self._availability_subscribers.append(callback)
+        return callback
+
+    def unsubscribe_availability(self, callback):
+        """Stops calling a callback registered with subscribe_availability()."""
+        with self._lock:
+            self._availability_subscribers.remove(callback)
+
+    @instrumented("menu.print_list_of_available_animals")
+    def print_list_of_available_animals(self, page_size=None, offset=0, output_path=None):
+        """Prints animals that are available for service (i.e., training completed and not reserved)."""
+        write_report("List of Available Animals", self.iter_available_animals(), "No available animals.",
+                     page_size=page_size, offset=offset, output_path=output_path)
+
+    # -------------------------------------------------------------------------
+    # Reporting: Animals Acquired in a Date Range
+    # -------------------------------------------------------------------------
+    @instrumented("menu.print_animals_acquired_between")
+    def print_animals_acquired_between(self):
+        """Prints animals acquired between two dates entered by the user, oldest first."""
+        start = get_valid_date("Enter the start date")
+        end = get_valid_date("Enter the end date")
+        write_report(f"Animals Acquired Between {format_date(start)} and {format_date(end)}",
+                     iter(self.query().acquired_between(start, end)), "No animals acquired in that range.")
+
+    # -------------------------------------------------------------------------
+    # Searching with Filters
+    # -------------------------------------------------------------------------
+    @instrumented("menu.search_animals")
+    def search_animals(self):
+        """Builds a query from the user's filters, prints its plan, then prints the matching animals."""
+        print("Leave any filter blank to skip it.")
+        query = self.query()
+        try:
+            for field, prompt in (("animal_type", "Animal type (Dog/Cat/Monkey)"),
+                                  ("training_status", "Training status"),
+                                  ("in_service_country", "In-service country"),
+                                  ("species", "Monkey species"),
+                                  ("min_age", "Minimum age"),
+                                  ("max_age", "Maximum age")):
+                value = input(f"{prompt}: ").strip()
+                if value:
+                    query = query.where(**{field: value})
+            reserved = parse_yes_no(input("Reserved (yes/no): "))
+            if reserved is not None:
+                query = query.where(reserved=reserved)
+            start, end = input("Acquired from (MM-DD-YYYY): ").strip(), input("Acquired to (MM-DD-YYYY): ").strip()
+            if start or end:
+                start, end = parse_date(start or "01-01-0001"), parse_date(end or "12-31-9999")
+                if start is None or end is None:
+                    raise ValueError("dates must use the MM-DD-YYYY format")
+                query = query.acquired_between(start, end)
+            order = input(f"Sort by ({', '.join(AnimalQuery.sort_keys)}): ").strip()
+            if order:
+                query = query.order_by(order, get_yes_no("Descending?"))
+            limit = input("Maximum number of results: ").strip()
+            if limit:
+                query = query.limit(limit)
+        except ValueError as error:
+            print(f"Invalid filter: {error}")
+            return
+        print(f"\n{query.explain()}")
+        write_report("Search Results", iter(query), "No animals match those filters.")
+
+    # -------------------------------------------------------------------------
+    # Update Training Status Functionality
+    # -------------------------------------------------------------------------
+    @instrumented("menu.update_animal_training_status")
+    def update_animal_training_status(self):
+        """Allows the user to update the training status of an animal by name."""
+        animal_name = input("Enter the name (or the start of it) of the animal to update training status: ").strip()
+        animal = self.find_animal(animal_name)  # Exact names are one lookup; others offer close matches
+        if animal is None:
+            print("Animal not found in the system.")
+            return
+        print(f"Current training status of {animal.name}: {animal.training_status}")
+        new_status = get_valid_input("Select new training status:", training_statuses)
+        animal.update_training_status(new_status)
+        print(f"Training status for {animal.name} updated to {new_status}.")
+
+    # -------------------------------------------------------------------------
+    # Reporting: Roster Statistics
+    # -------------------------------------------------------------------------
+    def iter_roster_statistics_lines(self, by="type"):
+        """Yields the roster statistics report: each numeric field's distribution per group, the weight
+        ranges per group, and animals whose measurements are outliers within their group."""
+        analytics = self.analytics()
+        for field, label in RosterAnalytics.field_labels.items():
+            yield f"\n{label}:\n"
+            stats = analytics.group_stats(field, by)
+            if not stats:
+                yield "No values recorded.\n"
+            for group, row in stats.items():
+                yield (f"- {group}: {row['count']:,} animal(s), mean {row['mean']:.1f}, median {row['p50']:.1f}, "
+                       f"middle half {row['p25']:.1f}-{row['p75']:.1f}, range {row['min']:.1f}-{row['max']:.1f}\n")
+        yield "\nWeight Ranges:\n"
+        for group, counts in analytics.weight_histogram(by).items():
+            yield f"- {group}: " + ", ".join(f"{weight}: {count:,}" for weight, count in counts.items()) + "\n"
+        yield "\nOutliers (more than 1.5 x the interquartile range outside their group's middle half):\n"
+        found = False
+        for field, label in RosterAnalytics.field_labels.items():
+            for animal, value in analytics.outliers(field, by):
+                found = True
+                yield f"- {animal.name} ({animal.animal_type}): {label} {value:g}\n"
+        if not found:
+            yield "None.\n"
+
+    @instrumented("menu.print_roster_statistics")
+    def print_roster_statistics(self, by=None, page_size=None, offset=0, output_path=None):
+        """Prints roster statistics grouped by by (a RosterAnalytics grouping), asking for it if not given."""
+        try:
+            self.analytics()  # Built before the report starts, so a missing NumPy is reported plainly
+        except RuntimeError as error:
+            print(error)
+            return
+        if by is None:
+            labels = RosterAnalytics.grouping_labels
+            label = get_valid_input("Group statistics by:", list(labels.values()))
+            by = next(grouping for grouping, text in labels.items() if text == label)
+        lines = self.iter_roster_statistics_lines(by) if self else iter(())
+        write_report(f"Roster Statistics by {RosterAnalytics.grouping_labels[by]}", lines,
+                     "No animals in the system.", format_line=str, page_size=page_size, offset=offset,
+                     output_path=output_path)
+
+    # -------------------------------------------------------------------------
+    # Batch Training Status Transitions
+    # -------------------------------------------------------------------------
+    @instrumented("registry.update_training_statuses")
+    def update_training_statuses(self, changes, forward_only=True):
+        """Applies many training status changes as one all-or-nothing batch; returns the number of animals changed.
+
+        changes is a dict of name -> status or an iterable of (name, status)
+        pairs. Names are matched case-insensitively and statuses against
+        training_statuses. Every change is checked before anything is
+        applied: unknown names or statuses, a name listed twice, or (with
+        forward_only) a move back to an earlier stage raises ValueError
+        describing the problems, and nothing changes.
+        """
+        if isinstance(changes, dict):
+            changes = changes.items()
+        with self._lock:
+            moves, problems = [], []
+            for name, status in changes:
+                key = self.name_key(str(name))
+                animal = self._by_name.get(key) or self.get(key)  # get() loads animals not in memory yet
+                if animal is None:
+                    problems.append(f"'{name}' was not found")
+                else:
+                    moves.append((key, animal, status))
+            changed, events = self._apply_status_batch(moves, forward_only, problems)
+        return self._finish_status_batch(changed, events)
+
+    @instrumented("registry.move_cohort")
+    def move_cohort(self, query, new_status, forward_only=True):
+        """Moves every animal a query matches to new_status as one all-or-nothing batch; returns the number changed.
+
+        For example, every In-Training dog in Canada to Final Stage:
+        registry.move_cohort(registry.query().where(animal_type="Dog", training_status="In-Training",
+        in_service_country="Canada"), "Final Stage")
+
+        The query's types are loaded first, so a stored roster is moved
+        through the registry's own animals rather than fresh copies
+        streamed from the store.
+        """
+        with self._lock:  # No animal can join or leave the cohort between the query and the change
+            for animal_type in [query.criteria["animal_type"]] if "animal_type" in query.criteria else animal_types:
+                self._load_type(animal_type)
+            moves = []
+            for animal in query:
+                key = self.name_key(animal.name)
+                owned = self._by_name.get(key) or self.get(key)  # The indexed animal, even if the plan read the store
+                moves.append((key, owned, new_status))
+            changed, events = self._apply_status_batch(moves, forward_only, [])
+        return self._finish_status_batch(changed, events)
+
+    def _apply_status_batch(self, moves, forward_only, problems):
+        # Validate (name key, animal, status) moves, then apply them together, rolling every change back if
+        # storing fails; returns (number changed, availability events). Callers hold the lock
+        with self._lock:
+            status_codes = {}  # Status as given -> code (None if unknown), so each spelling is matched once
+            batch = {}  # Name key -> (animal, new status code)
+            for key, animal, status in moves:
+                if status not in status_codes:
+                    status_codes[status] = training_statuses.code_of(str(status))
+                code = status_codes[status]
+                if code is None:
+                    problems.append(f"unknown status '{status}' for {animal.name}")
+                elif key in batch:
+                    problems.append(f"{animal.name} is listed more than once")
+                elif forward_only and code < animal._training_status:
+                    problems.append(f"{animal.name} cannot move back from {animal.training_status} "
+                                    f"to {training_statuses[code]}")
+                batch[key] = (animal, code)
+            if problems:
+                shown = "; ".join(problems[:5]) + (f"; and {len(problems) - 5} more" if len(problems) > 5 else "")
+                raise ValueError(f"No training statuses were changed: {shown}")
+
+            applied = []  # (animal, old status code), in the order applied
+            available_changed = []  # (name key, animal) whose availability changed
+            try:
+                for key, (animal, code) in batch.items():
+                    old_status = animal._training_status
+                    if code == old_status:
+                        continue
+                    animal._training_status = code  # Set directly; the registry reindexes below
+                    applied.append((animal, old_status))
+                    if self._reindex_status(animal, old_status, key):
+                        available_changed.append((key, animal))
+                if self.store is not None and applied:
+                    self.store.set_training_statuses([animal for animal, _ in applied])  # One transaction
+            except BaseException:
+                for animal, old_status in reversed(applied):  # Roll back every in-memory change
+                    new_status = animal._training_status
+                    animal._training_status = old_status
+                    self._reindex_status(animal, new_status)
+                raise
+            return len(applied), [self._availability_event(animal, key) for key, animal in available_changed]
+
+    def _finish_status_batch(self, changed, events):
+        # Flush an applied batch and tell subscribers, once the caller has released the lock
+        if self.store is not None and changed:
+            self.store.sync()  # One disk flush for the whole batch
+        self._notify_availability(events)
+        return changed
+
+    @instrumented("menu.move_cohort")
+    def move_cohort_to_status(self):
+        """Moves every animal matching a type, in-service country, and current status to a new status at once."""
+        print("\n--- Move a Training Cohort ---")
+        print("Leave a filter blank to include every value.")
+        try:
+            query = self.query()
+            for field, prompt in (("animal_type", "Animal type (Dog/Cat/Monkey)"),
+                                  ("in_service_country", "In-service country"),
+                                  ("training_status", "Current training status")):
+                value = input(f"{prompt}: ").strip()
+                if value:
+                    query = query.where(**{field: value})
+        except ValueError as error:
+            print(f"Invalid filter: {error}")
+            return
+        count = query.count()
+        if not count:
+            print("No animals match those filters.")
+            return
+        new_status = get_valid_input(f"Select the new training status for {count} animal(s):", training_statuses)
+        if not get_yes_no(f"Move {count} animal(s) to {new_status}?"):
+            print("No training statuses were changed.")
+            return
+        try:
+            changed = self.move_cohort(query, new_status)
+        except ValueError as error:
+            print(error)
+            return
+        print(f"Moved {changed} animal(s) to {new_status}.")
+
+    # -------------------------------------------------------------------------
+    # Reservation Functionality
+    # -------------------------------------------------------------------------
+    @instrumented("menu.reserve_animal")
+    def reserve_animal(self):
+        """Allows the user to reserve an animal by specifying type and in-service country."""
+        animal_type_input = input("Enter animal type to reserve (Dog/Cat/Monkey): ").strip().title()
+        in_service_country_input = input("Enter in-service country: ").strip().title()
+        if animal_type_input not in self._by_type:
+            print("Invalid animal type.")
+            return
+
+        species_input = None
+        if animal_type_input == "Monkey":
+            species_input = input("Enter the species of monkey to reserve: ").strip().title()
+
+        # Look up unreserved matches directly in the reservation index
+        available_animals = self.reservation_candidates(animal_type_input, in_service_country_input,
+                                                        species_input)
+
+        if not available_animals:
+            print("No available animals found for the given criteria.")
+            return
+
+        print("\nAvailable animals:")
+        for animal in available_animals:
+            print(animal)
+
+        name_input = input("Enter the name of the animal to reserve: ").strip()
+        animal = self.find_animal(name_input, available_animals)  # Misspelled names offer close matches
+        if animal is not None:
+            # Another desk may have reserved it while the list was on screen
+            if self.reservations.reserve(animal.name) is None:
+                print(f"{animal.name} was just reserved by someone else. Reservation not made.")
+            else:
+                print("Reservation confirmed.")
+            return
+
+        print("Invalid animal name. Reservation not made.")
+
+# =============================================================================
+# Queries: Composable Filters with Index-Aware Planning
+# =============================================================================
+def animal_age(animal):
+    # Age in whole years, or None when the entered age is not a number
+    try:
+        return int(animal.age)
+    except ValueError:
+        return None
+
+class QueryPlan:
+    """How a query will run: where candidates come from and what is checked on each one."""
+
+    def __init__(self, access, estimate, candidates, covered=(), ordered_by=None):
+        self.access = access  # Description of the index or scan that supplies candidates
+        self.estimate = estimate  # Number of candidates it supplies, or None if unknown until read
+        self.candidates = candidates  # Callable returning an iterable of candidate animals
+        self.covered = set(covered)  # Criteria every candidate already satisfies
+        self.ordered_by = ordered_by  # Sort field the candidates already arrive in, if any
+        self.filters = []  # (description, predicate) pairs checked on each candidate
+        self.considered = []  # (access, estimate) of every plan the planner compared
+
+class AnimalQuery:
+    """A composable query over a registry's animals.
+
+    Start with registry.query(), narrow it with where() and
+    acquired_between(), and shape the result with order_by() and limit().
+    Each call returns a new query, so a partial query can be reused.
+    Iterating a query runs it.
+
+    The planner sizes every registry index that can answer part of the
+    query (reservation index, training stage buckets, acquisition date
+    index, type buckets) and reads candidates from the one supplying the
+    fewest, then checks the remaining predicates on those candidates only.
+    Every animal is scanned only when no index applies. Listings by type
+    alone, and filters on training status, in-service country, or
+    reservation, stream from the store without loading the types; the
+    store applies those filters itself. explain() describes the chosen
+    plan.
+    """
+
+    # Predicates accepted by where()
+    fields = ("animal_type", "training_status", "reserved", "in_service_country", "species", "min_age", "max_age")
+    # Sort field -> key function for order_by()
+    sort_keys = {
+        "name": lambda animal: animal.name.casefold(),
+        "animal_type": lambda animal: animal_types.index(animal.animal_type),
+        "acquisition_date": lambda animal: animal.acquisition_date,
+        "training_status": lambda animal: animal._training_status,  # Stage order
+        "age": lambda animal: (animal_age(animal) is None, animal_age(animal) or 0),  # Non-numeric ages last
+    }
+
+    def __init__(self, registry, criteria=None, date_range=None, order=None, limit_count=None):
+        self.registry = registry
+        self.criteria = dict(criteria or {})  # Field -> required value
+        self.date_range = date_range  # (start date, end date), inclusive, or None
+        self.order = order  # (sort field, descending) or None for the index's natural order
+        self.limit_count = limit_count  # Most animals returned, or None for all
+
+    def _copy(self, **changes):
+        values = dict(criteria=self.criteria, date_range=self.date_range, order=self.order,
+                      limit_count=self.limit_count)
+        values.update(changes)
+        return AnimalQuery(self.registry, **values)
+
+    def where(self, **criteria):
+        """Returns a query that also requires each given field to match.
+
+        animal_type, training_status, and in_service_country are matched
+        case-insensitively; species is only set on Monkeys; min_age and
+        max_age bound the age in years; reserved is True, False, "yes", or
+        "no". Raises ValueError for an unknown field or animal type, or any
+        other reserved value.
+        """
+        unknown = set(criteria) - set(self.fields)
+        if unknown:
+            raise ValueError(f"unknown query field(s): {', '.join(sorted(unknown))}")
+        merged = dict(self.criteria)
+        for field, value in criteria.items():
+            if field == "animal_type":
+                value = match_choice(str(value), animal_types)
+                if value is None:
+                    raise ValueError(f"unknown animal_type '{criteria['animal_type']}'")
+            elif field == "reserved":
+                if not isinstance(value, bool):
+                    value = parse_yes_no(value) if isinstance(value, str) else None
+                    if value is None:
+                        raise ValueError(f"reserved must be true/false or yes/no, not {criteria['reserved']!r}")
+            elif field in ("min_age", "max_age"):
+                value = int(value)
+            else:
+                value = str(value).strip()
+            merged[field] = value
+        return self._copy(criteria=merged)
+
+    def acquired_between(self, start, end):
+        """Returns a query that also requires an acquisition date between start and end (inclusive)."""
+        return self._copy(date_range=(to_date(start), to_date(end)))
+
+    def order_by(self, field, descending=False):
+        """Returns a query sorted by one of sort_keys."""
+        if field not in self.sort_keys:
+            raise ValueError(f"cannot sort by '{field}' (choose from {', '.join(self.sort_keys)})")
+        return self._copy(order=(field, bool(descending)))
+
+    def limit(self, count):
+        """Returns a query that stops after count animals."""
+        if int(count) < 0:
+            raise ValueError("limit cannot be negative")
+        return self._copy(limit_count=int(count))
+
+    # -------------------------------------------------------------------------
+    # Planning
+    # -------------------------------------------------------------------------
+    def _describe(self):
+        # Human-readable list of the query's predicates
+        parts = [f"{field} = {value!r}" if field not in ("min_age", "max_age")
+                 else f"age {'>=' if field == 'min_age' else '<='} {value}"
+                 for field, value in self.criteria.items()]
+        if self.date_range:
+            parts.append(f"acquired {format_date(self.date_range[0])} to {format_date(self.date_range[1])}")
+        return ", ".join(parts) or "all animals"
+
+    def _filters(self, status_code, country_code):
+        # (field, description, predicate) for every predicate; the plan drops the ones its index covers
+        criteria = self.criteria
+        filters = []
+        if "animal_type" in criteria:
+            animal_type = criteria["animal_type"]
+            filters.append(("animal_type", f"animal_type = {animal_type!r}",
+                            lambda animal: animal.animal_type == animal_type))
+        if "training_status" in criteria:
+            filters.append(("training_status", f"training_status = {criteria['training_status']!r}",
+                            lambda animal: animal._training_status == status_code))
+        if "reserved" in criteria:
+            reserved = criteria["reserved"]
+            filters.append(("reserved", f"reserved = {reserved}", lambda animal: animal._reserved == reserved))
+        if "in_service_country" in criteria:
+            filters.append(("in_service_country", f"in_service_country = {criteria['in_service_country']!r}",
+                            lambda animal: animal._in_service_country == country_code))
+        if "species" in criteria:
+            species = criteria["species"].title()
+            filters.append(("species", f"species = {species!r}",
+                            lambda animal: animal.species is not None and animal.species.strip().title() == species))
+        if "min_age" in criteria:
+            min_age = criteria["min_age"]
+            filters.append(("min_age", f"age >= {min_age}",
+                            lambda animal: (age := animal_age(animal)) is not None and age >= min_age))
+        if "max_age" in criteria:
+            max_age = criteria["max_age"]
+            filters.append(("max_age", f"age <= {max_age}",
+                            lambda animal: (age := animal_age(animal)) is not None and age <= max_age))
+        if self.date_range:
+            start, end = self.date_range
+            filters.append(("date_range", "acquisition_date in range",
+                            lambda animal: start <= animal.acquisition_date <= end))
+        return filters
+
+    def plan(self):
+        """Chooses how to run the query and returns the QueryPlan."""
+        registry = self.registry
+        criteria = self.criteria
+        types = [criteria["animal_type"]] if "animal_type" in criteria else list(animal_types)
+        status_code = training_statuses.code_of(criteria["training_status"]) if "training_status" in criteria else None
+        country_code = countries.code_of(criteria["in_service_country"]) if "in_service_country" in criteria else None
+        # Criteria a store can check on its own columns (SQL, or the snapshot's mapped codes)
+        stored_fields = [field for field in ("training_status", "in_service_country", "reserved") if field in criteria]
+
+        if ("training_status" in criteria and status_code is None) or \
+                ("in_service_country" in criteria and country_code is None):
+            plans = [QueryPlan("no match: unknown status or country", 0, list,
+                               covered=list(criteria) + ["date_range"])]
+        elif not all(animal_type in registry._loaded_types for animal_type in types) and \
+                (stored_fields or not (set(criteria) - {"animal_type"} or self.date_range)):
+            # A plain listing, or filters the store can apply on its columns: stream the matching animals
+            # from the store instead of loading the types
+            values = {"training_status": training_statuses[status_code] if status_code is not None else None,
+                      "in_service_country": countries[country_code] if country_code is not None else None,
+                      "reserved": criteria.get("reserved")}
+            access = f"stream {', '.join(types)} from the store"
+            if stored_fields:
+                access += f", filtered there on {', '.join(stored_fields)}"
+            plans = [QueryPlan(access, None,
+                               lambda: (animal for animal_type in types
+                                        for animal in registry.iter_matching(animal_type, **values)),
+                               covered=["animal_type", *stored_fields])]
+        elif self.date_range and not set(criteria) - {"animal_type"} and \
+                len(registry._loaded_types) < len(animal_types):
+            # A date range on a partly loaded roster: the store's date index answers
+            start, end = self.date_range
+            plans = [QueryPlan("store acquisition date index", None,
+                               lambda: registry.acquired_between(start, end),
+                               covered=["date_range"], ordered_by="acquisition_date")]
+        else:
+            for animal_type in types:
+                registry._load_type(animal_type)
+            plans = self._index_plans(types, status_code, country_code)
+
+        plan = min(plans, key=lambda candidate: candidate.estimate if candidate.estimate is not None else -1)
+        plan.considered = [(candidate.access, candidate.estimate) for candidate in plans]
+        plan.filters = [(description, predicate)
+                        for field, description, predicate in self._filters(status_code, country_code)
+                        if field not in plan.covered]
+        return plan
+
+    def _index_plans(self, types, status_code, country_code):
+        # Every way the in-memory indexes can supply candidates, with exact candidate counts; each
+        # candidates callable binds its own buckets, since later plans reuse the variable. Type buckets are
+        # append-only lists, so plans reading them stream lazily instead of copying them under the lock;
+        # the dict buckets of the other indexes are copied, at a cost proportional to the matches
+        registry = self.registry
+        criteria = self.criteria
+        plans = []
+        with registry._lock:
+            if criteria.get("reserved") is False and status_code == registry.completed_code:
+                # The available view holds exactly the completed, unreserved animals
+                buckets = registry._available_buckets(types, criteria.get("in_service_country"))
+                plans.append(QueryPlan("available view", sum(map(len, buckets)),
+                                       lambda buckets=buckets: list(chain.from_iterable(
+                                           bucket.values() for bucket in buckets)),
+                                       covered=["animal_type", "training_status", "reserved", "in_service_country"]))
+
+            total = sum(len(registry._by_type[animal_type]) for animal_type in types)
+            type_buckets = [registry._by_type[animal_type] for animal_type in types]
+            plans.append(QueryPlan(f"type buckets ({', '.join(types)})", total,
+                                   lambda: chain.from_iterable(type_buckets),
+                                   covered=["animal_type"]))
+
+            reservation_fields = {"in_service_country", "species", "reserved"} & set(criteria)
+            if reservation_fields:
+                if len(types) == 1 and {"in_service_country", "reserved"} <= reservation_fields and \
+                        ("species" in criteria or types[0] != "Monkey"):
+                    # Every part of the key is known: a single bucket, in intake order
+                    bucket = registry._by_reservation_key.get(registry.reservation_key(
+                        types[0], criteria["in_service_country"], criteria.get("species"), criteria["reserved"]))
+                    buckets = [bucket] if bucket else []
+                else:
+                    # Some parts are open: every bucket whose key matches the known parts
+                    species = criteria["species"].title() if "species" in criteria else None
+                    type_order = {animal_type: index for index, animal_type in enumerate(animal_types)}
+                    buckets = sorted(((key, bucket) for key, bucket in registry._by_reservation_key.items()
+                                      if key[0] in types
+                                      and ("in_service_country" not in criteria or key[1] == country_code)
+                                      and ("species" not in criteria or key[2] == species)
+                                      and ("reserved" not in criteria or key[3] == criteria["reserved"])),
+                                     key=lambda item: type_order[item[0][0]])  # Grouped by type, in report order
+                    buckets = [bucket for _, bucket in buckets]
+                plans.append(QueryPlan(f"reservation index ({len(buckets)} buckets)",
+                                       sum(map(len, buckets)),
+                                       lambda buckets=buckets: list(chain.from_iterable(
+                                           bucket.values() for bucket in buckets)),
+                                       covered=["animal_type", *reservation_fields]))
+
+            if "training_status" in criteria:
+                buckets = [registry._by_status[animal_type].get(status_code, {}) for animal_type in types]
+                plans.append(QueryPlan("training stage buckets", sum(map(len, buckets)),
+                                       lambda buckets=buckets: list(chain.from_iterable(
+                                           bucket.values() for bucket in buckets)),
+                                       covered=["animal_type", "training_status"]))
+
+            if self.date_range:
+                start, end = self.date_range
+                low, high = registry._date_bounds(start, end)
+                plans.append(QueryPlan("acquisition date index", high - low,
+                                       lambda: registry.acquired_between(start, end),
+                                       covered=["date_range"], ordered_by="acquisition_date"))
+
+            every_bucket = list(registry._by_type.values())  # Every indexed animal, as append-only lists
+            plans.append(QueryPlan("full scan", len(registry._by_name), lambda: chain.from_iterable(every_bucket)))
+        return plans
+
+    # -------------------------------------------------------------------------
+    # Running
+    # -------------------------------------------------------------------------
+    def __iter__(self):
+        plan = self.plan()
+        with self.registry._lock:
+            rows = plan.candidates()  # Dict buckets are copied under the lock; type buckets and the store stream
+        predicates = [predicate for _, predicate in plan.filters]
+        if predicates:
+            rows = (animal for animal in rows if all(predicate(animal) for predicate in predicates))
+        if self.order is not None:
+            field, descending = self.order
+            if plan.ordered_by != field or descending:
+                key = self.sort_keys[field]
+                if self.limit_count is not None:  # Keep only the top rows instead of sorting everything
+                    rows = (nlargest if descending else nsmallest)(self.limit_count, rows, key=key)
+                else:
+                    rows = sorted(rows, key=key, reverse=descending)
+        if self.limit_count is not None:
+            rows = islice(rows, self.limit_count)
+        return iter(rows)
+
+    def count(self):
+        """Returns the number of matching animals (ignoring order, honoring limit)."""
+        return sum(1 for _ in self)
+
+    def explain(self):
+        """Returns a description of the query plan: access path, filters, sort, and alternatives."""
+        plan = self.plan()
+        estimate = "unknown number of" if plan.estimate is None else f"{plan.estimate:,}"
+        lines = [f"Query: {self._describe()}",
+                 f"Access: {plan.access} -> {estimate} candidates",
+                 f"Filter: {'; '.join(description for description, _ in plan.filters) or 'none'}"]
+        if self.order is None:
+            lines.append(f"Order: {plan.ordered_by or 'index order'}")
+        else:
+            field, descending = self.order
+            presorted = plan.ordered_by == field and not descending
+            how = "already in index order" if presorted else ("top-N heap" if self.limit_count is not None
+                                                              else "sort")
+            lines.append(f"Order: {field} {'descending' if descending else 'ascending'} ({how})")
+        lines.append(f"Limit: {self.limit_count if self.limit_count is not None else 'none'}")
+        if len(plan.considered) > 1:
+            lines.append("Considered: " + "; ".join(f"{access} ({count:,})" for access, count in plan.considered
+                                                     if count is not None))
+        return "\n".join(lines)
+
+# =============================================================================
+# Roster Analytics: Typed NumPy Columns (optional, needs NumPy)
+# =============================================================================
+# Measurements and demographics are entered as free text ("3", "20.1", "20-25 lbs").
+# RosterAnalytics parses them once into one typed NumPy array per field, row i
+# describing the i-th animal added, and the registry keeps the columns in sync
+# as animals are added and change training stage. Statistics then run as a few
+# vectorized passes over the columns instead of re-parsing every object.
+
+# First number in a free-text measurement ("3", "20.1", "4 years"), compiled once
+number_pattern = re.compile(r"[-+]?\d+(?:\.\d*)?|[-+]?\.\d+")
+
+@lru_cache(maxsize=65536)
+def parse_measurement(text):
+    """Returns the first number in a free-text measurement as a float, or NaN if it has none."""
+    match = number_pattern.search(text) if text else None
+    return float(match.group()) if match else float("nan")
+
+def weight_bounds(weight):
+    # (low, high) pounds of a weight range like "20-25 lbs"; a single number is both, no number is NaN
+    numbers = [float(number) for number in number_pattern.findall(weight.replace("-", " "))]
+    if not numbers:
+        return float("nan"), float("nan")
+    return min(numbers), max(numbers)
+
+class RosterAnalytics:
+    """Typed NumPy columns for the whole roster, with vectorized group statistics.
+
+    Each field is parsed once when an animal is added: age and the Monkey
+    measurements become float64 (NaN when missing or not a number), and the
+    type, species, countries, weight range, and training status become
+    integer codes. Weight ranges are summarized by their midpoint in pounds.
+    Columns grow by doubling, so adding animals is amortized O(1) per row.
+
+    Statistics ignore NaN values and use linear-interpolated percentiles
+    (NumPy's default), computed for every group at once from one sort.
+    Registries build one with AnimalRegistry.analytics().
+    """
+
+    # Numeric fields with statistics, and their report labels
+    field_labels = {"age": "Age (years)", "weight": "Weight (lbs, range midpoint)", "tail_length": "Tail Length (in)",
+                    "height": "Height (in)", "body_length": "Body Length (in)"}
+    # Valid values of by=, and their report labels
+    grouping_labels = {"type": "Animal Type", "species": "Species", "country": "Acquisition Country",
+                       "service_country": "In-Service Country", "status": "Training Status"}
+    fields = tuple(field_labels)
+    groupings = tuple(grouping_labels)
+    measurements = ("tail_length", "height", "body_length")  # Monkey-only measurements
+    _code_columns = {"type": "int8", "species": "int32", "country": "int32", "service_country": "int32",
+                     "status": "int8", "weight": "int32"}  # Integer-coded columns and their dtypes
+
+    def __init__(self, animals=()):
+        if np is None:
+            raise RuntimeError("Roster analytics need NumPy, which is not installed (pip install numpy).")
+        self._lock = threading.Lock()  # Guards the columns; statistics see a consistent roster
+        self._size = 0  # Rows in use; the arrays may be longer
+        self._columns = {name: np.empty(0, dtype) for name, dtype in self._code_columns.items()}
+        self._columns.update((name, np.empty(0, np.float64)) for name in ("age", *self.measurements))
+        self._animals = []  # Row -> animal, for reporting outliers
+        self._rows = {}  # Name key -> row, for training status changes
+        self._species = Category("species", [])  # Monkey species codes; Dogs and Cats have species -1
+        self._weight_table = None  # (low, high, midpoint) arrays by weight code, rebuilt when weights grow
+        self.add_many(animals)
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, rows):
+        # Make room for rows more rows, doubling the arrays when they are full
+        needed = self._size + rows
+        capacity = len(self._columns["type"])
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 1024)
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def add_many(self, animals):
+        """Parses a batch of animals into new rows."""
+        animals = list(animals)
+        if not animals:
+            return
+        type_codes = {animal_type: code for code, animal_type in enumerate(animal_types)}
+        species = self._species
+        with self._lock:
+            self._reserve(len(animals))
+            start, stop = self._size, self._size + len(animals)
+            parsed = {
+                "type": [type_codes[animal.animal_type] for animal in animals],
+                "species": [-1 if animal.species is None else species.intern(animal.species.strip().title())
+                            for animal in animals],
+                "country": [animal._acquisition_country for animal in animals],
+                "service_country": [animal._in_service_country for animal in animals],
+                "status": [animal._training_status for animal in animals],
+                "weight": [animal._weight for animal in animals],
+                "age": [parse_measurement(animal.age) for animal in animals],
+            }
+            for name in self.measurements:
+                parsed[name] = [parse_measurement(getattr(animal, name, "")) for animal in animals]
+            for name, values in parsed.items():
+                self._columns[name][start:stop] = values
+            for row, animal in enumerate(animals, start):
+                self._rows[AnimalRegistry.name_key(animal.name)] = row
+            self._animals.extend(animals)
+            self._size = stop
+
+    def set_status(self, name_key, status_code):
+        """Records a training status change for the animal with the given name key."""
+        with self._lock:
+            row = self._rows.get(name_key)
+            if row is not None:
+                self._columns["status"][row] = status_code
+
+    def _weights(self):
+        # (low, high, midpoint) pounds by weight code, as arrays indexed by the weight column
+        if self._weight_table is None or len(self._weight_table[0]) != len(weights):
+            low, high = np.array([weight_bounds(weight) for weight in weights], np.float64).reshape(-1, 2).T
+            self._weight_table = (low, high, (low + high) / 2)
+        return self._weight_table
+
+    def column(self, field):
+        """Returns a copy of one parsed column: a numeric field, or the codes of a grouping."""
+        with self._lock:
+            if field in self.groupings:
+                return self._columns[field][:self._size].copy()
+            return self._values(field).copy()
+
+    def _values(self, field):
+        # Float values of a numeric field (weight ranges as midpoints); callers hold the lock
+        if field == "weight":
+            return self._weights()[2][self._columns["weight"][:self._size]]
+        if field in self.fields:
+            return self._columns[field][:self._size]
+        raise ValueError(f"Unknown field {field!r}; choose from {', '.join(self.fields)}.")
+
+    def _groups(self, by):
+        # (group code per row, label per code) for a grouping; rows outside every group have code -1
+        labels = {"type": animal_types, "species": self._species, "country": countries,
+                  "service_country": countries, "status": training_statuses}
+        if by is None:
+            return np.zeros(self._size, np.int32), ["All"]
+        if by not in labels:
+            raise ValueError(f"Unknown grouping {by!r}; choose from {', '.join(self.groupings)}.")
+        return self._columns[by][:self._size].astype(np.int32), list(labels[by])
+
+    def _sorted_groups(self, field, by):
+        # Valid values sorted by (group, value), plus their groups, the group labels, and each group's
+        # start and count in the sorted values
+        values = self._values(field)
+        groups, labels = self._groups(by)
+        keep = ~np.isnan(values) & (groups >= 0)
+        values, groups = values[keep], groups[keep]
+        order = np.argsort(groups, kind="stable")  # Integer keys: a radix sort
+        values, groups = values[order], groups[order]
+        counts = np.bincount(groups, minlength=len(labels))
+        starts = np.cumsum(counts) - counts
+        for start, count in zip(starts[counts > 0], counts[counts > 0]):
+            values[start:start + count].sort()  # Each group's slice in place; faster than one lexsort
+        return values, groups, labels, starts, counts
+
+    @staticmethod
+    def _percentiles(values, starts, counts, q):
+        # q-th percentile of every group's slice of sorted values at once (NaN for empty groups)
+        if not len(values):
+            return np.full(len(counts), np.nan)
+        position = (np.maximum(counts, 1) - 1) * (q / 100)
+        below = np.floor(position).astype(np.int64)
+        above = np.minimum(below + 1, np.maximum(counts - 1, 0))
+        low = values[np.minimum(starts + below, len(values) - 1)]
+        high = values[np.minimum(starts + above, len(values) - 1)]
+        return np.where(counts > 0, low + (high - low) * (position - below), np.nan)
+
+    def group_stats(self, field, by="type", percentiles=(25, 50, 75)):
+        """Returns {group: {"count", "mean", "min", "max", "p<q>" for each q}} for a numeric field.
+
+        Groups with no valid values are left out. by is one of groupings,
+        or None for the whole roster.
+        """
+        if not all(0 <= q <= 100 for q in percentiles):
+            raise ValueError("Percentiles must be between 0 and 100.")
+        with self._lock:
+            values, groups, labels, starts, counts = self._sorted_groups(field, by)
+            sums = np.bincount(groups, weights=values, minlength=len(labels))
+            columns = {"min": self._percentiles(values, starts, counts, 0),
+                       "max": self._percentiles(values, starts, counts, 100)}
+            for q in percentiles:
+                columns[f"p{q:g}"] = self._percentiles(values, starts, counts, q)
+        stats = {}
+        for code in np.flatnonzero(counts):
+            stats[labels[code]] = {"count": int(counts[code]), "mean": float(sums[code] / counts[code]),
+                                   **{name: float(column[code]) for name, column in columns.items()}}
+        return stats
+
+    def outliers(self, field, by="type", k=1.5):
+        """Returns [(animal, value)] whose field lies more than k interquartile ranges outside its group's
+        middle half (Tukey's fences), in intake order."""
+        with self._lock:
+            values, groups, labels, starts, counts = self._sorted_groups(field, by)
+            q1 = self._percentiles(values, starts, counts, 25)
+            q3 = self._percentiles(values, starts, counts, 75)
+            spread = k * (q3 - q1)
+            values = self._values(field)
+            row_groups, _ = self._groups(by)
+            valid = ~np.isnan(values) & (row_groups >= 0)
+            safe_groups = np.where(valid, row_groups, 0)
+            with np.errstate(invalid="ignore"):  # NaN rows are excluded by valid
+                outside = valid & ((values < (q1 - spread)[safe_groups]) | (values > (q3 + spread)[safe_groups]))
+            rows = np.flatnonzero(outside)
+            return [(self._animals[row], float(values[row])) for row in rows]
+
+    def weight_histogram(self, by="type"):
+        """Returns {group: {weight range: count}}, ranges ordered by weight, counted in one pass.
+
+        Every (group, weight range) pair is counted by a single bincount over
+        combined codes; ranges no animal in a group has are left out.
+        """
+        with self._lock:
+            groups, labels = self._groups(by)
+            codes = self._columns["weight"][:self._size].astype(np.int64)
+            keep = groups >= 0
+            ranges = len(weights)
+            counts = np.bincount(groups[keep] * ranges + codes[keep],
+                                 minlength=len(labels) * ranges).reshape(len(labels), ranges)
+            low, high, _ = self._weights()
+            order = np.lexsort((high, low))  # Ranges by low bound, then high bound
+        histogram = {}
+        for code in np.flatnonzero(counts.sum(axis=1)):
+            row = counts[code]
+            histogram[labels[code]] = {weights[weight]: int(row[weight]) for weight in order if row[weight]}
+        return histogram
+
+# =============================================================================
+# Concurrent Reservations
+# =============================================================================
+class ReservationEngine:
+    """Reserves animals safely when many threads (intake desks) share one registry.
+
+    Each check-and-reserve runs under one of a fixed set of striped locks,
+    chosen by the animal's name, so two desks can never both reserve the same
+    animal while desks reserving different animals rarely wait on each other.
+    """
+
+    def __init__(self, registry, stripes=64):
+        self.registry = registry
+        self._locks = [threading.Lock() for _ in range(stripes)]  # Lock stripes shared by name hash
+
+    def _lock_for(self, name_key):
+        return self._locks[hash(name_key) % len(self._locks)]
+
+    @instrumented("reservations.reserve")
+    def reserve(self, name):
+        """Reserves the named animal if it is not reserved yet.
+
+        Returns the animal if this call reserved it, or None if there is no
+        such animal or it was already reserved.
+        """
+        key = self.registry.name_key(name)
+        with self._lock_for(key):
+            animal = self.registry.get(key)
+            if animal is None or animal.reserved:
+                return None
+            animal.reserved = True  # Updates the registry's indexes and store
+            return animal
+
+    def release(self, name):
+        """Cancels the named animal's reservation. Returns the animal, or None if it was not reserved."""
+        key = self.registry.name_key(name)
+        with self._lock_for(key):
+            animal = self.registry.get(key)
+            if animal is None or not animal.reserved:
+                return None
+            animal.reserved = False
+            return animal
+
+# =============================================================================
+# Bulk Import: Streaming CSV/JSONL Intake
+# =============================================================================
+def record_text(record, field):
+    """Returns a record field as stripped text, or "" if it is missing.
+
+    build_animal() and validate_chunk() both read fields through this, so
+    a date parsed for a chunk is found again under the same key whatever
+    type the value had in the file (0, false, and [] included).
+    """
+    value = record.get(field)
+    return "" if value is None else str(value).strip()
+
+def build_animal(record, allow_new_values=False, parsed_dates=None):
+    """Validates one intake record (a dict of field values) and returns the animal it describes.
+
+    Applies the same rules as the interactive intake prompts and raises
+    ValueError with the reason when a field is missing or invalid. Values
+    outside the predefined lists are rejected unless allow_new_values is True,
+    in which case they are added the way the "Other" menu option adds them.
+    Duplicate names are checked by the registry, not here. parsed_dates is an
+    optional result of parse_dates() covering this record's acquisition date.
+    """
+    def text(field):
+        # Required free-text field
+        value = record_text(record, field)
+        if value == "":
+            raise ValueError(f"missing {field}")
+        return value
+
+    def choice(field, choices):
+        # Field that must match one of the predefined choices
+        value = text(field)
+        option = match_choice(value, choices)
+        if option is None:
+            if not allow_new_values:
+                raise ValueError(f"unknown {field} '{value}'")
+            if isinstance(choices, Category):
+                return choices.add(value)  # Save new entry for future selections
+            option = value.title()
+        return option
+
+    animal_type = match_choice(text("animal_type"), animal_types)
+    if animal_type is None:
+        raise ValueError(f"unknown animal_type '{record['animal_type']}'")
+    name = text("name")
+    # Accept a combined breed_species column or the breed/species column matching the type
+    breed_species = record.get("breed_species") or record.get("species" if animal_type == "Monkey" else "breed")
+    if breed_species is None or str(breed_species).strip() == "":
+        raise ValueError(f"missing {'species' if animal_type == 'Monkey' else 'breed'}")
+    breed_species = str(breed_species).strip()
+    gender = choice("gender", list(genders))  # New genders are allowed but not saved, as in intake
+    age = text("age")
+    weight = choice("weight", weights)
+    date_text = text("acquisition_date")
+    acquisition_date = parsed_dates[date_text] if parsed_dates is not None else parse_date(date_text)
+    if acquisition_date is None:
+        raise ValueError(f"invalid acquisition_date '{record['acquisition_date']}' (expected MM-DD-YYYY)")
+    acquisition_country = choice("acquisition_country", countries)
+    training_status = choice("training_status", training_statuses)
+    reserved = record.get("reserved")
+    if not isinstance(reserved, bool):  # JSON Lines may carry real booleans
+        reserved = parse_yes_no(str(reserved)) if reserved is not None else None
+        if reserved is None:
+            raise ValueError(f"invalid reserved '{record.get('reserved')}' (expected yes/no)")
+    in_service_country = choice("in_service_country", countries)
+
+    if animal_type == "Monkey":
+        return Monkey(name, breed_species, gender, age, weight, acquisition_date, acquisition_country,
+                      training_status, reserved, in_service_country,
+                      text("tail_length"), text("height"), text("body_length"))
+    return animal_classes[animal_type](name, breed_species, gender, age, weight, acquisition_date,
+                                       acquisition_country, training_status, reserved, in_service_country)
+
+def animal_to_record(animal):
+    """Returns an animal as a dict of plain values, using the same fields build_animal accepts."""
+    record = {
+        "name": animal.name,
+        "animal_type": animal.animal_type,
+        "gender": animal.gender,
+        "age": animal.age,
+        "weight": animal.weight,
+        "acquisition_date": format_date(animal.acquisition_date),
+        "acquisition_country": animal.acquisition_country,
+        "training_status": animal.training_status,
+        "reserved": animal.reserved,
+        "in_service_country": animal.in_service_country,
+    }
+    if animal.animal_type == "Monkey":
+        record.update(species=animal.species, tail_length=animal.tail_length,
+                      height=animal.height, body_length=animal.body_length)
+    else:
+        record["breed"] = animal.breed
+    return record
+
+def read_records(path):
+    """Yields (line number, record, error) for each row of a CSV or JSONL file, one row at a time.
+
+    Files ending in .csv are read with a header row; anything else is read as
+    JSON Lines. error is None unless the row itself could not be parsed.
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        if path.lower().endswith(".csv"):
+            reader = csv.DictReader(handle)
+            for record in reader:
+                yield reader.line_num, record, None
+        else:
+            for line_number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue  # Skip blank lines
+                try:
+                    record = json.loads(line)
+                except ValueError as error:
+                    yield line_number, line.rstrip("\n"), f"malformed JSON: {error}"
+                    continue
+                if isinstance(record, dict):
+                    yield line_number, record, None
+                else:
+                    yield line_number, record, "expected a JSON object"
+
+def validate_chunk(rows, allow_new_values, reject):
+    """Turns a chunk of (line number, record, error) rows into (line number, record, animal) triples.
+
+    Acquisition dates for the whole chunk are validated together first. Rows
+    that fail validation are passed to reject(line number, record, reason).
+    """
+    parsed_dates = parse_dates(record_text(record, "acquisition_date") for _, record, error in rows if error is None)
+    valid = []
+    for line_number, record, error in rows:
+        if error is None:
+            try:
+                valid.append((line_number, record, build_animal(record, allow_new_values, parsed_dates)))
+                continue
+            except ValueError as exc:
+                error = str(exc)
+        reject(line_number, record, error)
+    return valid
+
+def chunked(items, size):
+    """Groups an iterable into lists of at most size items."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class ImportReport:
+    """Counts and timing for one bulk import run."""
+
+    def __init__(self, quarantine_path):
+        self.imported = 0  # Animals added to the registry
+        self.rejected = 0  # Rows written to the quarantine file
+        self.elapsed = 0.0  # Wall time in seconds
+        self.quarantine_path = quarantine_path  # Where rejected rows and their reasons are written
+
+    @property
+    def rows_per_second(self):
+        # Throughput over every row read, accepted or rejected
+        return (self.imported + self.rejected) / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        summary = (f"Imported {self.imported} animals and rejected {self.rejected} rows "
+                   f"in {self.elapsed:.2f}s ({self.rows_per_second:,.0f} rows/sec).")
+        if self.rejected:
+            summary += f"\nRejected rows and reasons were written to {self.quarantine_path}"
+        return summary
+
+@instrumented("bulk_import")
+def bulk_import(registry, path, chunk_size=5000, quarantine_path=None, allow_new_values=False):
+    """Streams animals from a CSV or JSONL file into the registry in chunks.
+
+    Rows are read through a generator, then validated and inserted a chunk at
+    a time, so only one chunk is held in memory. Invalid and duplicate rows are written
+    with their reasons to a JSONL quarantine file (by default next to the
+    input file) and the import carries on. Returns an ImportReport.
+    """
+    report = ImportReport(quarantine_path or path + ".rejected.jsonl")
+    quarantine = None
+
+    def reject(line_number, record, reason):
+        # Quarantine file is only created if something is rejected
+        nonlocal quarantine
+        if quarantine is None:
+            quarantine = open(report.quarantine_path, "w", encoding="utf-8")
+        quarantine.write(json.dumps({"line": line_number, "reason": reason, "record": record}) + "\n")
+        report.rejected += 1
+
+    start = time.perf_counter()
+    try:
+        for chunk in chunked(read_records(path), chunk_size):
+            accepted, chunk_names = [], set()
+            for line_number, record, animal in validate_chunk(chunk, allow_new_values, reject):
+                key = registry.name_key(animal.name)
+                if key in chunk_names or animal.name in registry:
+                    reject(line_number, record, f"duplicate name '{animal.name}'")
+                else:
+                    chunk_names.add(key)
+                    accepted.append(animal)
+            registry.add_many(accepted)  # One transaction per chunk when a store is attached
+            report.imported += len(accepted)
+    finally:
+        if quarantine is not None:
+            quarantine.close()
+        report.elapsed = time.perf_counter() - start
+    return report
+
+# =============================================================================
+# Sharded Roster: Parallel Reports and Bulk Updates Across Processes
+# =============================================================================
+# Each shard is a worker process holding its own in-memory AnimalRegistry for
+# part of the roster. Animals cross process boundaries as animal_row() tuples
+# and results come back as plain text and numbers, because the integer codes
+# behind countries, weights, and statuses are assigned separately in each
+# process.
+
+shard_registry = None  # Registry owned by this process when it runs as a shard worker
+# Record field -> case-folded values the coordinator accepted when the shards started; validation checks
+# against these rather than the live categories, which also hold any value restored from a stored row
+shard_allowed = {}
+
+def shard_start(vocabulary):
+    """Shard worker initializer: learns the coordinator's values and creates the shard's registry."""
+    global shard_registry, shard_allowed
+    allowed_countries, allowed_weights, allowed_statuses = ({value.casefold() for value in values}
+                                                            for values in vocabulary)
+    shard_allowed = {"weight": allowed_weights, "acquisition_country": allowed_countries,
+                     "training_status": allowed_statuses, "in_service_country": allowed_countries}
+    for category, values in zip((countries, weights, training_statuses), vocabulary):
+        for value in values:
+            category.restore(value)  # Values added through "Other" keep the coordinator's spelling
+    shard_registry = AnimalRegistry()
+
+def shard_add(rows):
+    # Names were checked for uniqueness across every shard by the coordinator
+    shard_registry.add_many([animal_from_row(row) for row in rows])
+
+def shard_update_training_status(names, status):
+    # One batch per shard; returns how many of the named animals actually changed stage
+    return shard_registry.update_training_statuses({name: status for name in dict.fromkeys(names)},
+                                                   forward_only=False)
+
+def shard_status_counts():
+    return {animal_type: shard_registry.status_counts(animal_type) for animal_type in animal_types}
+
+def shard_scan(criteria, date_range, order, limit_count):
+    # The shard's matches in query order, as rows
+    query = AnimalQuery(shard_registry, criteria, date_range, order, limit_count)
+    return [animal_row(animal) for animal in query]
+
+def shard_validate():
+    # (name, reason) for every animal whose fields would be rejected at intake
+    problems = []
+    for animal in shard_registry:
+        record = animal_to_record(animal)
+        try:
+            for field, allowed in shard_allowed.items():
+                if record[field].casefold() not in allowed:
+                    raise ValueError(f"unknown {field} '{record[field]}'")
+            build_animal(record)
+        except ValueError as error:
+            problems.append((animal.name, str(error)))
+    return problems
+
+class ShardedRoster:
+    """A roster partitioned across worker processes for full-roster reports and bulk updates.
+
+    Animals are assigned to shards by a hash of their name, or by their
+    in-service country with by="country", and each shard is owned by its own
+    single-worker ProcessPoolExecutor, so a shard's animals stay in one
+    process between calls. Scans, the training status summary, validations,
+    and bulk training status updates run on every shard at once and the
+    results are merged here. The coordinator keeps the name of every animal
+    and the shard that owns it, so names stay unique across shards on intake
+    and updates go straight to the owning shard.
+
+    Close the roster (or use it in a with block) to stop the workers.
+    """
+
+    shard_keys = ("name", "country")  # Supported ways of assigning animals to shards
+
+    def __init__(self, shards=None, by="name"):
+        if by not in self.shard_keys:
+            raise ValueError(f"cannot shard by '{by}' (choose from {', '.join(self.shard_keys)})")
+        shards = shards or os.cpu_count() or 1
+        if shards < 1:
+            raise ValueError("a sharded roster needs at least one shard")
+        self.by = by
+        self._owner = {}  # Case-folded name -> index of the shard holding the animal
+        vocabulary = (list(countries), list(weights), list(training_statuses))
+        self._executors = [ProcessPoolExecutor(max_workers=1, initializer=shard_start, initargs=(vocabulary,))
+                           for _ in range(shards)]
+
+    @classmethod
+    def from_registry(cls, registry, shards=None, by="name", batch_size=10_000):
+        """Returns a sharded copy of every animal in a registry, sent to the shards in batches."""
+        roster = cls(shards, by)
+        try:
+            for batch in chunked(registry, batch_size):
+                roster.add_many(batch)
+        except BaseException:
+            roster.close()
+            raise
+        return roster
+
+    def close(self):
+        """Stops every shard worker."""
+        for executor in self._executors:
+            executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self._owner)
+
+    def __contains__(self, name):
+        return AnimalRegistry.name_key(name) in self._owner
+
+    def _shard_of(self, animal):
+        # Shard index for a new animal; hash() is only used within this process
+        if self.by == "country":
+            return animal._in_service_country % len(self._executors)
+        return hash(AnimalRegistry.name_key(animal.name)) % len(self._executors)
+
+    def _run(self, func, shard_args):
+        # Calls func on each listed shard at once; shard_args is {shard index: args}
+        futures = {shard: self._executors[shard].submit(func, *args) for shard, args in shard_args.items()}
+        return {shard: future.result() for shard, future in futures.items()}
+
+    def _run_all(self, func, *args):
+        # Calls func with the same arguments on every shard, returning results in shard order
+        results = self._run(func, {shard: args for shard in range(len(self._executors))})
+        return [results[shard] for shard in range(len(self._executors))]
+
+    # -------------------------------------------------------------------------
+    # Intake and Bulk Updates
+    # -------------------------------------------------------------------------
+    def add(self, animal):
+        """Adds an animal, rejecting a name already used on any shard (case-insensitive)."""
+        self.add_many([animal])
+
+    @instrumented("shards.add_many")
+    def add_many(self, animals):
+        """Adds a batch of animals, rejecting duplicate names across every shard (case-insensitive).
+
+        The whole batch is checked before anything is sent to a shard.
+        """
+        keys = {}
+        for animal in animals:
+            key = AnimalRegistry.name_key(animal.name)
+            if key in keys or key in self._owner:
+                raise ValueError(f"An animal named '{animal.name}' is already in the system.")
+            keys[key] = animal
+        rows_by_shard = {}
+        for key, animal in keys.items():
+            shard = self._shard_of(animal)
+            rows_by_shard.setdefault(shard, []).append(animal_row(animal))
+            self._owner[key] = shard
+        self._run(shard_add, {shard: (rows,) for shard, rows in rows_by_shard.items()})
+
+    @instrumented("shards.update_training_status")
+    def update_training_status(self, names, status):
+        """Moves every named animal to a training status, in parallel; returns how many changed.
+
+        Raises ValueError, before anything changes, for an unknown status or
+        a name that is not on the roster.
+        """
+        new_status = match_choice(str(status), training_statuses)
+        if new_status is None:
+            raise ValueError(f"unknown status '{status}'")
+        names_by_shard = {}
+        for name in names:
+            shard = self._owner.get(AnimalRegistry.name_key(name))
+            if shard is None:
+                raise ValueError(f"'{name}' was not found")
+            names_by_shard.setdefault(shard, []).append(name)
+        changed = self._run(shard_update_training_status,
+                            {shard: (shard_names, new_status) for shard, shard_names in names_by_shard.items()})
+        return sum(changed.values())
+
+    # -------------------------------------------------------------------------
+    # Parallel Scans, Aggregates, and Validations
+    # -------------------------------------------------------------------------
+    @instrumented("shards.status_counts")
+    def status_counts(self):
+        """Returns {animal type: {training status: number of animals}} summed over every shard, in stage order."""
+        totals = {animal_type: {} for animal_type in animal_types}
+        for shard_counts in self._run_all(shard_status_counts):
+            for animal_type, counts in shard_counts.items():
+                for status, count in counts.items():
+                    totals[animal_type][status] = totals[animal_type].get(status, 0) + count
+        return {animal_type: {status: counts[status] for status in sorted(counts, key=training_statuses.sort_key)}
+                for animal_type, counts in totals.items()}
+
+    def print_training_summary(self, page_size=None, offset=0, output_path=None):
+        """Prints how many animals of each type are at each training stage, counted on every shard at once."""
+        lines = training_summary_lines(self.status_counts().get) if self else iter(())
+        write_report("Training Status Summary", lines, "No animals in the system.",
+                     format_line=str, page_size=page_size, offset=offset, output_path=output_path)
+
+    @instrumented("shards.scan")
+    def scan(self, order_by=None, descending=False, limit=None, acquired_between=None, **criteria):
+        """Returns the animals matching the AnimalQuery criteria, searched on every shard at once.
+
+        criteria are the fields accepted by AnimalQuery.where(), and
+        acquired_between is an optional (start, end) pair. With order_by, each
+        shard sorts (and limits) its own matches and the sorted shard results
+        are merged; otherwise animals come back shard by shard.
+        """
+        query = AnimalQuery(None).where(**criteria)
+        if acquired_between is not None:
+            query = query.acquired_between(*acquired_between)
+        if order_by is not None:
+            query = query.order_by(order_by, descending)
+        if limit is not None:
+            query = query.limit(limit)
+        results = [map(animal_from_row, rows) for rows in self._run_all(
+            shard_scan, query.criteria, query.date_range, query.order, query.limit_count)]
+        if order_by is None:
+            animals = chain.from_iterable(results)
+        else:
+            animals = merge(*results, key=AnimalQuery.sort_keys[order_by], reverse=descending)
+        return list(islice(animals, limit))
+
+    @instrumented("shards.validate")
+    def validate(self):
+        """Checks every animal against the intake rules on every shard at once.
+
+        Returns (name, reason) pairs for the animals that would be rejected,
+        sorted by name.
+        """
+        problems = chain.from_iterable(self._run_all(shard_validate))
+        return sorted(problems, key=lambda problem: problem[0].casefold())
+
+    def print_validation_report(self, page_size=None, offset=0, output_path=None):
+        """Prints every animal that fails validation with the reason."""
+        write_report("Roster Validation", self.validate(), "Every animal passed validation.",
+                     format_line=lambda problem: f"- {problem[0]}: {problem[1]}\n",
+                     page_size=page_size, offset=offset, output_path=output_path)
+
+# =============================================================================
+# Network Service: asyncio JSON Lines Server
+# =============================================================================
+# Protocol: each request is one JSON object per line, e.g.
+#   {"id": 1, "op": "reserve", "name": "Max"}
+# and each response is one JSON object per line:
+#   {"id": 1, "ok": true, "result": {...}}  or  {"id": 1, "ok": false, "error": "..."}
+# Requests on one connection are answered in order. All connections share
+# one registry and run on a single event loop, so there is no thread per client.
+# With a store attached, requests that write run on a worker thread pool
+# instead, so one client's disk write or fsync never stalls the others, and
+# concurrent writes can share one event log sync.
+
+service_page_limit = 1000  # Most records a single list request can return
+
+def service_page(animals, request):
+    # One page of animal records, using the request's offset and limit
+    offset = max(int(request.get("offset", 0)), 0)
+    limit = min(max(int(request.get("limit", 100)), 0), service_page_limit)
+    return [animal_to_record(animal) for animal in islice(animals, offset, offset + limit)]
+
+def service_animal_type(request, required=False):
+    # Validated animal type from the request, or None when it is optional and missing
+    value = request.get("animal_type")
+    if value is None and not required:
+        return None
+    animal_type = match_choice(str(value or ""), animal_types)
+    if animal_type is None:
+        raise ValueError(f"unknown animal_type '{value}'")
+    return animal_type
+
+def service_intake(registry, request):
+    """Adds a new animal described by request["animal"] (same fields as a bulk import record)."""
+    record = request.get("animal")
+    if not isinstance(record, dict):
+        raise ValueError("animal must be an object with the animal's fields")
+    animal = build_animal(record)
+    registry.add(animal)  # Raises ValueError for duplicate names
+    return animal_to_record(animal)
+
+def service_list(registry, request):
+    """Lists animals, optionally of one type ("animal_type"), with "offset" and "limit"."""
+    animal_type = service_animal_type(request)
+    return service_page(registry.iter_type(animal_type) if animal_type else iter(registry), request)
+
+def service_available(registry, request):
+    """Lists animals that completed training and are not reserved, with "offset" and "limit".
+
+    "animal_type" and "in_service_country" optionally narrow the list.
+    """
+    country = request.get("in_service_country")
+    return service_page(registry.available_animals(service_animal_type(request),
+                                                   str(country) if country is not None else None), request)
+
+def service_search(registry, request):
+    """Lists unreserved animals matching "animal_type", "in_service_country", and (Monkeys) "species"."""
+    animal_type = service_animal_type(request, required=True)
+    species = request.get("species") if animal_type == "Monkey" else None
+    if animal_type == "Monkey" and not species:
+        raise ValueError("missing species")
+    candidates = registry.reservation_candidates(animal_type, str(request.get("in_service_country", "")), species)
+    return service_page(candidates, request)
+
+def service_reserve(registry, request):
+    """Reserves the animal called request["name"]."""
+    name = str(request.get("name", ""))
+    animal = registry.reservations.reserve(name)
+    if animal is None:
+        raise ValueError(f"'{name}' was not found or is already reserved")
+    return animal_to_record(animal)
+
+def service_update_training_status(registry, request):
+    """Sets the training status of the animal called request["name"] to request["status"]."""
+    name = str(request.get("name", ""))
+    animal = registry.get(name)
+    if animal is None:
+        suggestions = registry.search_names(name, 5) if name.strip() else []
+        hint = f" (did you mean: {', '.join(suggestions)}?)" if suggestions else ""
+        raise ValueError(f"'{name}' was not found{hint}")
+    status = match_choice(str(request.get("status", "")), training_statuses)
+    if status is None:
+        raise ValueError(f"unknown status '{request.get('status')}'")
+    animal.update_training_status(status)
+    return animal_to_record(animal)
+
+def service_suggest(registry, request):
+    """Returns up to "limit" names ranked for request["text"]: an exact match, prefix matches, then near spellings."""
+    limit = min(max(int(request.get("limit", 10)), 0), service_page_limit)
+    return registry.search_names(str(request.get("text", "")), limit)
+
+def service_update_training_statuses(registry, request):
+    """Applies many status changes as one all-or-nothing batch and returns {"changed": count}.
+
+    Either "changes" ({name: status} or [[name, status], ...]) or "where"
+    (AnimalQuery fields) with "status". Moves back to an earlier stage are
+    rejected unless "allow_backward" is true.
+    """
+    forward_only = not request.get("allow_backward", False)
+    if "changes" in request:
+        changes = request["changes"]
+        if not isinstance(changes, (dict, list)):
+            raise ValueError("changes must be an object or a list of [name, status] pairs")
+        return {"changed": registry.update_training_statuses(changes, forward_only)}
+    where = request.get("where")
+    if not isinstance(where, dict) or "status" not in request:
+        raise ValueError("expected \"changes\", or \"where\" with \"status\"")
+    return {"changed": registry.move_cohort(registry.query().where(**where), str(request["status"]), forward_only)}
+
+def service_analytics(registry):
+    # The registry's RosterAnalytics, reporting a missing NumPy to the client like any other bad request
+    try:
+        return registry.analytics()
+    except RuntimeError as error:
+        raise ValueError(str(error)) from None
+
+def service_stats(registry, request):
+    """Returns per-group statistics of request["field"] (age, weight, tail_length, height, or body_length).
+
+    "by" picks the grouping (default "type"; null for the whole roster) and
+    "percentiles" the percentiles reported (default [25, 50, 75]).
+    """
+    percentiles = request.get("percentiles", [25, 50, 75])
+    if not isinstance(percentiles, list):
+        raise ValueError("percentiles must be a list of numbers")
+    return service_analytics(registry).group_stats(str(request.get("field", "")), request.get("by", "type"),
+                                                   [float(q) for q in percentiles])
+
+def service_outliers(registry, request):
+    """Lists animals whose request["field"] is an outlier within their "by" group, with "offset" and "limit".
+
+    "k" sets how many interquartile ranges outside the middle half count as an outlier (default 1.5).
+    """
+    outliers = service_analytics(registry).outliers(str(request.get("field", "")), request.get("by", "type"),
+                                                    float(request.get("k", 1.5)))
+    offset = max(int(request.get("offset", 0)), 0)
+    limit = min(max(int(request.get("limit", 100)), 0), service_page_limit)
+    return [{"name": animal.name, "animal_type": animal.animal_type, "value": value}
+            for animal, value in outliers[offset:offset + limit]]
+
+def service_weight_histogram(registry, request):
+    """Returns {group: {weight range: count}} grouped by "by" (default "type")."""
+    return service_analytics(registry).weight_histogram(request.get("by", "type"))
+
+# Request keys service_query accepts besides the query fields
+service_query_options = {"id", "op", "acquired_from", "acquired_to", "order_by", "descending", "offset", "limit",
+                         "explain"}
+
+def service_query(registry, request):
+    """Runs a query from the request's AnimalQuery.fields, "acquired_from"/"acquired_to", and "order_by".
+
+    Pages with "offset" and "limit" like list; with "explain": true, returns the query plan instead.
+    """
+    unknown = set(request) - set(AnimalQuery.fields) - service_query_options
+    if unknown:
+        raise ValueError(f"unknown query field(s): {', '.join(sorted(unknown))}")
+    query = registry.query().where(**{field: request[field] for field in AnimalQuery.fields if field in request})
+    if "acquired_from" in request or "acquired_to" in request:
+        start = parse_date(str(request.get("acquired_from", "01-01-0001")))
+        end = parse_date(str(request.get("acquired_to", "12-31-9999")))
+        if start is None or end is None:
+            raise ValueError("acquired_from and acquired_to must use the MM-DD-YYYY format")
+        query = query.acquired_between(start, end)
+    if request.get("order_by"):
+        query = query.order_by(str(request["order_by"]), request.get("descending", False))
+    if request.get("explain"):
+        return query.explain()
+    return service_page(query, request)
+
+# Operation name -> handler(registry, request); each handler raises ValueError for bad requests
+service_operations = {
+    "intake": service_intake,
+    "list": service_list,
+    "available": service_available,
+    "search": service_search,
+    "reserve": service_reserve,
+    "update_training_status": service_update_training_status,
+    "query": service_query,
+    "suggest": service_suggest,
+    "update_training_statuses": service_update_training_statuses,
+    "stats": service_stats,
+    "outliers": service_outliers,
+    "weight_histogram": service_weight_histogram,
+}
+
+# Operations that write to the store, run off the event loop when a store is attached
+service_write_operations = {"intake", "reserve", "update_training_status", "update_training_statuses"}
+
+def service_writes(line):
+    # True if a request line names a writing operation; malformed lines are answered on the loop
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return False
+    return isinstance(request, dict) and request.get("op") in service_write_operations
+
+@instrumented("service.handle_request")
+def handle_request(registry, line):
+    """Runs one request line and returns the encoded response line."""
+    response = {}
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+        if "id" in request:
+            response["id"] = request["id"]  # Echoed so clients can match pipelined responses
+        handler = service_operations.get(request.get("op"))
+        if handler is None:
+            raise ValueError(f"unknown op '{request.get('op')}'")
+        result = handler(registry, request)
+        response.update(ok=True, result=result)
+    except (ValueError, TypeError) as error:
+        response.update(ok=False, error=str(error))
+    except Exception as error:  # A bug must not end the connection without an answer
+        response.update(ok=False, error=f"internal error ({type(error).__name__}: {error})")
+    return (json.dumps(response) + "\n").encode("utf-8")
+
+async def handle_client(registry, reader, writer):
+    """Serves one connection until the client disconnects."""
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:  # Line longer than the stream limit
+                writer.write(b'{"ok": false, "error": "request too long"}\n')
+                break
+            if not line:
+                break  # Client closed the connection
+            if registry.store is not None and service_writes(line):  # Blocks on the store: keep the loop free
+                response = await asyncio.get_running_loop().run_in_executor(None, handle_request, registry, line)
+            else:
+                response = handle_request(registry, line)
+            writer.write(response)
+            await writer.drain()  # Wait if the client is slow to read
+    except ConnectionError:
+        pass  # Client went away mid-request
+    finally:
+        writer.close()
+
+async def start_service(registry, host="127.0.0.1", port=8765):
+    """Starts the service and returns the asyncio server (port 0 picks a free port)."""
+    return await asyncio.start_server(lambda reader, writer: handle_client(registry, reader, writer),
+                                      host, port, backlog=4096)
+
+async def serve(registry, host="127.0.0.1", port=8765):
+    """Runs the service until interrupted."""
+    server = await start_service(registry, host, port)
+    addresses = ", ".join(f"{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets)
+    print(f"Rescue Animal service listening on {addresses} (Ctrl+C to stop)")
+    async with server:
+        await server.serve_forever()
+
+# =============================================================================
+# Main Menu Functionality
+# =============================================================================
+def display_menu(registry=None):
+    """Displays the main menu and handles user input to navigate the system.
+
+    Creates a registry loaded with sample data (unless one is passed in) and
+    presents menu options for various functionalities like intake, listing,
+    reporting, reservation, and updating training status.
+    """
+    if registry is None:
+        registry = AnimalRegistry()
+        registry.initialize_data()  # Load sample data into the system
+
+    while True:
+        # Display menu options to the user
+        print("\nRescue Animal System Menu")
+        print("[1] Intake a new dog")
+        print("[2] Intake a new cat")
+        print("[3] Intake a new monkey")
+        print("[4] Print list of all dogs")
+        print("[5] Print list of all cats")
+        print("[6] Print list of all monkeys")
+        print("[7] Print list of available animals")
+        print("[8] Print Training Status for All Animals")
+        print("[9] Print All Animals")
+        print("[10] Reserve an animal")
+        print("[11] Update an animal's training status")
+        print("[12] Bulk import animals from a CSV/JSONL file")
+        print("[13] Print animals acquired between two dates")
+        print("[14] Page through or export a report (options 4-9)")
+        print("[15] Print training status summary")
+        print("[16] Show operation profiling stats")
+        print("[17] Search animals with filters")
+        print("[18] Move a training cohort to a new status")
+        print("[19] Print roster statistics (needs NumPy)")
+        print("[q] Quit")
+
+        choice = input("Enter your choice: ").strip().lower()
+        # Time the whole menu action when profiling is enabled
+        if profiler.enabled and choice != "q":
+            profiler.call(f"menu option {choice}", run_menu_choice, (registry, choice), {})
+        else:
+            run_menu_choice(registry, choice)
+
+def run_menu_choice(registry, choice):
+    """Executes functionality based on the user's menu choice."""
+    if choice == "1":
+        registry.intake_new_animal("Dog")
+    elif choice == "2":
+        registry.intake_new_animal("Cat")
+    elif choice == "3":
+        registry.intake_new_animal("Monkey")
+    elif choice == "4":
+        registry.print_list_of_dogs()
+    elif choice == "5":
+        registry.print_list_of_cats()
+    elif choice == "6":
+        registry.print_list_of_monkeys()
+    elif choice == "7":
+        registry.print_list_of_available_animals()
+    elif choice == "8":
+        registry.print_training_status()
+    elif choice == "9":
+        registry.print_all_animals()
+    elif choice == "10":
+        registry.reserve_animal()
+    elif choice == "11":
+        registry.update_animal_training_status()
+    elif choice == "12":
+        path = input("Enter the path of the CSV or JSONL file to import: ").strip()
+        try:
+            print(bulk_import(registry, path))
+        except OSError as error:
+            print(f"Could not read the file: {error}")
+    elif choice == "13":
+        registry.print_animals_acquired_between()
+    elif choice == "14":
+        reports = {"4": registry.print_list_of_dogs, "5": registry.print_list_of_cats,
+                   "6": registry.print_list_of_monkeys, "7": registry.print_list_of_available_animals,
+                   "8": registry.print_training_status, "9": registry.print_all_animals}
+        report = reports.get(input("Enter the report number (4-9): ").strip())
+        if report is None:
+            print("Invalid report number.")
+        else:
+            try:
+                report(**get_report_options())
+            except OSError as error:
+                print(f"Could not write the report: {error}")
+    elif choice == "15":
+        registry.print_training_summary()
+    elif choice == "16":
+        profiler.print_stats()
+    elif choice == "17":
+        registry.search_animals()
+    elif choice == "18":
+        registry.move_cohort_to_status()
+    elif choice == "19":
+        registry.print_roster_statistics()
+    elif choice == "q":
+        print("Exiting the application...")
+        sys.exit()
+    else:
+        print("Invalid choice. Please try again.")
+
+# =============================================================================
+# Entry Point of the Application
+# =============================================================================
+def run_mode(registry, args):
+    # Runs the mode chosen on the command line; main() closes the store however this returns
+    if args.import_path:
+        print(bulk_import(registry, args.import_path, args.chunk_size, args.quarantine, args.allow_new_values))
+        return
+    if not registry:  # Counts stored animals without loading them
+        registry.initialize_data()  # Load sample data into the system
+    if args.nightly_report:
+        with ShardedRoster.from_registry(registry, args.shards, args.shard_by) as roster:
+            roster.print_training_summary()
+            roster.print_validation_report()
+        return
+    if args.serve:
+        try:
+            asyncio.run(serve(registry, args.host, args.port))
+        except KeyboardInterrupt:
+            print("Service stopped.")
+        return
+    display_menu(registry)  # Start the application by displaying the menu; "q" exits through main()'s cleanup
+
+def main(argv=None):
+    """Parses command-line options, prepares the registry, and starts the menu.
+
+    With --db, the roster is kept in a SQLite database, and with --log in an
+    append-only event log directory; either way it survives restarts, and
+    sample data is only loaded into an empty roster. With --import, the
+    file is bulk imported and the program exits without showing the menu.
+    With --serve, the network service runs instead of the menu. With
+    --nightly-report, the roster is split across --shards worker processes,
+    the training status summary and validation report are printed, and the
+    program exits. The store is closed however the program exits, so an
+    event log snapshot under way is finished first.
+    """
+    parser = argparse.ArgumentParser(description="Rescue Animal System")
+    storage = parser.add_mutually_exclusive_group()
+    storage.add_argument("--db", help="SQLite database file for a persistent roster")
+    storage.add_argument("--log", metavar="DIR", help="event log directory for a persistent roster")
+    parser.add_argument("--snapshot-every", type=int, default=100_000, metavar="N",
+                        help="events logged between snapshots of the event log (default: 100000)")
+    parser.add_argument("--import", dest="import_path", metavar="FILE",
+                        help="bulk import animals from a CSV or JSONL file, then exit")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="rows inserted per batch during import")
+    parser.add_argument("--quarantine", metavar="FILE",
+                        help="where rejected import rows are written (default: FILE.rejected.jsonl)")
+    parser.add_argument("--allow-new-values", action="store_true",
+                        help="accept countries, weights, and statuses outside the predefined lists")
+    parser.add_argument("--serve", action="store_true", help="run the network service instead of the menu")
+    parser.add_argument("--nightly-report", action="store_true",
+                        help="print the training summary and validation report from a sharded roster, then exit")
+    parser.add_argument("--shards", type=int, metavar="N",
+                        help="worker processes for --nightly-report (default: one per CPU)")
+    parser.add_argument("--shard-by", choices=ShardedRoster.shard_keys, default="name",
+                        help="how animals are assigned to shards (default: name)")
+    parser.add_argument("--host", default="127.0.0.1", help="address the service listens on")
+    parser.add_argument("--port", type=int, default=8765, help="port the service listens on")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        store = SQLiteAnimalStore(args.db)
+    elif args.log:
+        store = EventLogStore(args.log, args.snapshot_every)
+    else:
+        store = None
+    try:
+        run_mode(AnimalRegistry(store), args)
+    finally:
+        if store is not None:
+            store.close()  # Finishes a running event log snapshot, so the next start replays only the tail
+
 if __name__ == "__main__":
-    display_menu()  # Start the application by displaying the menu
+    main()
 
@@ -0,0 +1,71 @@
+# ================================================
+# Benchmark: Roster Analytics over NumPy Columns
+#
+# Builds a synthetic roster and compares computing statistics the old way
+# (re-parsing the free-text fields of every animal object, then grouping
+# in Python) with RosterAnalytics, which parses each field once into
+# typed NumPy columns. Times building the columns, per-group statistics,
+# outlier detection, and the weight range histogram, checks the
+# statistics against a plain Python computation, and checks the columns
+# stay in sync after a batch of training status changes.
+#
+# Needs NumPy. Usage: python bench_analytics.py [--animals N]
+# ================================================
+
+import argparse  # For command-line options
+import statistics  # For the plain Python reference statistics
+import sys  # For the exit status
+import time  # For measuring each computation
+from collections import Counter, defaultdict  # For the plain Python reference grouping
+
+from rescue_system import pet_project, synthetic_registry
+
+
+def python_age_stats(registry):
+    """Mean and median age per acquisition country, parsing every animal's age again."""
+    ages = defaultdict(list)
+    for animal in registry:
+        ages[animal.acquisition_country].append(float(animal.age))
+    return {country: (statistics.fmean(values), statistics.median(values)) for country, values in ages.items()}
+
+
+def timed(label, func, *args):
+    """Runs func(*args), prints how long it took, and returns its result."""
+    started = time.perf_counter()
+    result = func(*args)
+    print(f"{label:<44} {(time.perf_counter() - started) * 1000:9.1f}ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure roster analytics over NumPy columns.")
+    parser.add_argument("--animals", type=int, default=1_000_000, help="roster size")
+    args = parser.parse_args()
+    if pet_project.np is None:
+        print("NumPy is not installed; roster analytics are unavailable.")
+        sys.exit(1)
+
+    registry = synthetic_registry(args.animals)
+    expected = timed("Python: age by country (re-parsing objects)", python_age_stats, registry)
+    timed("Python: weight ranges by type", lambda: Counter((a.animal_type, a.weight) for a in registry))
+    analytics = timed("Columns built (one parse per field)", registry.analytics)
+    stats = timed("NumPy: age by country", analytics.group_stats, "age", "country")
+    timed("NumPy: body length by species", analytics.group_stats, "body_length", "species", (5, 50, 95))
+    outliers = timed("NumPy: tail length outliers by species", analytics.outliers, "tail_length", "species")
+    timed("NumPy: weight ranges by type", analytics.weight_histogram, "type")
+    print(f"Outliers found: {len(outliers):,}")
+
+    ok = all(abs(stats[country]["mean"] - mean) < 1e-9 and abs(stats[country]["p50"] - median) < 1e-9
+             for country, (mean, median) in expected.items())
+    registry.move_cohort(registry.query().where(animal_type="Dog"), "Completed", forward_only=False)
+    completed = pet_project.training_statuses.index("Completed")
+    dogs = analytics.column("type") == pet_project.animal_types.index("Dog")
+    ok = ok and bool((analytics.column("status")[dogs] == completed).all())
+    if not ok:
+        print("FAILED: the column statistics disagree with the roster.")
+        sys.exit(1)
+    print("OK: column statistics match the roster and follow status changes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# ================================================
+# Benchmark: Batch Training Status Transitions
+#
+# Throughput: builds a synthetic roster on each backend (in memory,
+# SQLite and the event log) and times moving every animal to a new
+# training stage with one update_training_statuses call, then moving a
+# queried cohort with move_cohort.
+#
+# Rollback check: a store that fails while writing the batch must leave
+# every status, stage count and available listing exactly as it was.
+#
+# Reopened store check: on a SQLite file and an event log reopened with
+# nothing loaded, cohorts selected by type alone or by no filter at all
+# (which the planner would stream from the store) must move, and the new
+# statuses must survive another reopen.
+#
+# Usage: python bench_batch_status.py [--animals N]
+# ================================================
+
+import argparse  # For command-line options
+import os  # For the scratch store paths
+import sys  # For the exit status
+import tempfile  # For a scratch store directory
+import time  # For measuring throughput
+
+from rescue_system import pet_project, synthetic_registry
+
+
+class FailingStore(pet_project.SQLiteAnimalStore):
+    """SQLite store whose batch write always fails, for the rollback check."""
+
+    def set_training_statuses(self, animals):
+        raise OSError("Simulated write failure")
+
+
+def measure(label, registry):
+    """Times one name -> status batch over the whole roster and one cohort move."""
+    changes = {animal.name: "Completed" for animal in registry}
+    started = time.perf_counter()
+    changed = registry.update_training_statuses(changes, forward_only=False)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<10} batch:  {changed:>9,} changed of {len(changes):,} in {elapsed:.2f}s "
+          f"({len(changes) / elapsed:,.0f} updates/s)")
+
+    cohort = registry.query().where(animal_type="Dog", training_status="Completed")
+    started = time.perf_counter()
+    moved = registry.move_cohort(cohort, "Final Stage", forward_only=False)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<10} cohort: {moved:>9,} dogs moved in {elapsed:.2f}s ({moved / elapsed:,.0f} updates/s)")
+
+
+def rollback_check(directory, animals):
+    """Returns True if a failed batch left the registry untouched."""
+    registry = synthetic_registry(animals, store=FailingStore(os.path.join(directory, "failing.db")))
+    before = {animal.name: animal.training_status for animal in registry}
+    counts = {animal_type: registry.status_counts(animal_type) for animal_type in pet_project.animal_types}
+    available = {animal_type: len(registry.available_animals(animal_type)) for animal_type in pet_project.animal_types}
+    try:
+        registry.update_training_statuses({name: "Intake/Check-in" for name in before}, forward_only=False)
+    except OSError:
+        pass
+    else:
+        print("The failing store did not raise.")
+        return False
+    ok = (before == {animal.name: animal.training_status for animal in registry}
+          and counts == {t: registry.status_counts(t) for t in pet_project.animal_types}
+          and available == {t: len(registry.available_animals(t)) for t in pet_project.animal_types})
+    registry.store.close()
+    return ok
+
+
+def reopened_cohort_check(directory, animals):
+    """Returns True if cohort moves on reopened stores change and persist every matching animal."""
+    backends = {"sqlite": lambda: pet_project.SQLiteAnimalStore(os.path.join(directory, "cohort.db")),
+                "event log": lambda: pet_project.EventLogStore(os.path.join(directory, "cohort-log"))}
+    ok = True
+    for label, open_store in backends.items():
+        store = open_store()
+        synthetic_registry(animals, store=store)
+        store.close()
+        for where, status in (({"animal_type": "Dog"}, "Completed"), ({}, "Final Stage")):
+            registry = pet_project.AnimalRegistry(open_store())
+            query = registry.query().where(**where)
+            expected = {animal.name for animal in query}
+            registry.move_cohort(query, status, forward_only=False)
+            registry.store.close()
+            registry = pet_project.AnimalRegistry(open_store())
+            moved = {animal.name for animal in registry.query().where(**where, training_status=status)}
+            registry.store.close()
+            if moved != expected:
+                print(f"{label}: moving {where or 'every animal'} to {status} changed {len(moved):,} "
+                      f"of {len(expected):,} animals")
+                ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure batch training status transitions.")
+    parser.add_argument("--animals", type=int, default=300_000, help="roster size for each backend")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        measure("memory", synthetic_registry(args.animals))
+        sqlite_store = pet_project.SQLiteAnimalStore(os.path.join(directory, "batch.db"))
+        measure("sqlite", synthetic_registry(args.animals, store=sqlite_store))
+        sqlite_store.close()
+        log_store = pet_project.EventLogStore(os.path.join(directory, "log"))
+        measure("event log", synthetic_registry(args.animals, store=log_store))
+        log_store.close()
+        ok = rollback_check(directory, min(args.animals, 20_000))
+        reopened_ok = reopened_cohort_check(directory, min(args.animals, 20_000))
+    if not ok:
+        print("FAILED: a failed batch changed the registry.")
+    if not reopened_ok:
+        print("FAILED: a cohort move on a reopened store did not change every matching animal.")
+    if not ok or not reopened_ok:
+        sys.exit(1)
+    print("OK: a failed batch left every status, count and listing unchanged.")
+    print("OK: cohort moves on reopened stores changed and stored every matching animal.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# ================================================
+# Benchmark: Bytes per Animal
+#
+# Compares the memory used by the slotted Dog/Cat/Monkey classes against
+# equivalent classes that keep a per-instance __dict__ (the layout used
+# before __slots__ were introduced).
+#
+# Usage: python bench_memory.py [--count N]
+# ================================================
+
+import argparse  # For command-line options
+import gc  # For a clean heap before each measurement
+import tracemalloc  # For measuring allocated bytes
+
+from rescue_system import pet_project
+
+
+# =============================================================================
+# Dict-backed classes matching the pre-__slots__ layout
+# =============================================================================
+class DictAnimal:
+    def __init__(self, name, animal_type, gender, age, weight, acquisition_date,
+                 acquisition_country, training_status, reserved, in_service_country):
+        self.name = name
+        self.animal_type = animal_type
+        self.gender = gender
+        self.age = age
+        self.weight = weight
+        self.acquisition_date = acquisition_date
+        self.acquisition_country = acquisition_country
+        self.training_status = training_status
+        self.reserved = reserved
+        self.in_service_country = in_service_country
+
+
+class DictDog(DictAnimal):
+    def __init__(self, name, breed, *args):
+        super().__init__(name, "Dog", *args)
+        self.breed = breed
+
+
+class DictMonkey(DictAnimal):
+    def __init__(self, name, species, gender, age, weight, acquisition_date, acquisition_country,
+                 training_status, reserved, in_service_country, tail_length, height, body_length):
+        super().__init__(name, "Monkey", gender, age, weight, acquisition_date, acquisition_country,
+                         training_status, reserved, in_service_country)
+        self.species = species
+        self.tail_length = tail_length
+        self.height = height
+        self.body_length = body_length
+
+
+# =============================================================================
+# Measurement
+# =============================================================================
+def build(dog_class, monkey_class, count):
+    """Builds count animals, half dogs and half monkeys, sharing all field strings except names."""
+    names = [f"Animal{i}" for i in range(count)]  # Created up front so names are not counted
+    animals = []
+    for i, name in enumerate(names):
+        if i % 2:
+            animals.append(dog_class(name, "German Shepherd", "Male", "3", "60-65 lbs", "05-12-2020",
+                                     "United States", "In-Training", False, "United States"))
+        else:
+            animals.append(monkey_class(name, "Guenon", "Male", "2", "20-25 lbs", "04-10-2021",
+                                        "United States", "In-Training", False, "United States",
+                                        "20.1", "16.2", "22.3"))
+    return animals
+
+
+def bytes_per_animal(dog_class, monkey_class, count):
+    """Returns the average number of bytes allocated per animal object."""
+    gc.collect()
+    tracemalloc.start()
+    names_only = [f"Animal{i}" for i in range(count)]
+    baseline, _ = tracemalloc.get_traced_memory()  # Cost of the name strings alone
+    del names_only
+    gc.collect()
+    start, _ = tracemalloc.get_traced_memory()
+    animals = build(dog_class, monkey_class, count)
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del animals
+    return (end - start - baseline) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure bytes per animal with and without __slots__.")
+    parser.add_argument("--count", type=int, default=100_000, help="number of animals to build")
+    args = parser.parse_args()
+
+    dict_bytes = bytes_per_animal(DictDog, DictMonkey, args.count)
+    slot_bytes = bytes_per_animal(pet_project.Dog, pet_project.Monkey, args.count)
+    print(f"Animals built:          {args.count}")
+    print(f"__dict__ layout:        {dict_bytes:8.1f} bytes/animal")
+    print(f"__slots__ layout:       {slot_bytes:8.1f} bytes/animal")
+    print(f"Reduction:              {dict_bytes - slot_bytes:8.1f} bytes/animal "
+          f"({(1 - slot_bytes / dict_bytes) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# ================================================
+# Benchmark: Prefix and Fuzzy Name Search
+#
+# Builds a NameIndex over a large set of unique, pet-like names made of
+# random syllables, then times prefix searches, searches for names with one
+# typo and long names with two, and the ranked search the menus use. Every
+# typo search is checked: the original name must be among the fuzzy matches
+# whenever it is within the index's edit budget.
+#
+# Usage: python bench_name_search.py [--names N] [--queries N] [--seed N]
+# ================================================
+
+import argparse  # For command-line options
+import random  # For deterministic names and typos
+import statistics  # For median latencies
+import sys  # For the exit status
+import time  # For measuring each search
+
+from rescue_system import pet_project
+
+syllables = ["ba", "bel", "bo", "bu", "cha", "co", "da", "di", "el", "fi", "ga", "har", "ja", "ki", "la", "lu",
+             "ma", "max", "mi", "mo", "na", "ni", "o", "pa", "pep", "ro", "ru", "sa", "sky", "ta", "to", "win",
+             "zo", "ley", "ly", "ra", "rex", "ti", "ver", "zu"]
+
+
+def unique_names(count, rng):
+    """Returns count distinct capitalized names of two to five syllables."""
+    names = set()
+    while len(names) < count:
+        names.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 5))).title())
+    return list(names)
+
+
+def typo(name, edits, rng):
+    """Returns name with a number of random single-letter edits or adjacent swaps."""
+    letters = list(name.lower())
+    for _ in range(edits):
+        i = rng.randrange(len(letters))
+        kind = rng.choice(("substitute", "insert", "delete", "swap"))
+        if kind == "substitute":
+            letters[i] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        elif kind == "insert":
+            letters.insert(i, rng.choice("abcdefghijklmnopqrstuvwxyz"))
+        elif kind == "delete" and len(letters) > 3:
+            del letters[i]
+        elif i + 1 < len(letters):
+            letters[i], letters[i + 1] = letters[i + 1], letters[i]
+    return "".join(letters)
+
+
+def latency(label, func, queries):
+    """Runs func on every query and prints the median and worst latency in milliseconds."""
+    times = []
+    results = []
+    for query in queries:
+        started = time.perf_counter()
+        results.append(func(query))
+        times.append((time.perf_counter() - started) * 1000)
+    print(f"  {label:<30} median {statistics.median(times):7.2f}ms   worst {max(times):7.2f}ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure prefix and fuzzy name search latency.")
+    parser.add_argument("--names", type=int, default=1_000_000, help="names in the index")
+    parser.add_argument("--queries", type=int, default=200, help="searches of each kind")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = unique_names(args.names, rng)
+    started = time.perf_counter()
+    index = pet_project.NameIndex(names)
+    print(f"Indexed {len(index):,} names in {time.perf_counter() - started:.2f}s")
+
+    sample = rng.sample(names, args.queries)
+    prefixes = [name[:rng.randint(2, 5)] for name in sample]
+    latency("prefix (first 10)", lambda text: index.prefix(text, 10), prefixes)
+    failed = 0
+    long_names = [name for name in names[:100_000] if len(name) >= index.two_edit_length + 2]
+    for edits, names_to_misspell in ((1, sample), (2, rng.sample(long_names, min(args.queries, len(long_names))))):
+        typos = [typo(name, edits, rng) for name in names_to_misspell]
+        results = latency(f"fuzzy, {edits} edit(s)", lambda text: index.fuzzy(text, limit=None), typos)
+        for name, text, matches in zip(names_to_misspell, typos, results):
+            budget = 2 if len(text) >= index.two_edit_length else 1
+            within = pet_project.bounded_edit_distance(text.casefold(), name.casefold(), budget) is not None
+            if within and name not in (match for _, match in matches):
+                failed += 1
+    latency("ranked search (menus)", index.search, [typo(name, 1, rng) for name in sample])
+    if failed:
+        print(f"FAILED: {failed} typo searches missed the original name.")
+        sys.exit(1)
+    print("OK: every typo search found the original name.")
+
+
+if __name__ == "__main__":
+    main()
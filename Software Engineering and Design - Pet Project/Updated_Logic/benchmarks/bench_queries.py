@@ -0,0 +1,225 @@
+# ================================================
+# Benchmark: Query Planner
+#
+# Builds a synthetic roster and runs a grid of AnimalQuery filters
+# (type, training status, reserved flag, in-service country, species,
+# acquisition window). For every query, each access path the planner
+# considered is run with the filters its index does not cover, and its
+# rows must equal a brute-force filter over the whole roster, so a plan
+# reading the wrong index is caught even when it is not the cheapest.
+# Prints the time of the chosen plan against a full scan. Also checks
+# that reserved given as "yes"/"no" (as service requests send it) means
+# the same as True/False, and that any other value is rejected.
+#
+# Stored check: the same roster is written to SQLite and to an event log
+# (snapshot, then changes and new animals logged after it) and reopened.
+# Every query filtering on training status, in-service country, or the
+# reserved flag, the available list, and reservation searches must match
+# the in-memory roster while the store answers them: no type is loaded.
+#
+# Listing check: starting a listing of every animal or of one type must
+# not copy the roster (it streams from the type buckets), measured with
+# tracemalloc against the 8 bytes per animal a list copy would take.
+#
+# Usage: python bench_queries.py [--animals N]
+# ================================================
+
+import argparse  # For command-line options
+import os  # For the scratch store paths
+import sys  # For the exit status
+import tempfile  # For a scratch store directory
+import tracemalloc  # For measuring what starting a listing allocates
+import time  # For timing the chosen plans
+from datetime import date  # For the acquisition window
+from itertools import islice, product  # For the late intakes, and the grid of filters
+
+from rescue_system import pet_project, synthetic_animals, synthetic_registry
+
+
+def brute_force(registry, criteria, date_range):
+    """Names of the animals matching the criteria, checked one by one over the whole roster."""
+    def matches(animal):
+        if "animal_type" in criteria and animal.animal_type != criteria["animal_type"]:
+            return False
+        if "training_status" in criteria and animal.training_status != criteria["training_status"]:
+            return False
+        if "reserved" in criteria and animal.reserved != criteria["reserved"]:
+            return False
+        if "in_service_country" in criteria and animal.in_service_country != criteria["in_service_country"]:
+            return False
+        if "species" in criteria and animal.species != criteria["species"]:
+            return False
+        return date_range is None or date_range[0] <= animal.acquisition_date <= date_range[1]
+    return {animal.name for animal in registry if matches(animal)}
+
+
+def plan_rows(query, plan, codes):
+    """Names a plan returns after checking the predicates its index does not cover."""
+    predicates = [predicate for field, _, predicate in query._filters(*codes) if field not in plan.covered]
+    with query.registry._lock:
+        rows = list(plan.candidates())
+    return {animal.name for animal in rows if all(predicate(animal) for predicate in predicates)}
+
+
+def query_grid():
+    """Yields (criteria, date range) for every combination in the filter grid."""
+    window = (date(2018, 1, 1), date(2019, 6, 30))
+    for animal_type, status, reserved, country, species, date_range in product(
+            [None, "Dog", "Monkey"], [None, "In-Training", "Completed"], [None, False, True],
+            [None, "Canada"], [None, "Guenon"], [None, window]):
+        if species is not None and animal_type == "Dog":
+            continue  # Dogs have no species
+        criteria = {field: value for field, value in (("animal_type", animal_type), ("training_status", status),
+                                                      ("reserved", reserved), ("in_service_country", country),
+                                                      ("species", species)) if value is not None}
+        yield criteria, date_range
+
+
+def change_some(registry, count):
+    """Moves and reserves a deterministic set of animals, so stored rows and kept animals differ."""
+    for i in range(0, count, 7):
+        animal = registry.get(f"{pet_project.animal_types[i % 3]}{i}")
+        animal.update_training_status("Completed" if i % 2 else "In-Training")
+        animal.reserved = not animal.reserved
+
+
+def listing_check(registry):
+    """Returns the number of plain listings that copied the roster before yielding their first animal."""
+    failures = 0
+    for label, query, size in (("every animal", registry.query(), len(registry)),
+                               ("every cat", registry.query().where(animal_type="Cat"),
+                                len(registry.animals_of_type("Cat")))):
+        tracemalloc.start()
+        rows = iter(query)
+        next(rows)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Listing {label}: {peak:,} bytes allocated before the first animal ({query.plan().access})")
+        if peak > 4 * size:  # Half of what a list of the listed animals would take
+            failures += 1
+            print(f"MISMATCH: listing {label} copied the roster")
+    return failures
+
+
+def late_animals(count):
+    """300 animals taken in after the first count, named so they do not clash with them."""
+    return list(islice(synthetic_animals(count + 300, seed=1), count, None))
+
+
+def stored_check(directory, count):
+    """Returns the number of store-answered queries that disagree with the in-memory roster."""
+    reference = synthetic_registry(count)
+    change_some(reference, count)
+    reference.add_many(late_animals(count))
+    backends = {"sqlite": lambda: pet_project.SQLiteAnimalStore(os.path.join(directory, "stored.db")),
+                "event log": lambda: pet_project.EventLogStore(os.path.join(directory, "stored-log"))}
+    failures = 0
+    for label, open_store in backends.items():
+        store = open_store()
+        synthetic_registry(count, store=store)
+        if isinstance(store, pet_project.EventLogStore):
+            store.snapshot()  # The later changes are kept animals and a log tail over the mapped rows
+        store.close()
+        registry = pet_project.AnimalRegistry(open_store())
+        change_some(registry, count)
+        registry.add_many(late_animals(count))
+        registry.store.close()
+
+        registry = pet_project.AnimalRegistry(open_store())
+        started = time.perf_counter()
+        checked = 0
+        for criteria, date_range in query_grid():
+            if not {"training_status", "in_service_country", "reserved"} & set(criteria):
+                continue  # Only filters the store can apply
+            query = registry.query().where(**criteria)
+            expected_query = reference.query().where(**criteria)
+            if date_range:
+                query, expected_query = query.acquired_between(*date_range), expected_query.acquired_between(*date_range)
+            checked += 1
+            if {animal.name for animal in query} != {animal.name for animal in expected_query}:
+                failures += 1
+                print(f"MISMATCH: {label}: {query._describe()} via {query.plan().access}")
+        for animal_type in (None, *pet_project.animal_types):
+            for country in (None, "Canada", "Atlantis"):
+                checked += 1
+                if {animal.name for animal in registry.available_animals(animal_type, country)} != \
+                        {animal.name for animal in reference.available_animals(animal_type, country)}:
+                    failures += 1
+                    print(f"MISMATCH: {label}: available animals ({animal_type}, {country})")
+        for animal_type, species in (("Dog", None), ("Monkey", "Guenon")):
+            checked += 1
+            if {animal.name for animal in registry.reservation_candidates(animal_type, "Canada", species)} != \
+                    {animal.name for animal in reference.reservation_candidates(animal_type, "Canada", species)}:
+                failures += 1
+                print(f"MISMATCH: {label}: reservation candidates ({animal_type}, {species})")
+        elapsed = time.perf_counter() - started
+        if registry._loaded_types:
+            failures += 1
+            print(f"MISMATCH: {label}: answering filters loaded {', '.join(sorted(registry._loaded_types))}")
+        print(f"{label}: {checked} filtered queries answered by the store in {elapsed * 1000:.0f}ms")
+        registry.store.close()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check every query plan against a brute-force filter.")
+    parser.add_argument("--animals", type=int, default=30_000, help="roster size")
+    args = parser.parse_args()
+
+    registry = synthetic_registry(args.animals)
+    failures = checked = 0
+    planned_time = scan_time = 0.0
+    for criteria, date_range in query_grid():
+        query = registry.query().where(**criteria)
+        if date_range:
+            query = query.acquired_between(*date_range)
+        expected = brute_force(registry, criteria, date_range)
+
+        types = [criteria["animal_type"]] if "animal_type" in criteria else list(pet_project.animal_types)
+        codes = (pet_project.training_statuses.code_of(criteria["training_status"])
+                 if "training_status" in criteria else None,
+                 pet_project.countries.code_of(criteria["in_service_country"])
+                 if "in_service_country" in criteria else None)
+        for plan in query._index_plans(types, *codes):
+            checked += 1
+            if plan_rows(query, plan, codes) != expected:
+                failures += 1
+                print(f"MISMATCH: {query._describe()} via {plan.access}")
+
+        started = time.perf_counter()
+        found = {animal.name for animal in query}
+        planned_time += time.perf_counter() - started
+        started = time.perf_counter()
+        brute_force(registry, criteria, date_range)
+        scan_time += time.perf_counter() - started
+        if found != expected:
+            failures += 1
+            print(f"MISMATCH: {query._describe()} via the chosen plan ({query.plan().access})")
+
+    for spelling, flag in (("no", False), ("No", False), ("yes", True), (" YES ", True)):
+        if {animal.name for animal in registry.query().where(reserved=spelling)} != brute_force(
+                registry, {"reserved": flag}, None):
+            failures += 1
+            print(f"MISMATCH: reserved={spelling!r} does not match reserved={flag}")
+    for value in ("false", "maybe", 0, 1, None):
+        try:
+            registry.query().where(reserved=value)
+        except ValueError:
+            continue
+        failures += 1
+        print(f"MISMATCH: reserved={value!r} was accepted")
+
+    failures += listing_check(registry)
+    with tempfile.TemporaryDirectory() as directory:
+        failures += stored_check(directory, min(args.animals, 30_000))
+
+    print(f"Plans checked: {checked:,}; chosen plans {planned_time * 1000:.0f}ms in total, "
+          f"brute force {scan_time * 1000:.0f}ms")
+    if failures:
+        print(f"FAILED: {failures} plan(s) returned different rows than the brute-force filter.")
+        sys.exit(1)
+    print("OK: every plan matches the brute-force filter.")
+
+
+if __name__ == "__main__":
+    main()
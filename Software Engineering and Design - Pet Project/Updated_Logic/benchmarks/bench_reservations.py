@@ -0,0 +1,264 @@
+# ================================================
+# Benchmark: Concurrent Reservations
+#
+# Many threads race to reserve the same animals through the registry's
+# ReservationEngine. Every thread tries every animal (in its own shuffled
+# order), so each animal is contested by all threads at once. The run
+# fails if any animal is reserved more than once or the registry's
+# reservation index disagrees with the animals' flags.
+#
+# Mixed check: on a small roster, two threads move animals in and out of
+# "Completed" while two desks reserve and release them. No call may
+# raise, and afterwards the reservation index, stage buckets, available
+# view, and (with --db or --log) the reopened store must all agree with
+# the animals' flags. An availability subscriber follows the race, and
+# each dog's last call must match the available view.
+#
+# Subscriber check: reserving, releasing, moving into and out of
+# "Completed" one at a time and in batches, and taking in animals must
+# call availability subscribers exactly once per animal whose
+# availability changed, with its new availability. A reservation the
+# store rejects, and any change after unsubscribing, must call nobody.
+#
+# Usage: python bench_reservations.py [--animals N] [--threads T] [--seconds S] [--db FILE | --log DIR]
+# ================================================
+
+import argparse  # For command-line options
+import os  # For the scratch store paths of the mixed check
+import random  # For deterministic per-thread shuffles
+import sys  # For the exit status
+import tempfile  # For a scratch store in the mixed check
+import threading  # For the competing reservation desks
+import time  # For measuring throughput
+
+from rescue_system import pet_project
+
+
+class FailingStore(pet_project.SQLiteAnimalStore):
+    """SQLite store whose reservation writes always fail, for the subscriber check."""
+
+    def set_reserved(self, animal):
+        raise OSError("Simulated write failure")
+
+
+def make_dog(index, training_status="Completed", reserved=False):
+    """Dog number index, in service in one of the predefined countries."""
+    return pet_project.Dog(f"Dog{index}", "German Shepherd", "Male", "3", "60-65 lbs", "05-12-2020",
+                           "United States", training_status, reserved,
+                           pet_project.countries[index % len(pet_project.countries)])
+
+
+def build_registry(count, db_path=None, log_dir=None, store=None):
+    """Builds a registry with count unreserved dogs spread over the predefined countries."""
+    if db_path:
+        store = pet_project.SQLiteAnimalStore(db_path)
+    elif log_dir:
+        store = pet_project.EventLogStore(log_dir)
+    registry = pet_project.AnimalRegistry(store)
+    registry.add_many([make_dog(i) for i in range(count)])
+    return registry
+
+
+def index_problems(registry):
+    """Returns descriptions of every registry index that disagrees with the animals' own fields."""
+    animals = list(registry.animals_of_type("Dog"))
+    problems = []
+    for reserved in (False, True):
+        indexed = {animal.name for country in pet_project.countries
+                   for animal in registry.reservation_candidates("Dog", country, reserved=reserved)}
+        if indexed != {animal.name for animal in animals if animal.reserved == reserved}:
+            problems.append(f"reservation index (reserved={reserved})")
+    expected_counts = {}
+    for animal in animals:
+        expected_counts[animal.training_status] = expected_counts.get(animal.training_status, 0) + 1
+    if registry.status_counts("Dog") != dict(sorted(expected_counts.items(),
+                                                    key=lambda item: pet_project.training_statuses.index(item[0]))):
+        problems.append("stage counts")
+    available = {animal.name for animal in registry.available_animals("Dog")}
+    if available != {animal.name for animal in animals if animal.training_status == "Completed" and not animal.reserved}:
+        problems.append("available view")
+    return problems
+
+
+def mixed_check(count, seconds, db_path=None, log_dir=None):
+    """Races status moves against reservations and releases; returns True if nothing raised or drifted."""
+    registry = build_registry(count, db_path, log_dir)
+    names = [f"Dog{i}" for i in range(count)]
+    errors = []  # Exceptions raised by any thread
+    deadline = time.perf_counter() + seconds
+    operations = [0] * 4
+    last_call = {}  # Name -> availability in the subscriber's last call
+    registry.subscribe_availability(lambda animal, available: last_call.__setitem__(animal.name, available))
+
+    def trainer(index):
+        rng = random.Random(index)
+        while time.perf_counter() < deadline:
+            try:
+                registry.get(rng.choice(names)).update_training_status(rng.choice(["Final Stage", "Completed"]))
+            except Exception as error:
+                errors.append(error)
+            operations[index] += 1
+
+    def desk(index):
+        rng = random.Random(index)
+        while time.perf_counter() < deadline:
+            name = rng.choice(names)
+            try:
+                if rng.random() < 0.5:
+                    registry.reservations.reserve(name)
+                else:
+                    registry.reservations.release(name)
+            except Exception as error:
+                errors.append(error)
+            operations[index] += 1
+
+    threads = [threading.Thread(target=work, args=(i,)) for i, work in enumerate((trainer, trainer, desk, desk))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    problems = index_problems(registry)
+    followed = {name for name in names if last_call.get(name, True)}  # Every dog starts available
+    if followed != {animal.name for animal in registry.available_animals("Dog")}:
+        problems.append("availability subscriber")
+    if registry.store is not None:
+        in_memory = {animal.name: (animal.training_status, animal.reserved) for animal in registry}
+        registry.store.close()
+        reopened = pet_project.AnimalRegistry(pet_project.SQLiteAnimalStore(db_path) if db_path
+                                              else pet_project.EventLogStore(log_dir))
+        if {animal.name: (animal.training_status, animal.reserved) for animal in reopened} != in_memory:
+            problems.append("reopened store")
+        reopened.store.close()
+    print(f"Mixed: {sum(operations):,} status moves, reservations and releases over {count} dogs "
+          f"in {seconds:g}s; {len(errors)} errors" + (f" (first: {errors[0]!r})" if errors else ""))
+    for problem in problems:
+        print(f"Mixed: the {problem} disagrees with the animals")
+    return not errors and not problems
+
+
+def subscriber_check(db_path=None, log_dir=None):
+    """Returns descriptions of every change that called availability subscribers wrongly."""
+    registry = build_registry(10, db_path, log_dir)
+    calls = []  # (name, available) per subscriber call
+    callback = registry.subscribe_availability(lambda animal, available: calls.append((animal.name, available)))
+    problems = []
+
+    def expect(label, change, expected):
+        calls.clear()
+        change()
+        if calls != expected:
+            problems.append(f"{label}: expected {expected}, called with {calls}")
+
+    dog = registry.get
+    expect("reserve", lambda: registry.reservations.reserve("Dog0"), [("Dog0", False)])
+    expect("release", lambda: registry.reservations.release("Dog0"), [("Dog0", True)])
+    expect("move out of Completed", lambda: dog("Dog1").update_training_status("Final Stage"), [("Dog1", False)])
+    expect("reserve in training", lambda: registry.reservations.reserve("Dog1"), [])
+    expect("complete while reserved", lambda: dog("Dog1").update_training_status("Completed"), [])
+    expect("release when completed", lambda: registry.reservations.release("Dog1"), [("Dog1", True)])
+    dog("Dog2").update_training_status("In-Training")
+    expect("move into Completed", lambda: dog("Dog2").update_training_status("Completed"), [("Dog2", True)])
+    expect("batch move", lambda: registry.update_training_statuses(
+        {"Dog3": "In-Training", "Dog4": "Completed", "Dog5": "Final Stage"}, forward_only=False),
+        [("Dog3", False), ("Dog5", False)])
+    expect("cohort move", lambda: registry.move_cohort(
+        registry.query().where(animal_type="Dog", training_status="In-Training"), "Completed"), [("Dog3", True)])
+    expect("intake", lambda: registry.add_many([make_dog(10), make_dog(11, reserved=True),
+                                                make_dog(12, training_status="In-Training")]), [("Dog10", True)])
+    registry.unsubscribe_availability(callback)
+    expect("after unsubscribing", lambda: registry.reservations.reserve("Dog6"), [])
+    if registry.store is not None:
+        registry.store.close()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        registry = build_registry(2, store=FailingStore(os.path.join(scratch, "failing.db")))
+        registry.subscribe_availability(lambda animal, available: calls.append((animal.name, available)))
+
+        def rejected_reservation():
+            try:
+                registry.reservations.reserve("Dog0")
+            except OSError:
+                return
+            problems.append("rejected reservation: the failing store did not raise")
+        expect("rejected reservation", rejected_reservation, [])
+        registry.store.close()
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress test concurrent reservations.")
+    parser.add_argument("--animals", type=int, default=20_000, help="number of animals to reserve")
+    parser.add_argument("--threads", type=int, default=8, help="number of competing threads")
+    parser.add_argument("--seconds", type=float, default=3.0, help="length of the mixed check")
+    storage = parser.add_mutually_exclusive_group()
+    storage.add_argument("--db", help="optional SQLite file, to include write-through in the measurement")
+    storage.add_argument("--log", metavar="DIR",
+                         help="optional event log directory, to include synced reservations in the measurement")
+    args = parser.parse_args()
+
+    registry = build_registry(args.animals, args.db, args.log)
+    names = [f"Dog{i}" for i in range(args.animals)]
+    wins = [[] for _ in range(args.threads)]  # Names each thread managed to reserve
+    start_line = threading.Barrier(args.threads + 1)  # Start every thread at the same moment
+
+    def desk(index):
+        order = names[:]
+        random.Random(index).shuffle(order)
+        start_line.wait()
+        for name in order:
+            if registry.reservations.reserve(name) is not None:
+                wins[index].append(name)
+
+    threads = [threading.Thread(target=desk, args=(i,)) for i in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    start_line.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    all_wins = [name for thread_wins in wins for name in thread_wins]
+    attempts = args.animals * args.threads
+    double_reserved = len(all_wins) - len(set(all_wins))
+    unreserved = [name for name in names if not registry.get(name).reserved]
+    # Every animal should now sit in a reserved bucket of the reservation index
+    index_mismatches = sum(len(registry.reservation_candidates("Dog", country)) for country in pet_project.countries)
+
+    print(f"Threads:                 {args.threads}")
+    print(f"Reservation attempts:    {attempts}")
+    print(f"Successful reservations: {len(all_wins)}")
+    print(f"Double reservations:     {double_reserved}")
+    print(f"Animals left unreserved: {len(unreserved)}")
+    print(f"Stale index entries:     {index_mismatches}")
+    print(f"Elapsed:                 {elapsed:.2f}s")
+    print(f"Attempts/sec:            {attempts / elapsed:,.0f}")
+    print(f"Reservations/sec:        {len(all_wins) / elapsed:,.0f}")
+
+    if registry.store is not None:
+        registry.store.close()
+    with tempfile.TemporaryDirectory() as scratch:
+        mixed_ok = mixed_check(200, args.seconds, os.path.join(scratch, "mixed.db") if args.db else None,
+                               os.path.join(scratch, "mixed-log") if args.log else None)
+        subscriber_problems = subscriber_check(os.path.join(scratch, "subscribers.db") if args.db else None,
+                                               os.path.join(scratch, "subscribers-log") if args.log else None)
+    for problem in subscriber_problems:
+        print(f"Subscriber: {problem}")
+
+    reservations_ok = not (double_reserved or unreserved or index_mismatches or len(all_wins) != args.animals)
+    if not reservations_ok:
+        print("FAILED: reservations were lost or duplicated.")
+    if not mixed_ok:
+        print("FAILED: status moves racing reservations broke a call or an index.")
+    if subscriber_problems:
+        print("FAILED: availability subscribers were not called exactly once per availability change.")
+    if not reservations_ok or not mixed_ok or subscriber_problems:
+        sys.exit(1)
+    print("OK: every animal was reserved exactly once.")
+    print("OK: status moves racing reservations kept every index, the store and subscribers consistent.")
+    print("OK: availability subscribers were called exactly once per availability change.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# ================================================
+# Benchmark: Event Log Restart and Crash Safety
+#
+# Restart: builds a synthetic roster in an EventLogStore, takes a snapshot,
+# logs a tail of training status changes after it, and times reopening
+# the store (snapshot mapping plus tail replay), counting and paging
+# straight from the mapped snapshot, and loading every animal into a
+# registry.
+#
+# Crash check: a child process reserves animals one at a time and prints
+# each name once the reservation is acknowledged. The child is killed with
+# SIGKILL part-way through, and the run fails if any acknowledged
+# reservation is missing after the log is reopened.
+#
+# Compaction check: listings of a reopened log are read part-way, then
+# animals are added and a snapshot replaces the mapped one; the rest of
+# each listing must still be the animals stored when it started.
+#
+# Exit check: the program imports a file into a log whose snapshot falls
+# due near the end and exits; the snapshot must be on disk, so the next
+# start replays only the events after it, and a leftover half-written
+# snapshot file must be deleted when the log is opened.
+#
+# Usage: python bench_restart.py [--animals N] [--tail N] [--crash-after N]
+# ================================================
+
+import argparse  # For command-line options
+import json  # For the import file of the exit check
+import os  # For the temporary log directory
+import signal  # For killing the child process without cleanup
+import subprocess  # For the child process in the crash check
+import sys  # For the exit status and the child's interpreter
+import tempfile  # For a scratch log directory
+import time  # For measuring restart time
+from itertools import islice  # For reading one page of a listing
+
+from rescue_system import pet_project, synthetic_animals, synthetic_registry
+
+
+def open_registry(directory):
+    """Opens the event log and returns a registry on top of it."""
+    return pet_project.AnimalRegistry(pet_project.EventLogStore(directory))
+
+
+def measure_restart(directory, animals, tail):
+    """Builds a logged roster with a snapshot and a tail, then times reopening it."""
+    store = pet_project.EventLogStore(directory, snapshot_every=animals + tail + 1)  # Only the explicit snapshot
+    started = time.perf_counter()
+    registry = synthetic_registry(animals, store=store)
+    print(f"Logged {animals:,} animals in {time.perf_counter() - started:.2f}s")
+    started = time.perf_counter()
+    store.snapshot()
+    print(f"Snapshot written in {time.perf_counter() - started:.2f}s")
+    for i in range(tail):  # Changes logged after the snapshot, replayed on restart
+        animal = registry.get(f"{pet_project.animal_types[i % 3]}{i}")
+        animal.update_training_status(pet_project.training_statuses[(i // 3) % 4])
+    store.close()
+
+    started = time.perf_counter()
+    registry = open_registry(directory)
+    opened = time.perf_counter() - started
+    print(f"Reopened {len(registry):,} animals + {tail:,} tail events in {opened:.2f}s "
+          f"({len(registry.store._animals):,} objects built)")
+    started = time.perf_counter()
+    for animal_type in pet_project.animal_types:
+        registry.status_counts(animal_type)
+    print(f"Stage counts for every type from the mapped columns: {(time.perf_counter() - started) * 1000:.1f}ms")
+    started = time.perf_counter()
+    page = list(islice(registry.iter_type("Cat"), 5000, 5100))
+    print(f"Page of {len(page)} cats at offset 5,000: {(time.perf_counter() - started) * 1000:.1f}ms")
+    started = time.perf_counter()
+    for animal_type in pet_project.animal_types:
+        registry.animals_of_type(animal_type)
+    print(f"Every type loaded into the registry: {time.perf_counter() - started:.2f}s")
+    registry.store.close()
+
+
+def crash_child(directory, count):
+    """Child process: reserves animals and reports each acknowledged reservation."""
+    registry = open_registry(directory)
+    for i in range(count):
+        if registry.reservations.reserve(f"Dog{i}") is not None:
+            print(f"Dog{i}", flush=True)  # Printed only after the reservation was synced
+
+
+def crash_check(directory, animals, crash_after):
+    """Kills a reserving child process and verifies no acknowledged reservation was lost."""
+    store = pet_project.EventLogStore(directory)
+    registry = pet_project.AnimalRegistry(store)
+    registry.add_many([
+        pet_project.Dog(f"Dog{i}", "Beagle", "Male", "2", "20-25 lbs", "01-02-2020",
+                        "Canada", "Completed", False, "Canada")
+        for i in range(animals)
+    ])
+    store.close()
+
+    child = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--child", directory, "--animals",
+                              str(animals)], stdout=subprocess.PIPE, text=True)
+    acknowledged = []
+    for line in child.stdout:
+        acknowledged.append(line.strip())
+        if len(acknowledged) >= crash_after:
+            break
+    child.send_signal(signal.SIGKILL)
+    child.wait()
+    acknowledged.extend(line.strip() for line in child.stdout)  # Anything printed before the kill landed
+
+    registry = open_registry(directory)
+    lost = [name for name in acknowledged if not registry.get(name).reserved]
+    reserved = sum(animal.reserved for animal in registry)
+    print(f"Acknowledged before the kill: {len(acknowledged):,}")
+    print(f"Reserved after restart:       {reserved:,}")
+    print(f"Lost reservations:            {len(lost)}")
+    registry.store.close()
+    return not lost
+
+
+def compaction_check(directory, animals):
+    """Returns True if listings started before a compaction finish with the roster they started on."""
+    store = pet_project.EventLogStore(directory)
+    synthetic_registry(animals, store=store)
+    store.snapshot()
+    store.close()
+
+    store = pet_project.EventLogStore(directory)
+    registry = pet_project.AnimalRegistry(store)
+    expected_cats = [animal.name for animal in store.iter_animals("Cat")]
+    expected_names = list(store.iter_names())
+    cats, names = registry.iter_type("Cat"), store.iter_names()
+    read_cats, read_names = [next(cats).name for _ in range(3)], [next(names) for _ in range(3)]
+    old = store._snapshot
+    registry.add_many([pet_project.Dog(f"Late{i}", "Beagle", "Male", "2", "20-25 lbs", "01-02-2020",
+                                       "Canada", "Completed", False, "Canada") for i in range(50)])
+    store.snapshot()
+    read_cats += [animal.name for animal in cats]
+    read_names += list(names)
+    ok = read_cats == expected_cats and read_names == expected_names and old.retired and old._map.closed
+    print(f"Listed across a compaction: {len(read_cats):,} cats and {len(read_names):,} names "
+          f"({'unchanged' if ok else 'CHANGED'})")
+    store.close()
+    return ok
+
+
+def exit_check(directory, animals):
+    """Returns True if the program's exit finished a due snapshot and opening the log removed a partial one."""
+    import_path = os.path.join(directory, "import.jsonl")
+    with open(import_path, "w", encoding="utf-8") as handle:
+        for animal in synthetic_animals(animals):
+            handle.write(json.dumps(pet_project.animal_to_record(animal)) + "\n")
+    log_dir = os.path.join(directory, "log")
+    os.makedirs(log_dir)
+    partial = os.path.join(log_dir, f"{pet_project.EventLogStore.SNAPSHOT_PREFIX}000000000001.bin.tmp")
+    open(partial, "wb").close()
+    snapshot_every = animals * 9 // 10  # Due just before the import ends
+    subprocess.run([sys.executable, pet_project.__file__, "--log", log_dir, "--snapshot-every", str(snapshot_every),
+                    "--import", import_path], check=True, stdout=subprocess.DEVNULL)
+    store = pet_project.EventLogStore(log_dir, snapshot_every)
+    replayed = store._events_since_snapshot
+    ok = store.count() == animals and replayed <= animals - snapshot_every and not os.path.exists(partial)
+    print(f"Events replayed after an import and exit: {replayed:,} of {animals:,}")
+    store.close()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure event log restart time and crash safety.")
+    parser.add_argument("--animals", type=int, default=1_000_000, help="roster size for the restart measurement")
+    parser.add_argument("--tail", type=int, default=100_000, help="events logged after the snapshot")
+    parser.add_argument("--crash-after", type=int, default=2_000,
+                        help="acknowledged reservations before the child is killed")
+    parser.add_argument("--child", metavar="DIR", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        crash_child(args.child, args.animals)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        measure_restart(os.path.join(directory, "restart"), args.animals, args.tail)
+        ok = crash_check(os.path.join(directory, "crash"), args.crash_after * 5, args.crash_after)
+        compaction_ok = compaction_check(os.path.join(directory, "compaction"), min(args.animals, 30_000))
+        os.makedirs(os.path.join(directory, "exit"))
+        exit_ok = exit_check(os.path.join(directory, "exit"), min(args.animals, 50_000))
+    if not ok:
+        print("FAILED: acknowledged reservations were lost.")
+    if not compaction_ok:
+        print("FAILED: a compaction changed the animals of a listing already under way.")
+    if not exit_ok:
+        print("FAILED: exiting lost a due snapshot or a partial snapshot file survived.")
+    if not ok or not compaction_ok or not exit_ok:
+        sys.exit(1)
+    print("OK: every acknowledged reservation survived the crash.")
+    print("OK: listings under way kept their roster across a compaction.")
+    print("OK: exiting finished the due snapshot and opening removed the partial one.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# ================================================
+# Benchmark: Sharded Roster Across Worker Processes
+#
+# Builds a synthetic roster, then times the nightly full-roster work (the
+# training status summary, a scan for available animals, validation of
+# every animal, and a bulk training status update) in a single registry
+# and in a ShardedRoster with one worker process per shard. Results from
+# both are compared, and the run fails if they differ.
+#
+# Usage: python bench_shards.py [--animals N] [--shards N] [--by name|country]
+# ================================================
+
+import argparse  # For command-line options
+import os  # For the default shard count
+import sys  # For the exit status
+import time  # For measuring each operation
+
+from rescue_system import pet_project, synthetic_registry
+
+
+def timed(label, func):
+    """Runs func once, prints how long it took, and returns its result."""
+    started = time.perf_counter()
+    result = func()
+    print(f"  {label:<28} {time.perf_counter() - started:8.3f}s")
+    return result
+
+
+def validate_registry(registry):
+    """Single-process validation, matching what each shard does."""
+    problems = []
+    for animal in registry:
+        try:
+            pet_project.build_animal(pet_project.animal_to_record(animal))
+        except ValueError as error:
+            problems.append((animal.name, str(error)))
+    return sorted(problems, key=lambda problem: problem[0].casefold())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare a single registry with a sharded roster.")
+    parser.add_argument("--animals", type=int, default=300_000, help="roster size")
+    parser.add_argument("--shards", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--by", choices=pet_project.ShardedRoster.shard_keys, default="name",
+                        help="how animals are assigned to shards")
+    args = parser.parse_args()
+
+    registry = synthetic_registry(args.animals)
+    names = [f"Dog{i}" for i in range(0, args.animals, 30)]  # Every tenth dog
+
+    print(f"Single registry ({args.animals:,} animals):")
+    counts = timed("training status summary",
+                   lambda: {animal_type: registry.status_counts(animal_type)
+                            for animal_type in pet_project.animal_types})
+    available = timed("scan for available animals", lambda: list(registry.iter_available_animals()))
+    problems = timed("validate every animal", lambda: validate_registry(registry))
+
+    print(f"Sharded roster ({args.shards} shards by {args.by}):")
+    roster = timed("load shards", lambda: pet_project.ShardedRoster.from_registry(registry, args.shards, args.by))
+    with roster:
+        sharded_counts = timed("training status summary", roster.status_counts)
+        sharded_available = timed("scan for available animals",
+                                  lambda: roster.scan(training_status="Completed", reserved=False))
+        sharded_problems = timed("validate every animal", roster.validate)
+        timed(f"update {len(names):,} statuses", lambda: roster.update_training_status(names, "Final Stage"))
+
+    same = (counts == sharded_counts and problems == sharded_problems
+            and sorted(animal.name for animal in available) == sorted(animal.name for animal in sharded_available))
+    if not same:
+        print("FAILED: the sharded roster disagrees with the single registry.")
+        sys.exit(1)
+    print("OK: sharded results match the single registry.")
+
+
+if __name__ == "__main__":
+    main()
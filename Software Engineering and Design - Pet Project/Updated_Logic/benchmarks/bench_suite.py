@@ -0,0 +1,160 @@
+# ================================================
+# Benchmark Suite: Rescue System Operations
+#
+# Builds deterministic synthetic rosters of Dogs, Cats, and Monkeys at each
+# requested size and drives every menu operation non-interactively:
+#   intake_new_animal              -> registry.add
+#   reserve_animal                 -> reservation_candidates + reservations.reserve
+#   update_animal_training_status  -> registry.get + update_training_status
+#   print_training_status          -> full report written to the null device
+#   print_list_of_available_animals-> full report written to the null device
+# For each operation it records latency percentiles, throughput, and peak
+# memory, and writes everything to a JSON file for comparing versions.
+#
+# Usage: python bench_suite.py [--sizes 1e3,1e5,1e6] [--output bench_results.json] [--label NAME]
+# ================================================
+
+import argparse  # For command-line options
+import gc  # For a clean heap between measurements
+import json  # For the results file
+import os  # For the null device
+import platform  # For recording the Python version
+import random  # For choosing animals to operate on
+import subprocess  # For recording the git revision
+import time  # For latency measurement
+import tracemalloc  # For peak memory
+from contextlib import redirect_stdout  # For sending reports to the null device
+from datetime import datetime  # For the run timestamp
+from itertools import islice  # For taking the animals past the roster
+
+from rescue_system import pet_project, synthetic_animals, synthetic_registry
+
+
+# =============================================================================
+# Measurement Helpers
+# =============================================================================
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def measure(operation, size, calls):
+    """Runs each zero-argument callable in calls once, timing each call.
+
+    Returns a result row with latency percentiles (ms), throughput, and the
+    peak memory (bytes) allocated while the calls ran.
+    """
+    gc.collect()
+    tracemalloc.start()
+    latencies = []
+    started = time.perf_counter()
+    for call in calls:
+        call_started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    latencies.sort()
+    return {
+        "operation": operation,
+        "size": size,
+        "calls": len(latencies),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "ops_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "peak_memory_bytes": peak,
+    }
+
+
+def git_revision():
+    # Short commit hash of the code being measured, if available
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# =============================================================================
+# Operations
+# =============================================================================
+def run_size(size, point_calls, report_calls, seed):
+    """Benchmarks every operation against a roster of the given size."""
+    rng = random.Random(seed)
+    results = []
+
+    # Roster construction, measured as one call so its peak memory is the roster's footprint
+    holder = {}
+    results.append(measure("build_roster", size, [lambda: holder.update(registry=synthetic_registry(size, seed))]))
+    registry = holder["registry"]
+    names = [f"{pet_project.animal_types[i % 3]}{i}" for i in range(size)]
+
+    # intake_new_animal: new animals added one at a time (names continue past the roster)
+    new_animals = list(islice(synthetic_animals(size + point_calls, seed), size, None))
+    results.append(measure("intake_new_animal", size, [lambda a=a: registry.add(a) for a in new_animals]))
+
+    # reserve_animal: search the reservation index, then reserve a candidate if any
+    def reserve(animal_type, country, species):
+        candidates = registry.reservation_candidates(animal_type, country, species)
+        if candidates:
+            registry.reservations.reserve(candidates[0].name)
+
+    searches = []
+    for _ in range(point_calls):
+        animal_type = rng.choice(pet_project.animal_types)
+        species = rng.choice(["Guenon", "Marmoset", "Capuchin"]) if animal_type == "Monkey" else None
+        searches.append((animal_type, rng.choice(pet_project.countries[:5]), species))
+    results.append(measure("reserve_animal", size, [lambda s=s: reserve(*s) for s in searches]))
+
+    # update_animal_training_status: look up by name, then change the status
+    updates = [(rng.choice(names), rng.choice(pet_project.training_statuses[:4])) for _ in range(point_calls)]
+    results.append(measure("update_animal_training_status", size,
+                           [lambda n=n, s=s: registry.get(n).update_training_status(s) for n, s in updates]))
+
+    # Full reports, written through the normal report path to the null device
+    with open(os.devnull, "w") as sink, redirect_stdout(sink):
+        results.append(measure("print_training_status", size,
+                               [registry.print_training_status] * report_calls))
+        results.append(measure("print_training_summary", size,
+                               [registry.print_training_summary] * report_calls))
+        results.append(measure("print_list_of_available_animals", size,
+                               [registry.print_list_of_available_animals] * report_calls))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every rescue system operation.")
+    parser.add_argument("--sizes", default="1e3,1e5,1e6", help="comma-separated roster sizes")
+    parser.add_argument("--point-calls", type=int, default=1000,
+                        help="calls per intake/reserve/update measurement")
+    parser.add_argument("--report-calls", type=int, default=5, help="calls per report measurement")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic roster")
+    parser.add_argument("--output", default="bench_results.json", help="JSON results file")
+    parser.add_argument("--label", help="name for this run (default: the git revision)")
+    args = parser.parse_args()
+
+    revision = git_revision()
+    run = {
+        "label": args.label or revision,
+        "revision": revision,
+        "python": platform.python_version(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "seed": args.seed,
+        "results": [],
+    }
+    print(f"{'operation':<34}{'size':>9}{'p50 ms':>10}{'p99 ms':>10}{'ops/sec':>12}{'peak MB':>10}")
+    for size in (int(float(value)) for value in args.sizes.split(",")):
+        for row in run_size(size, args.point_calls, args.report_calls, args.seed):
+            run["results"].append(row)
+            print(f"{row['operation']:<34}{row['size']:>9}{row['p50_ms']:>10.3f}{row['p99_ms']:>10.3f}"
+                  f"{row['ops_per_sec']:>12,.0f}{row['peak_memory_bytes'] / 1e6:>10.1f}")
+
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(run, handle, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# ================================================
+# Load Generator for the Rescue Animal Service
+#
+# Opens many concurrent connections to the asyncio service and sends a mix
+# of list, available, search, reserve, update-training-status, and intake
+# requests, then reports throughput and latency percentiles.
+#
+# By default it starts the service in-process on a free localhost port with
+# a synthetic roster, kept in a SQLite file with --db or an event log with
+# --log so store writes and syncs are part of the measurement. Use
+# --connect HOST:PORT to load an already running service instead
+# (e.g. python "Category 1_Pet_Project.py" --serve).
+#
+# Usage: python load_generator.py [--connections N] [--requests R] [--animals A] [--db FILE | --log DIR]
+# ================================================
+
+import argparse  # For command-line options
+import asyncio  # For the concurrent client connections
+import json  # For the JSON Lines protocol
+import random  # For the request mix
+import time  # For latency measurement
+
+from rescue_system import pet_project, synthetic_registry
+
+try:
+    import resource  # For raising the open-file limit (not available on Windows)
+except ImportError:
+    resource = None
+
+
+def raise_open_file_limit():
+    # Each connection needs a file descriptor (two when the service runs in-process)
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def make_request(rng, client, sequence, animal_count):
+    """Builds one request of the mix for a client."""
+    roll = rng.random()
+    animal_type = pet_project.animal_types[rng.randrange(3)]
+    index = rng.randrange(animal_count) // 3 * 3 + pet_project.animal_types.index(animal_type)
+    name = f"{animal_type}{index}"  # Matches the synthetic roster's naming
+    if roll < 0.25:
+        return {"op": "search", "animal_type": animal_type, "in_service_country": rng.choice(pet_project.countries),
+                "species": "Guenon", "limit": 10}
+    if roll < 0.40:
+        return {"op": "available", "offset": rng.randrange(100), "limit": 10}
+    if roll < 0.55:
+        return {"op": "list", "animal_type": animal_type, "offset": rng.randrange(100), "limit": 10}
+    if roll < 0.75:
+        return {"op": "reserve", "name": name}
+    if roll < 0.95:
+        return {"op": "update_training_status", "name": name, "status": rng.choice(pet_project.training_statuses)}
+    return {"op": "intake", "animal": {
+        "name": f"Load{client}-{sequence}", "animal_type": "Dog", "breed": "Beagle", "gender": "Male", "age": "2",
+        "weight": "20-25 lbs", "acquisition_date": "01-15-2024", "acquisition_country": "Canada",
+        "training_status": "Intake/Check-in", "reserved": "no", "in_service_country": "Canada"}}
+
+
+async def run_client(host, port, client, requests, animal_count, latencies, outcomes):
+    """One connection sending requests one at a time and timing each round trip."""
+    rng = random.Random(client)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for sequence in range(requests):
+            request = make_request(rng, client, sequence, animal_count)
+            started = time.perf_counter()
+            writer.write((json.dumps(request) + "\n").encode("utf-8"))
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - started)
+            outcomes["ok" if response["ok"] else "error"] += 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+async def main_async(args):
+    server = None
+    if args.connect:
+        host, port = args.connect.rsplit(":", 1)
+        port = int(port)
+    else:
+        store = None
+        if args.db:
+            store = pet_project.SQLiteAnimalStore(args.db)
+        elif args.log:
+            store = pet_project.EventLogStore(args.log)
+        registry = synthetic_registry(args.animals, store=store)
+        server = await pet_project.start_service(registry, "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+
+    latencies, outcomes = [], {"ok": 0, "error": 0}
+    started = time.perf_counter()
+    await asyncio.gather(*(run_client(host, port, client, args.requests, args.animals, latencies, outcomes)
+                           for client in range(args.connections)))
+    elapsed = time.perf_counter() - started
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"Connections:       {args.connections}")
+    print(f"Requests:          {total} ({outcomes['ok']} ok, {outcomes['error']} errors, "
+          f"e.g. already reserved)")
+    print(f"Elapsed:           {elapsed:.2f}s")
+    print(f"Throughput:        {total / elapsed:,.0f} requests/sec")
+    print(f"Latency p50:       {percentile(latencies, 0.50) * 1000:.2f} ms")
+    print(f"Latency p95:       {percentile(latencies, 0.95) * 1000:.2f} ms")
+    print(f"Latency p99:       {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate load against the Rescue Animal service.")
+    parser.add_argument("--connections", type=int, default=1000, help="concurrent client connections")
+    parser.add_argument("--requests", type=int, default=20, help="requests sent per connection")
+    parser.add_argument("--animals", type=int, default=30_000, help="synthetic roster size (in-process service)")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="load a running service instead of starting one")
+    storage = parser.add_mutually_exclusive_group()
+    storage.add_argument("--db", help="optional SQLite file for the in-process service's roster")
+    storage.add_argument("--log", metavar="DIR", help="optional event log directory for the in-process service's roster")
+    args = parser.parse_args()
+    raise_open_file_limit()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
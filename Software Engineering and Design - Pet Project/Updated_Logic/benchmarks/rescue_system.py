@@ -0,0 +1,74 @@
+# ================================================
+# Benchmark helper: loads the Rescue Animal System
+#
+# The application script's file name contains spaces, so it cannot be
+# imported with a plain import statement. This helper loads it by path
+# and registers it as the "pet_project" module for the benchmark scripts,
+# and builds deterministic synthetic rosters for them.
+# ================================================
+
+import importlib.util  # For loading a module from a file path
+import os  # For building the path to the application script
+import random  # For deterministic synthetic rosters
+import sys  # For registering the loaded module
+from datetime import date  # For synthetic acquisition dates
+
+# Path to the application script, one directory above this benchmarks folder
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "Category 1_Pet_Project.py")
+
+
+def load():
+    """Returns the Rescue Animal System module, loading it on first use."""
+    if "pet_project" in sys.modules:
+        return sys.modules["pet_project"]
+    spec = importlib.util.spec_from_file_location("pet_project", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["pet_project"] = module  # Register before executing so pickling by module name works
+    spec.loader.exec_module(module)
+    return module
+
+
+pet_project = load()
+
+
+# =============================================================================
+# Synthetic Rosters
+# =============================================================================
+dog_breeds = ["German Shepherd", "Labrador Retriever", "Golden Retriever", "Beagle", "Border Collie"]
+cat_breeds = ["Maine Coon", "Siamese", "British Shorthair", "Persian", "Bengal"]
+monkey_species = ["Guenon", "Marmoset", "Howler Monkey", "Capuchin", "Tamarin"]
+
+
+def synthetic_animals(count, seed=0):
+    """Yields count deterministic Dogs, Cats, and Monkeys with unique names.
+
+    The same count and seed always produce the same roster, so results can
+    be compared across runs and versions.
+    """
+    rng = random.Random(seed)
+    countries = pet_project.countries[:5]  # The predefined countries only
+    weights = pet_project.weights
+    statuses = pet_project.training_statuses[:4]  # The standard stages only
+    for i in range(count):
+        animal_type = pet_project.animal_types[i % 3]
+        acquisition_date = date(2015 + rng.randrange(10), 1 + rng.randrange(12), 1 + rng.randrange(28))
+        common = (rng.choice(["Male", "Female"]), str(rng.randint(1, 15)), rng.choice(weights),
+                  acquisition_date, rng.choice(countries), rng.choice(statuses), rng.random() < 0.2,
+                  rng.choice(countries))
+        if animal_type == "Monkey":
+            yield pet_project.Monkey(f"Monkey{i}", rng.choice(monkey_species), *common,
+                                     f"{rng.uniform(5, 30):.1f}", f"{rng.uniform(5, 25):.1f}",
+                                     f"{rng.uniform(8, 30):.1f}")
+        elif animal_type == "Cat":
+            yield pet_project.Cat(f"Cat{i}", rng.choice(cat_breeds), *common)
+        else:
+            yield pet_project.Dog(f"Dog{i}", rng.choice(dog_breeds), *common)
+
+
+def synthetic_registry(count, seed=0, store=None):
+    """Returns a registry holding count synthetic animals, added in batches."""
+    registry = pet_project.AnimalRegistry(store)
+    for chunk in pet_project.chunked(synthetic_animals(count, seed), 10_000):
+        registry.add_many(chunk)
+    return registry